@@ -0,0 +1,129 @@
+"""
+Cached, Conditional and Compressed JSON Responses
+
+Responses of parsed reports carry a strong ETag built from the report id,
+its data version (updated_at) and the response name, so a client that
+sends it back in If-None-Match gets 304 Not Modified once the report row
+is read, without loading the metrics or asking Redis. Bodies are gzip-compressed once when they are built
+and stored compressed in the response cache; clients that accept gzip
+get them as stored, others get them decompressed.
+"""
+
+import gzip
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app.models.awr_report import AWRReport, ReportStatus
+from app.core.response_cache import ResponseCache, get_response_cache
+
+# Level 6 compresses JSON nearly as well as 9 at a fraction of the CPU
+GZIP_LEVEL = 6
+
+# Clients revalidate with If-None-Match before every reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the client accepts gzip-encoded responses"""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.replace(" ", "").lower()
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names the ETag, in either content coding"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.strip('"')
+    if opaque.endswith("-gzip"):
+        opaque = opaque[:-len("-gzip")]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') in (opaque, f"{opaque}-gzip"):
+            return True
+    return False
+
+
+def report_etag(report: AWRReport, name: str, gzipped: bool) -> str:
+    """Strong ETag of a response of a report at its current data version"""
+    version = report.updated_at.strftime("%Y%m%d%H%M%S%f") if report.updated_at else "0"
+    # The compressed representation has its own strong ETag
+    suffix = "-gzip" if gzipped else ""
+    return f'"{report.id}-{version}-{name.replace(":", "-")}{suffix}"'
+
+
+def _compressed_response(compressed: bytes, etag: str, gzipped: bool, cache_status: Optional[str]) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if cache_status:
+        headers["X-Cache"] = cache_status
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=compressed, media_type="application/json", headers=headers)
+    return Response(content=gzip.decompress(compressed), media_type="application/json", headers=headers)
+
+
+def cached_response(
+    request: Request,
+    report: AWRReport,
+    name: str,
+    endpoint: str,
+    build: Callable[[], bytes],
+) -> Response:
+    """
+    JSON response of a report, from the client's or the response cache when possible
+
+    Args:
+        request: Incoming request (If-None-Match, Accept-Encoding)
+        report: Report the response belongs to
+        name: Response name, unique per report (endpoint and arguments)
+        endpoint: Endpoint name for the hit and miss counters
+        build: Returns the serialized body on a miss
+
+    Only responses of parsed reports get an ETag and are cached; their
+    data changes only when they are parsed or analyzed again.
+    """
+    if report.status != ReportStatus.PARSED:
+        return Response(content=build(), media_type="application/json")
+
+    gzipped = accepts_gzip(request)
+    etag = report_etag(report, name, gzipped)
+    if etag_matches(request, etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"},
+        )
+
+    cache = get_response_cache()
+    if cache is None:
+        return _compressed_response(gzip.compress(build(), GZIP_LEVEL), etag, gzipped, None)
+
+    key = ResponseCache.key(report.id, report.updated_at, name)
+    compressed = cache.get(key, endpoint)
+    if compressed is not None:
+        return _compressed_response(compressed, etag, gzipped, "HIT")
+
+    try:
+        body = build()
+    except HTTPException:
+        cache.record_miss(endpoint)
+        raise
+    compressed = gzip.compress(body, GZIP_LEVEL)
+    cache.set(report.id, key, compressed, endpoint)
+    return _compressed_response(compressed, etag, gzipped, "MISS")
@@ -1,32 +1,83 @@
 """Analysis API Routes"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
+from typing import Optional
+import hashlib
+import json
 import logging
 
 from app.models.database import get_db
-from app.models.awr_report import AWRReport
+from app.models.awr_report import AWRReport, ReportStatus
 from app.models.performance_metric import PerformanceMetric
 from app.models.diagnostic_result import DiagnosticResult, Severity
-from app.schemas.metric import MetricResponse
+from app.schemas.metric import MetricResponse, MetricsResponse
 from app.schemas.diagnostic import DiagnosticResponse, DiagnosticSummary, DiagnosticItem
+from app.api.cached_response import cached_response
+from app.core.metric_query import load_metrics, parse_projection
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/reports", tags=["analysis"])
 
 
+def split_list(value: Optional[str]) -> list:
+    """Items of a comma-separated query parameter"""
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+@router.get("/{report_id}/metrics", response_model=MetricsResponse)
+def get_all_metrics(
+    report_id: int,
+    request: Request,
+    categories: Optional[str] = Query(None, description="Comma-separated categories (default: all)"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated paths to return, e.g. load_profile.db_time_s,top_sql.abcd1234.elapsed_time_s"
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Get several metric categories of a report in one request
+
+    - **report_id**: Report ID
+    - **categories**: Categories to return (load_profile, wait_events, top_sql, io_stats, memory_stats, instance_efficiency, derived)
+    - **fields**: Dotted paths to project; a category with fields returns only those paths
+
+    Categories without metrics are omitted.
+    """
+    logger.info(f"Getting metrics: report_id={report_id}, categories={categories}, fields={fields}")
+
+    try:
+        projection = parse_projection(split_list(categories), split_list(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    report = db.query(AWRReport).filter(AWRReport.id == report_id).first()
+    if not report:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    def build() -> bytes:
+        metrics = load_metrics(db, report_id, projection)
+        return MetricsResponse(report_id=report_id, metrics=metrics).model_dump_json().encode()
+
+    # Digest of the canonical projection, so equivalent requests share one cache entry and ETag
+    canonical = json.dumps({category: sorted(paths) if paths else None for category, paths in projection.items()})
+    name = "metrics:" + hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    return cached_response(request, report, name, "metrics_bulk", build)
+
+
 @router.get("/{report_id}/metrics/{category}", response_model=MetricResponse)
 def get_metrics(
     report_id: int,
     category: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get performance metrics for a specific category
 
     - **report_id**: Report ID
-    - **category**: Metric category (load_profile, wait_events, sql_stats, io_stats, memory_stats, instance_efficiency)
+    - **category**: Metric category (load_profile, wait_events, top_sql, io_stats, memory_stats, instance_efficiency, derived)
     """
     logger.info(f"Getting metrics: report_id={report_id}, category={category}")
 
@@ -35,30 +86,31 @@ def get_metrics(
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    # Get metrics
-    metric = db.query(PerformanceMetric).filter(
-        PerformanceMetric.report_id == report_id,
-        PerformanceMetric.metric_category == category
-    ).first()
+    def build() -> bytes:
+        metric = db.query(PerformanceMetric).filter(
+            PerformanceMetric.report_id == report_id,
+            PerformanceMetric.metric_category == category
+        ).first()
 
-    if not metric:
-        raise HTTPException(status_code=404, detail=f"Metrics not found for category: {category}")
+        if not metric:
+            raise HTTPException(status_code=404, detail=f"Metrics not found for category: {category}")
 
-    return {
-        "category": category,
-        "data": metric.metric_data
-    }
+        return MetricResponse(category=category, data=metric.metric_data).model_dump_json().encode()
+
+    return cached_response(request, report, f"metrics:{category}", "metrics", build)
 
 
 @router.post("/{report_id}/analyze")
 def analyze_report(
     report_id: int,
+    force: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Trigger analysis for a report
 
     - **report_id**: Report ID
+    - **force**: Re-analyze even if the report was analyzed with the current rules
     """
     logger.info(f"Triggering analysis for report: {report_id}")
 
@@ -67,19 +119,27 @@ def analyze_report(
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    # TODO: Trigger async analysis task
-    # from app.tasks.analysis_tasks import analyze_report_task
-    # task = analyze_report_task.delay(report_id)
+    if report.status != ReportStatus.PARSED:
+        raise HTTPException(status_code=400, detail=f"Report is not parsed (status: {report.status.value})")
+
+    try:
+        from app.tasks.analysis_tasks import analyze_awr_report_task
+        task = analyze_awr_report_task.delay(report_id, force=force)
+    except Exception as e:
+        logger.error(f"Failed to trigger analysis task: {e}")
+        raise HTTPException(status_code=503, detail="Task queue unavailable")
 
     return {
         "message": "Analysis started",
-        "report_id": report_id
+        "report_id": report_id,
+        "task_id": task.id
     }
 
 
 @router.get("/{report_id}/diagnostics", response_model=DiagnosticResponse)
 def get_diagnostics(
     report_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -94,28 +154,30 @@ def get_diagnostics(
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    # Get all diagnostics
-    diagnostics = db.query(DiagnosticResult).filter(
-        DiagnosticResult.report_id == report_id
-    ).order_by(
-        DiagnosticResult.severity,
-        DiagnosticResult.created_at
-    ).all()
-
-    # Calculate summary
-    summary = DiagnosticSummary()
-    for diag in diagnostics:
-        if diag.severity == Severity.CRITICAL:
-            summary.critical += 1
-        elif diag.severity == Severity.HIGH:
-            summary.high += 1
-        elif diag.severity == Severity.MEDIUM:
-            summary.medium += 1
-        elif diag.severity == Severity.LOW:
-            summary.low += 1
-
-    return {
-        "report_id": report_id,
-        "summary": summary,
-        "diagnostics": diagnostics
-    }
+    def build() -> bytes:
+        diagnostics = db.query(DiagnosticResult).filter(
+            DiagnosticResult.report_id == report_id
+        ).order_by(
+            DiagnosticResult.severity,
+            DiagnosticResult.created_at
+        ).all()
+
+        # Calculate summary
+        summary = DiagnosticSummary()
+        for diag in diagnostics:
+            if diag.severity == Severity.CRITICAL:
+                summary.critical += 1
+            elif diag.severity == Severity.HIGH:
+                summary.high += 1
+            elif diag.severity == Severity.MEDIUM:
+                summary.medium += 1
+            elif diag.severity == Severity.LOW:
+                summary.low += 1
+
+        return DiagnosticResponse(
+            report_id=report_id,
+            summary=summary,
+            diagnostics=[DiagnosticItem.model_validate(diag) for diag in diagnostics],
+        ).model_dump_json().encode()
+
+    return cached_response(request, report, "diagnostics", "diagnostics", build)
@@ -0,0 +1,97 @@
+"""RAC Cluster API Routes"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+import logging
+
+from app.models.database import get_db
+from app.models.cluster_snapshot import ClusterSnapshot
+from app.schemas.cluster import ClusterListResponse, ClusterSnapshotDetail
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/clusters", tags=["clusters"])
+
+
+def cluster_summary(cluster: ClusterSnapshot) -> dict:
+    """Response fields of a cluster snapshot without its metrics"""
+    return {
+        "id": cluster.id,
+        "dbid": cluster.dbid,
+        "db_name": cluster.db_name,
+        "begin_snap_id": cluster.begin_snap_id,
+        "end_snap_id": cluster.end_snap_id,
+        "snapshot_begin": cluster.snapshot_begin,
+        "snapshot_end": cluster.snapshot_end,
+        "instance_count": cluster.instance_count,
+        "instances": {
+            number: {
+                "report_id": instance["report_id"],
+                "instance_name": instance.get("instance_name"),
+                "host_name": instance.get("host_name"),
+            }
+            for number, instance in sorted(cluster.instances.items(), key=lambda item: int(item[0]))
+        },
+        "updated_at": cluster.updated_at,
+    }
+
+
+@router.get("", response_model=ClusterListResponse)
+def list_clusters(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    db_name: Optional[str] = None,
+    dbid: Optional[int] = None,
+    min_instances: int = Query(1, ge=1, description="Only snapshots merged from at least this many instances"),
+    db: Session = Depends(get_db)
+):
+    """
+    List cluster snapshots, newest snapshot range first
+
+    - **db_name**: Filter by database name
+    - **dbid**: Filter by DB Id
+    - **min_instances**: e.g. 2 to list only RAC snapshots with siblings
+    """
+    query = db.query(ClusterSnapshot).filter(ClusterSnapshot.instance_count >= min_instances)
+    if db_name:
+        query = query.filter(ClusterSnapshot.db_name == db_name)
+    if dbid is not None:
+        query = query.filter(ClusterSnapshot.dbid == dbid)
+
+    total = query.count()
+    clusters = query.order_by(
+        ClusterSnapshot.dbid, ClusterSnapshot.begin_snap_id.desc(), ClusterSnapshot.end_snap_id.desc()
+    ).offset((page - 1) * size).limit(size).all()
+
+    return {
+        "total": total,
+        "page": page,
+        "size": size,
+        "items": [cluster_summary(cluster) for cluster in clusters],
+    }
+
+
+@router.get("/{cluster_id}", response_model=ClusterSnapshotDetail)
+def get_cluster(
+    cluster_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the cluster-wide load profile, wait events and top SQL of a snapshot range,
+    with the per-instance skew
+
+    - **cluster_id**: Cluster snapshot ID
+    """
+    cluster = db.query(ClusterSnapshot).filter(ClusterSnapshot.id == cluster_id).first()
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Cluster snapshot not found")
+
+    aggregates = cluster.aggregates or {}
+    return {
+        **cluster_summary(cluster),
+        "load_profile": aggregates.get("load_profile", {}),
+        "wait_events": aggregates.get("wait_events", {}),
+        "top_sql": aggregates.get("top_sql", {}),
+        "skew": aggregates.get("skew", {}),
+    }
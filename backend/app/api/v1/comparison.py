@@ -0,0 +1,94 @@
+"""Comparison API Routes"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.database import get_db
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.comparison_result import ComparisonResult
+from app.schemas.comparison import ComparisonCreate, ComparisonResponse
+from app.core.comparison.comparator import baseline_window, compare_reports
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/comparisons", tags=["comparisons"])
+
+
+def comparison_response(result: ComparisonResult) -> dict:
+    """Response body of a stored comparison"""
+    return {
+        "id": result.id,
+        "baseline_id": result.baseline_report_id,
+        "baseline_ids": result.baseline_report_ids,
+        "target_id": result.target_report_id,
+        "created_at": result.created_at,
+        "comparison": result.comparison_data.get("categories", {}),
+        "movers": result.comparison_data.get("movers", {}),
+    }
+
+
+@router.post("", response_model=ComparisonResponse)
+def create_comparison(
+    request: ComparisonCreate,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """
+    Compare a report with a baseline report or a baseline window
+
+    - **target_id**: Report to compare
+    - **baseline_id**: One baseline report, or
+    - **baseline_ids**: Several baseline reports, averaged per metric, or
+    - **baseline_window**: Number of parsed reports of the same database and instance preceding the target
+
+    The result is stored and returned again without recomputing until one
+    of the reports changes (X-Cache: HIT).
+    """
+    logger.info(f"Creating comparison: {request}")
+
+    report_ids = {request.target_id, *(request.baseline_ids or ())}
+    if request.baseline_id is not None:
+        report_ids.add(request.baseline_id)
+    reports = {report.id: report for report in db.query(AWRReport).filter(AWRReport.id.in_(report_ids))}
+
+    missing = sorted(report_ids - reports.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Reports not found: {', '.join(map(str, missing))}")
+    not_parsed = sorted(report_id for report_id, report in reports.items() if report.status != ReportStatus.PARSED)
+    if not_parsed:
+        raise HTTPException(status_code=400, detail=f"Reports are not parsed: {', '.join(map(str, not_parsed))}")
+
+    target = reports[request.target_id]
+    if request.baseline_window is not None:
+        baselines = baseline_window(db, target, request.baseline_window)
+        if not baselines:
+            raise HTTPException(status_code=404, detail="No parsed reports of the same instance precede the target")
+    elif request.baseline_id is not None:
+        baselines = [reports[request.baseline_id]]
+    else:
+        baselines = [reports[report_id] for report_id in dict.fromkeys(request.baseline_ids)]
+
+    if any(report.id == target.id for report in baselines):
+        raise HTTPException(status_code=400, detail="The target report cannot be its own baseline")
+
+    result, reused = compare_reports(db, target, baselines)
+    response.headers["X-Cache"] = "HIT" if reused else "MISS"
+    return comparison_response(result)
+
+
+@router.get("/{comparison_id}", response_model=ComparisonResponse)
+def get_comparison(
+    comparison_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a stored comparison
+
+    - **comparison_id**: Comparison ID
+    """
+    result = db.query(ComparisonResult).filter(ComparisonResult.id == comparison_id).first()
+    if not result:
+        raise HTTPException(status_code=404, detail="Comparison not found")
+
+    return comparison_response(result)
@@ -1,14 +1,22 @@
 """Report Management API Routes"""
 
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
 from typing import Optional
+from datetime import datetime, timedelta
 import os
 import logging
 
 from app.models.database import get_db
 from app.schemas.report import ReportResponse, ReportListResponse, ReportDetail
 from app.models.awr_report import AWRReport, ReportStatus
+from app.core.storage import ReportWriter, storage_suffix, CHUNK_SIZE as UPLOAD_CHUNK_SIZE
+from app.core.parse_cache import find_parsed_report, reuse_parse_result
+from app.core.response_cache import invalidate_reports
+from app.core.cluster import remove_report
+from app.core.pagination import decode_cursor, encode_cursor, estimate_count
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -16,6 +24,27 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
+def _store_report(db: Session, report: AWRReport) -> Optional[AWRReport]:
+    """
+    Insert an uploaded report, reusing the parse result of an identical report
+
+    Returns:
+        The report whose parse result was reused, or None if the report
+        still has to be parsed
+    """
+    db.add(report)
+    db.flush()
+
+    # Identical report already parsed: reuse its metrics instead of parsing again
+    cached_report = find_parsed_report(db, report.content_hash, exclude_id=report.id)
+    if cached_report:
+        reuse_parse_result(db, cached_report, report)
+
+    db.commit()
+    db.refresh(report)
+    return cached_report
+
+
 @router.post("/upload", response_model=ReportResponse, status_code=201)
 async def upload_report(
     file: UploadFile = File(...),
@@ -32,17 +61,6 @@ async def upload_report(
     if not file.filename.endswith('.html'):
         raise HTTPException(status_code=400, detail="Only HTML files are supported")
 
-    # Validate file size
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-
-    if file_size > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File size exceeds limit ({settings.MAX_UPLOAD_SIZE} bytes)"
-        )
-
     # Ensure upload directory exists
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
@@ -52,39 +70,69 @@ async def upload_report(
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     unique_id = str(uuid.uuid4())[:8]
     safe_filename = f"{timestamp}_{unique_id}_{file.filename}"
-    file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+    file_path = os.path.join(settings.UPLOAD_DIR, safe_filename + storage_suffix(settings.UPLOAD_COMPRESSION))
+
+    # Stream the file to disk chunk by chunk, enforcing the size limit as it
+    # arrives. Writing, hashing and compression run in the threadpool so a
+    # large upload never blocks the event loop.
+    try:
+        writer = await run_in_threadpool(ReportWriter, file_path, settings.UPLOAD_COMPRESSION)
+    except Exception as e:
+        logger.error(f"Error saving file: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to save file")
 
-    # Save file
     try:
-        with open(file_path, 'wb') as f:
-            content = await file.read()
-            f.write(content)
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
 
+            if writer.size + len(chunk) > settings.MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File size exceeds limit ({settings.MAX_UPLOAD_SIZE} bytes)"
+                )
+
+            await run_in_threadpool(writer.write, chunk)
+
+        await run_in_threadpool(writer.close)
         logger.info(f"File saved to: {file_path}")
 
+    except HTTPException:
+        await run_in_threadpool(writer.discard)
+        raise
+
     except Exception as e:
         logger.error(f"Error saving file: {e}", exc_info=True)
+        await run_in_threadpool(writer.discard)
         raise HTTPException(status_code=500, detail="Failed to save file")
 
+    file_size = writer.size
+    content_hash = writer.content_hash
+
     # Create database record
     report = AWRReport(
         filename=file.filename,
         file_path=file_path,
         file_size=file_size,
+        content_hash=content_hash,
         status=ReportStatus.PENDING
     )
 
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    # Copying a cached parse result is a bulk INSERT ... SELECT, kept off the event loop
+    cached_report = await run_in_threadpool(_store_report, db, report)
 
     logger.info(f"Created report record with ID: {report.id}")
 
-    # Trigger async parsing task
+    # Trigger async parsing (unless reused) followed by analysis
     try:
-        from app.tasks.parse_tasks import parse_awr_report_task
-        task = parse_awr_report_task.delay(report.id)
-        logger.info(f"Triggered parsing task: {task.id}")
+        from app.tasks.analysis_tasks import analyze_awr_report_task, parse_and_analyze
+        if cached_report:
+            task = analyze_awr_report_task.delay(report.id)
+            logger.info(f"Triggered analysis task: {task.id}")
+        else:
+            task = parse_and_analyze(report.id)
+            logger.info(f"Triggered parsing and analysis tasks: {task.id}")
     except Exception as e:
         logger.warning(f"Failed to trigger parsing task: {e}")
         # Don't fail the upload if task queue is unavailable
@@ -96,6 +144,8 @@ async def upload_report(
 def list_reports(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: str = Query("exact", pattern="^(exact|estimated|none)$"),
     db_name: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
@@ -104,24 +154,27 @@ def list_reports(
     """
     Get list of AWR reports with pagination and filtering
 
-    - **page**: Page number (starting from 1)
+    - **page**: Page number (starting from 1), ignored when a cursor is given
     - **size**: Number of items per page
-    - **db_name**: Filter by database name
+    - **cursor**: next_cursor of the previous page; pages through large lists at constant cost
+    - **count**: How to compute total: exact, estimated (planner statistics) or none
+    - **db_name**: Filter by database name (substring, case-insensitive)
     - **date_from**: Filter by upload date (YYYY-MM-DD)
     - **date_to**: Filter by upload date (YYYY-MM-DD)
     """
-    logger.info(f"Listing reports: page={page}, size={size}, db_name={db_name}")
+    logger.info(f"Listing reports: page={page}, size={size}, cursor={cursor}, db_name={db_name}")
 
     # Build query
     query = db.query(AWRReport)
 
     # Apply filters
     if db_name:
-        query = query.filter(AWRReport.db_name.ilike(f"%{db_name}%"))
+        # Substring search, served by the trigram index on db_name
+        pattern = db_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = query.filter(AWRReport.db_name.ilike(f"%{pattern}%", escape="\\"))
 
     if date_from:
         try:
-            from datetime import datetime
             date_from_dt = datetime.strptime(date_from, '%Y-%m-%d')
             query = query.filter(AWRReport.upload_time >= date_from_dt)
         except ValueError:
@@ -129,23 +182,44 @@ def list_reports(
 
     if date_to:
         try:
-            from datetime import datetime, timedelta
             date_to_dt = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
             query = query.filter(AWRReport.upload_time < date_to_dt)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date_to format (use YYYY-MM-DD)")
 
     # Get total count
-    total = query.count()
-
-    # Apply pagination
-    offset = (page - 1) * size
-    reports = query.order_by(AWRReport.upload_time.desc()).offset(offset).limit(size).all()
+    total = None
+    if count == "exact":
+        total = query.order_by(None).count()
+    elif count == "estimated":
+        total = estimate_count(db, query)
+        if total is None:
+            total = query.order_by(None).count()
+            count = "exact"
+
+    # Apply pagination, newest first with id as tie-breaker
+    page_query = query.order_by(AWRReport.upload_time.desc(), AWRReport.id.desc())
+    if cursor:
+        try:
+            after_time, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        page_query = page_query.filter(tuple_(AWRReport.upload_time, AWRReport.id) < (after_time, after_id))
+    else:
+        page_query = page_query.offset((page - 1) * size)
+
+    reports = page_query.limit(size + 1).all()
+    next_cursor = None
+    if len(reports) > size:
+        reports = reports[:size]
+        next_cursor = encode_cursor(reports[-1].upload_time, reports[-1].id)
 
     return {
         "total": total,
+        "total_estimated": count == "estimated",
         "page": page,
         "size": size,
+        "next_cursor": next_cursor,
         "items": reports
     }
 
@@ -196,8 +270,10 @@ def delete_report(
         logger.error(f"Error deleting file: {e}", exc_info=True)
 
     # Delete database record (cascade will delete related records)
+    remove_report(db, report)
     db.delete(report)
     db.commit()
+    invalidate_reports([report_id])
 
     logger.info(f"Deleted report {report_id}")
 
@@ -0,0 +1,70 @@
+"""SQL History API Routes"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.models.database import get_db
+from app.models.sql_stat import SqlStat
+from app.schemas.sql import SqlHistoryResponse
+from app.core.sql_stats import SQL_ORDERINGS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/sql", tags=["sql"])
+
+
+@router.get("/{sql_id}/reports", response_model=SqlHistoryResponse)
+def get_sql_history(
+    sql_id: str,
+    top: Optional[int] = Query(None, ge=1, description="Only reports where the statement ranked at most this"),
+    ordering: Optional[str] = Query(None, pattern=f"^({'|'.join(SQL_ORDERINGS)})$"),
+    db_name: Optional[str] = None,
+    instance: Optional[str] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    List the reports a statement appears in, newest snapshot first, with its statistics
+
+    - **sql_id**: SQL Id
+    - **top**: e.g. 10 for the reports where it was in a top 10
+    - **ordering**: Only this "SQL ordered by" list (by_elapsed, by_cpu, ...);
+      without it, the best rank over all lists counts
+    - **db_name** / **instance**: Filter by database and instance name
+    - **from** / **to**: Snapshot time range (from inclusive, to exclusive)
+    """
+    query = db.query(SqlStat).filter(SqlStat.sql_id == sql_id)
+
+    if ordering:
+        rank = SqlStat.ranks[ordering].as_integer()
+        query = query.filter(rank <= top if top else rank.is_not(None))
+    elif top:
+        query = query.filter(SqlStat.best_rank <= top)
+    if db_name:
+        query = query.filter(SqlStat.db_name == db_name)
+    if instance:
+        query = query.filter(SqlStat.instance_name == instance)
+    if date_from:
+        query = query.filter(SqlStat.snapshot_begin >= date_from)
+    if date_to:
+        query = query.filter(SqlStat.snapshot_begin < date_to)
+
+    total = query.count()
+    statements = query.order_by(
+        SqlStat.snapshot_begin.desc(), SqlStat.report_id.desc()
+    ).offset((page - 1) * size).limit(size).all()
+
+    return {
+        "sql_id": sql_id,
+        "sql_text": next((statement.sql_text for statement in statements if statement.sql_text), None),
+        "total": total,
+        "page": page,
+        "size": size,
+        "items": statements,
+    }
@@ -0,0 +1,55 @@
+"""Trend API Routes"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+import logging
+
+from app.models.database import get_db
+from app.schemas.trend import TrendResponse
+from app.core.comparison.trend_analyzer import metric_trend
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/databases", tags=["trends"])
+
+
+@router.get("/{db_name}/trends", response_model=TrendResponse)
+def get_trend(
+    db_name: str,
+    metric: str = Query(..., description="Metric key, e.g. load_profile.redo_size_bytes.per_second"),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    instance: Optional[str] = None,
+    points: int = Query(500, ge=3, le=10000),
+    method: str = Query("lttb", pattern="^(lttb|minmax)$"),
+    aggregate: str = Query("avg", pattern="^(avg|sum|min|max)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the history of a metric of a database, downsampled to at most `points` points
+
+    - **db_name**: Database name
+    - **metric**: Dotted metric key of the normalized metrics
+    - **from** / **to**: Snapshot time range (from inclusive, to exclusive)
+    - **instance**: Only this instance (default: all instances)
+    - **points**: Maximum number of points returned
+    - **method**: lttb (keeps the shape) or minmax (keeps every spike)
+    - **aggregate**: How values of the same snapshot time are combined (avg, sum, min, max)
+    """
+    logger.info(f"Getting trend: db_name={db_name}, metric={metric}, instance={instance}, points={points}")
+
+    trend = metric_trend(
+        db, db_name, metric, points, method,
+        instance_name=instance, start=date_from, end=date_to, aggregate=aggregate,
+    )
+
+    return {
+        "db_name": db_name,
+        "instance_name": instance,
+        "metric": metric,
+        "aggregate": aggregate,
+        "method": method,
+        **trend,
+    }
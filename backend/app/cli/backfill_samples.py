@@ -0,0 +1,110 @@
+"""
+Backfill Metric Samples of Previously Parsed Reports
+
+Builds the MetricSample time series rows of parsed reports that have
+none yet, from their stored PerformanceMetric documents. Reports are
+processed in id order, one transaction per batch, so the command can be
+interrupted and run again.
+
+Usage:
+    python -m app.cli.backfill_samples
+    python -m app.cli.backfill_samples --batch-size 500
+"""
+
+import time
+import logging
+import argparse
+from typing import Any, Dict, List
+
+from sqlalchemy import exists, select
+
+from app.models.database import SessionLocal
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.metric_sample import MetricSample
+from app.core.analyzer.fleet import load_report_metrics
+from app.core.parser.base import PARSER_VERSION
+from app.core.timeseries import TIMESERIES_CATEGORIES, insert_samples, sample_rows
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def backfill(db, batch_size: int) -> Dict[str, Any]:
+    """
+    Store the samples of every parsed report without samples
+
+    Returns:
+        Statistics with the number of reports and samples
+    """
+    stats = {'reports': 0, 'samples': 0}
+    start = time.perf_counter()
+    last_id = 0
+
+    query = select(AWRReport).where(
+        AWRReport.status == ReportStatus.PARSED,
+        AWRReport.parser_version == PARSER_VERSION,
+        AWRReport.snapshot_begin.is_not(None),
+        ~exists().where(MetricSample.report_id == AWRReport.id),
+    )
+
+    while True:
+        reports: List[AWRReport] = db.scalars(
+            query.where(AWRReport.id > last_id).order_by(AWRReport.id).limit(batch_size)
+        ).all()
+        if not reports:
+            break
+        last_id = reports[-1].id
+
+        metrics = load_report_metrics(db, [report.id for report in reports], TIMESERIES_CATEGORIES)
+        rows = []
+        for report in reports:
+            metadata = {
+                'db_name': report.db_name,
+                'instance_name': report.instance_name,
+                'snapshot_begin': report.snapshot_begin,
+            }
+            records = [
+                {'metric_category': category, 'metric_data': data}
+                for category, data in metrics[report.id].items()
+            ]
+            rows.extend(sample_rows(report.id, metadata, records))
+
+        insert_samples(db, rows)
+        db.commit()
+
+        stats['reports'] += len(reports)
+        stats['samples'] += len(rows)
+        elapsed = time.perf_counter() - start
+        print(f"  {stats['reports']} reports, {stats['reports'] / elapsed:.0f} reports/s")
+
+    return stats
+
+
+def main():
+    """Command line entry point"""
+    arg_parser = argparse.ArgumentParser(description="Build metric samples of previously parsed reports")
+    arg_parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        help=f'reports per batch (default: {DEFAULT_BATCH_SIZE})'
+    )
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        stats = backfill(db, args.batch_size)
+    finally:
+        db.close()
+
+    print(
+        f"Stored {stats['samples']} metric samples of {stats['reports']} reports "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compress Stored AWR Reports
+
+Rewrites every stored report that is not yet in the target compression
+(UPLOAD_COMPRESSION by default) and points AWRReport.file_path at the new
+copy. The copy's content hash is checked against the recorded one, and
+the original file is removed only after the new path is committed, so
+the command can be interrupted and run again at any time.
+
+Usage:
+    python -m app.cli.compress_storage
+    python -m app.cli.compress_storage --compression gzip --batch-size 200
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.models.database import SessionLocal
+from app.models.awr_report import AWRReport
+from app.core.storage import (
+    COMPRESSION_SUFFIXES, ReportWriter, compression_of, open_report, with_compression
+)
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def compress_reports(db: Session, compression: str, batch_size: int) -> Dict[str, Any]:
+    """
+    Convert stored reports to the target compression
+
+    Args:
+        db: Database session
+        compression: "none", "gzip" or "zstd"
+        batch_size: Reports per transaction
+
+    Returns:
+        Conversion statistics
+    """
+    stats = {
+        'converted': 0, 'unchanged': 0, 'missing': 0, 'mismatched': 0,
+        'bytes_before': 0, 'bytes_after': 0,
+    }
+    last_id = 0
+
+    while True:
+        reports = (
+            db.query(AWRReport)
+            .filter(AWRReport.id > last_id)
+            .order_by(AWRReport.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not reports:
+            break
+        last_id = reports[-1].id
+
+        replaced_paths = []
+        for report in reports:
+            if compression_of(report.file_path) == compression:
+                stats['unchanged'] += 1
+                continue
+
+            if not os.path.exists(report.file_path):
+                logger.warning(f"Report {report.id}: file not found: {report.file_path}")
+                stats['missing'] += 1
+                continue
+
+            new_path = with_compression(report.file_path, compression)
+            with open_report(report.file_path) as src, ReportWriter(new_path, compression) as writer:
+                writer.copy_from(src)
+
+            if report.content_hash and writer.content_hash != report.content_hash:
+                logger.error(f"Report {report.id}: content hash mismatch, keeping {report.file_path}")
+                os.remove(new_path)
+                stats['mismatched'] += 1
+                continue
+
+            stats['bytes_before'] += os.path.getsize(report.file_path)
+            stats['bytes_after'] += os.path.getsize(new_path)
+            stats['converted'] += 1
+
+            replaced_paths.append(report.file_path)
+            report.file_path = new_path
+            report.content_hash = writer.content_hash
+            if report.file_size is None:
+                report.file_size = writer.size
+
+        db.commit()
+
+        for old_path in replaced_paths:
+            os.remove(old_path)
+
+        print(f"  {stats['converted']} converted, {stats['unchanged']} already {compression}")
+
+    return stats
+
+
+def main():
+    """Command line entry point"""
+    arg_parser = argparse.ArgumentParser(description="Compress stored AWR reports")
+    arg_parser.add_argument(
+        '--compression', choices=list(COMPRESSION_SUFFIXES), default=settings.UPLOAD_COMPRESSION,
+        help=f'target compression (default: {settings.UPLOAD_COMPRESSION})'
+    )
+    arg_parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        help=f'reports per transaction (default: {DEFAULT_BATCH_SIZE})'
+    )
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        stats = compress_reports(db, args.compression, args.batch_size)
+    finally:
+        db.close()
+
+    ratio = stats['bytes_before'] / stats['bytes_after'] if stats['bytes_after'] else 0
+    print(
+        f"Converted {stats['converted']} reports to {args.compression} in "
+        f"{time.perf_counter() - start:.1f}s: {stats['bytes_before'] / 1048576:.1f}MB -> "
+        f"{stats['bytes_after'] / 1048576:.1f}MB ({ratio:.1f}x)"
+    )
+    if stats['missing'] or stats['mismatched']:
+        print(f"Skipped {stats['missing']} missing and {stats['mismatched']} mismatched files")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Bulk Ingestion of Archived AWR Reports
+
+Parses every *.html report under a directory or inside a tarball in a
+process pool and stores AWRReport / PerformanceMetric / MetricSample rows
+with batched inserts. Reports are copied to UPLOAD_DIR/ingest under a
+name derived from their source location, so an interrupted run can simply
+be started again: reports whose stored copy is already recorded as parsed
+are skipped, reports that failed are parsed again and their failed row
+replaced. A dry run copies the reports to a temporary directory only,
+deleted afterwards.
+
+With --metadata-only only the instance and snapshot info of each report
+is parsed: the reports are listed with their database, instance and
+snapshot times but stay PENDING without metrics. A later run without
+the flag parses them fully.
+
+Usage:
+    python -m app.cli.ingest ../awrrpt
+    python -m app.cli.ingest archive.tar.gz --workers 8 --batch-size 200
+    python -m app.cli.ingest ../awrrpt --dry-run
+    python -m app.cli.ingest archive.tar.gz --metadata-only
+"""
+
+import os
+import sys
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+import tarfile
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Set, Tuple
+
+from app.core.ingest import parse_report_file, parse_report_metadata, report_metadata, metric_records
+from app.core.storage import COMPRESSION_SUFFIXES, ReportWriter, storage_suffix, with_compression
+from app.core.parser.base import PARSER_VERSION
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Subdirectory of UPLOAD_DIR holding ingested copies
+INGEST_SUBDIR = "ingest"
+
+DEFAULT_BATCH_SIZE = 100
+
+# Parsed reports waiting per worker, bounds memory of finished results
+PENDING_PER_WORKER = 2
+
+
+def iter_sources(path: str) -> Iterator[Tuple[str, str, Callable[[], BinaryIO]]]:
+    """
+    Enumerate the AWR reports in a directory or tarball
+
+    Args:
+        path: Directory or tar archive (any compression tarfile supports)
+
+    Yields:
+        (source key, file name, function opening the report for reading)
+    """
+    source = Path(path).resolve()
+
+    if source.is_dir():
+        for html_file in sorted(source.rglob("*")):
+            if html_file.is_file() and html_file.suffix.lower() == '.html':
+                source_key = f"{source}:{html_file.relative_to(source).as_posix()}"
+                yield source_key, html_file.name, lambda f=html_file: open(f, 'rb')
+        return
+
+    with tarfile.open(source, 'r:*') as tar:
+        for member in tar:
+            if member.isfile() and member.name.lower().endswith('.html'):
+                source_key = f"{source}:{member.name}"
+                yield source_key, os.path.basename(member.name), lambda m=member: tar.extractfile(m)
+
+
+def stored_path(staging_dir: str, source_key: str, filename: str) -> str:
+    """Deterministic location of the ingested copy of a report"""
+    digest = hashlib.sha1(source_key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(staging_dir, f"{digest}_{filename}")
+
+
+def parse_job(job: Tuple[str, str, int, str], metadata_only: bool = False) -> Dict[str, Any]:
+    """
+    Parse one staged report (runs in a worker process)
+
+    Args:
+        job: (stored file path, original file name, uncompressed size, content hash)
+        metadata_only: Parse only the sections of the AWRReport values, no metrics
+
+    Returns:
+        Dictionary with the AWRReport values and PerformanceMetric records
+    """
+    file_path, filename, file_size, content_hash = job
+    result = {
+        'filename': filename,
+        'file_path': file_path,
+        'file_size': file_size,
+        'content_hash': content_hash,
+        'metadata': report_metadata({}),
+        'metrics': [],
+        'error': None,
+    }
+
+    try:
+        if metadata_only:
+            result['metadata'] = parse_report_metadata(file_path, file_size)
+        else:
+            parsed_data = parse_report_file(file_path, file_size)
+            result['metadata'] = report_metadata(parsed_data)
+            result['metrics'] = metric_records(parsed_data)
+    except Exception as e:
+        result['error'] = f"Failed to parse AWR report: {str(e)}"
+
+    return result
+
+
+def ingested_paths(db, staging_dir: str, metadata_only: bool = False) -> Set[str]:
+    """
+    Stored paths of reports parsed by previous runs
+
+    Failed reports are not included, so they are retried. Reports with
+    metadata only are included in a metadata-only run, and parsed fully
+    by a normal run.
+    """
+    from app.models.awr_report import AWRReport, ReportStatus
+
+    statuses = [ReportStatus.PARSED, ReportStatus.PENDING] if metadata_only else [ReportStatus.PARSED]
+    rows = db.query(AWRReport.file_path).filter(
+        AWRReport.file_path.startswith(staging_dir),
+        AWRReport.status.in_(statuses),
+    )
+    # Compared without compression suffix, the setting may change between runs
+    return {with_compression(file_path, 'none') for (file_path,) in rows}
+
+
+def insert_batch(db, results: List[Dict[str, Any]], metadata_only: bool = False):
+    """
+    Insert a batch of parsed reports and their metrics in one transaction
+
+    Rows of earlier failed or metadata-only attempts at the same reports
+    are replaced.
+
+    Args:
+        db: Database session
+        results: Results of parse_job
+        metadata_only: The results have metadata only, the reports stay PENDING
+    """
+    from sqlalchemy import delete, insert, select
+    from app.models.awr_report import AWRReport, ReportStatus
+    from app.models.performance_metric import PerformanceMetric
+    from app.core.timeseries import insert_samples, sample_rows
+    from app.core.sql_stats import insert_sql_stats, sql_stat_rows
+    from app.core.cluster import merge_report
+
+    # Earlier attempts are stored under the same name, possibly with another compression suffix
+    stored_paths = {result['file_path'] for result in results}
+    retried = [
+        with_compression(file_path, compression)
+        for file_path in stored_paths
+        for compression in COMPRESSION_SUFFIXES
+    ]
+    stale_paths = db.scalars(select(AWRReport.file_path).where(AWRReport.file_path.in_(retried))).all()
+    if stale_paths:
+        db.execute(delete(AWRReport).where(AWRReport.file_path.in_(stale_paths)))
+
+    parsed_status = ReportStatus.PENDING if metadata_only else ReportStatus.PARSED
+    now = datetime.utcnow()
+    report_rows = [
+        {
+            'filename': result['filename'],
+            'file_path': result['file_path'],
+            'file_size': result['file_size'],
+            'content_hash': result['content_hash'],
+            'parser_version': None if result['error'] or metadata_only else PARSER_VERSION,
+            'status': ReportStatus.FAILED if result['error'] else parsed_status,
+            'error_message': result['error'],
+            'updated_at': now,
+            **result['metadata'],
+        }
+        for result in results
+    ]
+
+    report_ids = db.scalars(
+        insert(AWRReport).returning(AWRReport.id, sort_by_parameter_order=True),
+        report_rows
+    ).all()
+
+    metric_rows = [
+        {'report_id': report_id, **record}
+        for report_id, result in zip(report_ids, results)
+        for record in result['metrics']
+    ]
+    if metric_rows:
+        db.execute(insert(PerformanceMetric), metric_rows)
+
+    insert_samples(db, [
+        row
+        for report_id, result in zip(report_ids, results)
+        for row in sample_rows(report_id, result['metadata'], result['metrics'])
+    ])
+
+    insert_sql_stats(db, [
+        row
+        for report_id, result in zip(report_ids, results)
+        for row in sql_stat_rows(report_id, result['metadata'], result['metrics'])
+    ])
+
+    for report_id, result in zip(report_ids, results):
+        if not result['error'] and not metadata_only:
+            merge_report(db, report_id, result['metadata'], result['metrics'])
+
+    db.commit()
+
+    for file_path in set(stale_paths) - stored_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def ingest(
+    path: str,
+    workers: int,
+    batch_size: int,
+    dry_run: bool = False,
+    metadata_only: bool = False,
+) -> Dict[str, Any]:
+    """
+    Ingest all AWR reports under path
+
+    Args:
+        path: Directory or tar archive of AWR reports
+        workers: Number of parser processes
+        batch_size: Reports per insert transaction
+        dry_run: Parse only, without touching the database; reports are
+            copied to a temporary directory, deleted afterwards
+        metadata_only: Parse only the AWRReport values; the reports stay
+            PENDING until a run without metadata_only
+
+    Returns:
+        Ingestion statistics
+    """
+    stats = {'ingested': 0, 'failed': 0, 'skipped': 0, 'elapsed': 0.0}
+    compression = settings.UPLOAD_COMPRESSION
+    start = time.perf_counter()
+
+    if dry_run:
+        db = None
+        staging_dir = tempfile.mkdtemp(prefix="awr_ingest_")
+        already_ingested: Set[str] = set()
+    else:
+        from app.models.database import SessionLocal
+
+        db = SessionLocal()
+        staging_dir = os.path.abspath(os.path.join(settings.UPLOAD_DIR, INGEST_SUBDIR))
+        os.makedirs(staging_dir, exist_ok=True)
+        already_ingested = ingested_paths(db, staging_dir, metadata_only)
+
+    def staged_jobs() -> Iterator[Tuple[str, str, int, str]]:
+        """Copy pending reports into the staging directory as they are needed"""
+        for source_key, filename, open_source in iter_sources(path):
+            target = stored_path(staging_dir, source_key, filename)
+            if target in already_ingested:
+                stats['skipped'] += 1
+                continue
+
+            target += storage_suffix(compression)
+
+            with open_source() as src, ReportWriter(target, compression) as writer:
+                writer.copy_from(src)
+            yield target, filename, writer.size, writer.content_hash
+
+    batch: List[Dict[str, Any]] = []
+
+    def collect(result: Dict[str, Any]):
+        if result['error']:
+            stats['failed'] += 1
+            logger.warning(f"{result['filename']}: {result['error']}")
+        else:
+            stats['ingested'] += 1
+        batch.append(result)
+
+        if len(batch) >= batch_size:
+            flush()
+
+    def flush():
+        if batch and db is not None:
+            insert_batch(db, batch, metadata_only)
+        batch.clear()
+
+        elapsed = time.perf_counter() - start
+        done = stats['ingested'] + stats['failed']
+        print(f"  {done} reports, {done / elapsed:.1f} reports/s")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for job in staged_jobs():
+                pending.append(executor.submit(parse_job, job, metadata_only))
+                if len(pending) >= workers * PENDING_PER_WORKER:
+                    collect(pending.popleft().result())
+
+            while pending:
+                collect(pending.popleft().result())
+
+        flush()
+    finally:
+        if db is not None:
+            db.close()
+        if dry_run:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    stats['elapsed'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    """Command line entry point"""
+    arg_parser = argparse.ArgumentParser(
+        description="Bulk ingest a directory or tarball of AWR reports"
+    )
+    arg_parser.add_argument('path', help='directory or tar archive of AWR HTML reports')
+    arg_parser.add_argument(
+        '--workers', type=int, default=os.cpu_count() or 1,
+        help='parser processes (default: number of CPUs)'
+    )
+    arg_parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        help=f'reports per insert transaction (default: {DEFAULT_BATCH_SIZE})'
+    )
+    arg_parser.add_argument(
+        '--dry-run', action='store_true',
+        help='parse only, without writing to the database (reports are copied to a temporary directory)'
+    )
+    arg_parser.add_argument(
+        '--metadata-only', action='store_true',
+        help='parse only instance and snapshot info; reports stay pending until a full run'
+    )
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    # Missing optional sections are expected in bulk loads
+    logging.getLogger('app.core.parser').setLevel(logging.ERROR)
+
+    if not os.path.exists(args.path):
+        print(f"Path not found: {args.path}")
+        sys.exit(1)
+
+    print(f"Ingesting {args.path} with {args.workers} workers")
+    stats = ingest(args.path, args.workers, args.batch_size, dry_run=args.dry_run, metadata_only=args.metadata_only)
+
+    total = stats['ingested'] + stats['failed']
+    rate = total / stats['elapsed'] if stats['elapsed'] else 0
+    print(
+        f"Ingested {stats['ingested']} reports ({stats['failed']} failed, "
+        f"{stats['skipped']} already ingested) in {stats['elapsed']:.1f}s: {rate:.1f} reports/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Re-diagnose All Parsed AWR Reports
+
+Evaluates the current rule set against the stored metrics of every parsed
+report and replaces their DiagnosticResult rows. Reports are evaluated in
+batches with vectorized rule conditions and one bulk insert per batch;
+each batch is its own transaction, and reports already diagnosed with the
+current rule set version are skipped, so the command can be interrupted
+and run again at any time.
+
+Usage:
+    python -m app.cli.rediagnose
+    python -m app.cli.rediagnose --rules-dir ./app/rules --batch-size 5000
+    python -m app.cli.rediagnose --force
+"""
+
+import sys
+import time
+import logging
+import argparse
+
+from app.models.database import SessionLocal
+from app.core.analyzer.rule_engine import RuleEngine
+from app.core.analyzer.fleet import DEFAULT_BATCH_SIZE, rediagnose_fleet
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Command line entry point"""
+    arg_parser = argparse.ArgumentParser(description="Re-run diagnostic rules over all parsed reports")
+    arg_parser.add_argument(
+        '--rules-dir', default=settings.RULES_DIR,
+        help=f'directory of YAML rule files (default: {settings.RULES_DIR})'
+    )
+    arg_parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        help=f'reports per batch (default: {DEFAULT_BATCH_SIZE})'
+    )
+    arg_parser.add_argument(
+        '--force', action='store_true',
+        help='also re-diagnose reports already diagnosed with the current rules'
+    )
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    engine = RuleEngine(args.rules_dir)
+    if not engine.compiled.rules:
+        print(f"No rules loaded from {args.rules_dir}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        elapsed = time.perf_counter() - start
+        print(f"  {stats['reports']} reports, {stats['reports'] / elapsed:.0f} reports/s")
+
+    db = SessionLocal()
+    try:
+        stats = rediagnose_fleet(db, engine.compiled, args.batch_size, progress, force=args.force)
+    finally:
+        db.close()
+
+    print(
+        f"Re-diagnosed {stats['reports']} reports with {len(engine.compiled.rules)} rules "
+        f"(version {engine.version}) in "
+        f"{time.perf_counter() - start:.1f}s: {stats['diagnostics']} diagnostic results"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ class Settings(BaseSettings):
     # File Storage
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 52428800  # 50MB
+    UPLOAD_COMPRESSION: str = "zstd"  # none, gzip or zstd
 
     # Security
     SECRET_KEY: str = "change-this-secret-key-in-production"
@@ -41,11 +42,17 @@ class Settings(BaseSettings):
         "http://localhost:80",
     ]
 
+    # Parser
+    PARSER_BACKEND: str = "lxml"  # lxml or bs4
+    STREAMING_PARSE_THRESHOLD: int = 10485760  # 10MB, larger files are streamed
+
     # Rule Engine
     RULES_DIR: str = "./app/rules"
+    RULES_RELOAD_INTERVAL: int = 30  # Seconds between checks for changed rule files
 
     # Cache
-    CACHE_TTL: int = 3600  # 1 hour
+    CACHE_TTL: int = 3600  # 1 hour, 0 disables the response cache
+    GZIP_MINIMUM_SIZE: int = 1024  # Smaller responses are sent uncompressed
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,151 @@
+"""Fleet-wide Re-diagnosis of Stored Reports"""
+
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.performance_metric import PerformanceMetric
+from app.models.diagnostic_result import DiagnosticResult, Severity
+from app.core.analyzer.rule_compiler import CompiledRuleSet
+from app.core.parser.base import PARSER_VERSION
+from app.core.response_cache import invalidate_reports
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def load_report_metrics(
+    db: Session,
+    report_ids: Sequence[int],
+    categories: Optional[Sequence[str]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Load the metrics of many reports as {category: metric_data} dictionaries
+
+    Args:
+        db: Database session
+        report_ids: Reports to load
+        categories: Metric categories to load (default: all)
+
+    Returns:
+        Metrics per report id, empty for reports without metric rows
+    """
+    query = select(
+        PerformanceMetric.report_id,
+        PerformanceMetric.metric_category,
+        PerformanceMetric.metric_data,
+    ).where(PerformanceMetric.report_id.in_(report_ids))
+    if categories is not None:
+        query = query.where(PerformanceMetric.metric_category.in_(categories))
+
+    metrics: Dict[int, Dict[str, Any]] = {report_id: {} for report_id in report_ids}
+    for report_id, category, data in db.execute(query):
+        metrics[report_id][category] = data
+    return metrics
+
+
+def rediagnose_reports(db: Session, rule_set: CompiledRuleSet, report_ids: Sequence[int]) -> int:
+    """
+    Replace the diagnostic results of a batch of reports
+
+    All reports are evaluated together with CompiledRuleSet.evaluate_many()
+    and their results written with one bulk insert. The results and the
+    reports are stamped with the rule set version. The caller commits.
+
+    Args:
+        db: Database session
+        rule_set: Compiled rules
+        report_ids: Reports to diagnose
+
+    Returns:
+        Number of diagnostic results stored
+    """
+    metrics = load_report_metrics(db, report_ids, rule_set.root_keys)
+    results = rule_set.evaluate_many([metrics[report_id] for report_id in report_ids])
+
+    now = datetime.utcnow()
+    rows = []
+    for report_id, report_results in zip(report_ids, results):
+        for result in report_results:
+            result['report_id'] = report_id
+            result['severity'] = Severity(result['severity'])
+            result['rules_version'] = rule_set.version
+            result['created_at'] = now
+            rows.append(result)
+
+    db.execute(delete(DiagnosticResult).where(DiagnosticResult.report_id.in_(report_ids)))
+    if rows:
+        db.execute(insert(DiagnosticResult), rows)
+
+    db.execute(
+        update(AWRReport)
+        .where(AWRReport.id.in_(report_ids))
+        .values(rules_version=rule_set.version)
+        .execution_options(synchronize_session=False)
+    )
+
+    return len(rows)
+
+
+def rediagnose_fleet(
+    db: Session,
+    rule_set: CompiledRuleSet,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Re-run the rules over every parsed report
+
+    Only reports whose stored metrics come from the current PARSER_VERSION
+    are evaluated; older ones need to be parsed again first. Reports
+    already diagnosed with this rule set version are skipped. Reports are
+    processed in id order, one transaction per batch, so an interrupted
+    run leaves each report with either its old or its new diagnostics and
+    can simply be run again.
+
+    Args:
+        db: Database session
+        rule_set: Compiled rules
+        batch_size: Reports per batch
+        progress: Called with the statistics after each batch
+        force: Also re-diagnose reports already at this rule set version
+
+    Returns:
+        Statistics with the number of reports and diagnostic results
+    """
+    stats = {'reports': 0, 'diagnostics': 0}
+    last_id = 0
+
+    query = select(AWRReport.id).where(
+        AWRReport.status == ReportStatus.PARSED,
+        AWRReport.parser_version == PARSER_VERSION,
+    )
+    if not force:
+        query = query.where(or_(
+            AWRReport.rules_version.is_(None),
+            AWRReport.rules_version != rule_set.version,
+        ))
+
+    while True:
+        report_ids: List[int] = db.scalars(
+            query.where(AWRReport.id > last_id).order_by(AWRReport.id).limit(batch_size)
+        ).all()
+        if not report_ids:
+            break
+        last_id = report_ids[-1]
+
+        stats['diagnostics'] += rediagnose_reports(db, rule_set, report_ids)
+        stats['reports'] += len(report_ids)
+        db.commit()
+        invalidate_reports(report_ids)
+
+        if progress:
+            progress(stats)
+
+    return stats
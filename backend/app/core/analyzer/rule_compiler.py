@@ -0,0 +1,363 @@
+"""
+Rule Compilation
+
+Diagnostic rules are compiled once when they are loaded. Every distinct
+metric path is split into keys and given a slot; the lookups needed to
+fill all slots form a flat program that walks each shared path prefix
+once per report, and values compared numerically are converted to float
+once per report as well (NaN when they cannot be, which fails every
+comparison). A condition becomes a (slot, operator, threshold) triple
+with the threshold already converted.
+
+evaluate_many() runs the same conditions over many reports at once: each
+float slot becomes a NumPy column and each condition a boolean mask.
+"""
+
+import json
+import math
+import hashlib
+import numbers
+import logging
+import operator
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# Operators comparing float(value) with float(threshold)
+NUMERIC_OPERATORS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+
+# Rule keys copied into every diagnostic result
+REQUIRED_RULE_KEYS = ('id', 'severity', 'category', 'name')
+
+# (slot, operator, argument), matched when operator(values[slot], argument) is true
+Condition = Tuple[int, Callable[[Any, Any], bool], Any]
+
+
+class RuleCompileError(ValueError):
+    """Raised when a rule cannot be compiled"""
+
+
+def in_range(value: float, bounds: Tuple[Any, Any]) -> bool:
+    return bounds[0] <= value <= bounds[1]
+
+
+def in_range_mask(column: np.ndarray, bounds: Tuple[Any, Any]) -> np.ndarray:
+    return (column >= bounds[0]) & (column <= bounds[1])
+
+
+# Elementwise form of operators that do not broadcast over arrays themselves
+VECTOR_OPERATORS = {in_range: in_range_mask}
+
+
+def is_scalar(value: Any) -> bool:
+    """Whether a threshold compares against an object column element by element"""
+    return value is None or isinstance(value, (str, bytes, bool, numbers.Number))
+
+
+def to_float(value: Any) -> float:
+    """float(value), or NaN if the value is not numeric"""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError, OverflowError):
+        return math.nan
+
+
+def to_float_column(values: np.ndarray) -> np.ndarray:
+    """to_float() over an object column"""
+    try:
+        converted = np.array(values.tolist(), dtype=float)
+        if converted.shape == values.shape:
+            return converted
+    except (ValueError, TypeError, OverflowError):
+        pass
+    return np.fromiter((to_float(value) for value in values), float, len(values))
+
+
+def compile_operator(op_name: str, threshold: Any) -> Tuple[Callable[[Any, Any], bool], Any, bool]:
+    """
+    Resolve an operator name and threshold
+
+    Returns:
+        (operator, argument, whether the value is compared as float)
+
+    Raises:
+        RuleCompileError: If the operator is unknown or the threshold can never match
+    """
+    if op_name in NUMERIC_OPERATORS:
+        try:
+            threshold = float(threshold)
+        except (ValueError, TypeError):
+            raise RuleCompileError(f"non-numeric threshold {threshold!r} for operator {op_name}")
+        return NUMERIC_OPERATORS[op_name], threshold, True
+
+    if op_name == '==':
+        return operator.eq, threshold, False
+
+    if op_name == 'in_range':
+        try:
+            bounds = (threshold[0], threshold[1])
+        except (LookupError, TypeError):
+            raise RuleCompileError(f"in_range threshold must be [low, high], got {threshold!r}")
+        if not all(isinstance(bound, numbers.Real) for bound in bounds):
+            raise RuleCompileError(f"non-numeric in_range bounds {threshold!r}")
+        return in_range, bounds, True
+
+    raise RuleCompileError(f"unknown operator {op_name!r}")
+
+
+class CompiledRule:
+    """A rule with resolved comparators and metric slots"""
+
+    __slots__ = ('rule_id', 'severity_rank', 'conditions', 'metric_slots', 'result_fields')
+
+    def __init__(
+        self,
+        rule: Dict[str, Any],
+        conditions: Tuple[Condition, ...],
+        metric_slots: Tuple[Tuple[str, int], ...],
+    ):
+        self.rule_id = rule['id']
+        self.severity_rank = SEVERITY_ORDER.get(rule['severity'], 999)
+        self.conditions = conditions
+        self.metric_slots = metric_slots
+        self.result_fields = {
+            'rule_id': rule['id'],
+            'severity': rule['severity'],
+            'category': rule['category'],
+            'issue_title': rule['name'],
+            'issue_description': rule.get('description', ''),
+            'recommendation': rule.get('recommendation', ''),
+        }
+
+    def result(self, values: List[Any]) -> Dict[str, Any]:
+        """Diagnostic result with the values of the rule's metrics"""
+        metric_values = {}
+        for path, slot in self.metric_slots:
+            value = values[slot]
+            if value is not None:
+                metric_values[path] = value
+        return {**self.result_fields, 'metric_values': metric_values}
+
+
+class CompiledRuleSet:
+    """Rules compiled against a shared table of metric paths"""
+
+    # Slot holding the metrics dictionary itself
+    ROOT_SLOT = 0
+
+    def __init__(self):
+        self.rules: List[CompiledRule] = []
+        # rules_version() of the source rules, set by compile_rules()
+        self.version: str = rules_version([])
+        self.slot_count = 1
+        # (parent slot, key, slot) in an order where parents come first
+        self._lookups: List[Tuple[int, str, int]] = []
+        # (value slot, float slot)
+        self._conversions: List[Tuple[int, int]] = []
+        self._slots: Dict[Tuple[int, str], int] = {}
+        self._path_slots: Dict[str, int] = {}
+        # value slot -> float slot, and back
+        self._float_slots: Dict[int, int] = {}
+        self._float_sources: Dict[int, int] = {}
+
+    @property
+    def path_count(self) -> int:
+        """Number of distinct metric paths referenced by the rules"""
+        return len(self._path_slots)
+
+    @property
+    def root_keys(self) -> List[str]:
+        """Top-level metric keys (metric categories) referenced by the rules"""
+        return [key for parent, key, _ in self._lookups if parent == self.ROOT_SLOT]
+
+    def path_slot(self, path: str) -> int:
+        """Slot holding the value of a dotted metric path, allocating it if needed"""
+        slot = self._path_slots.get(path)
+        if slot is not None:
+            return slot
+
+        slot = self.ROOT_SLOT
+        for key in path.split('.'):
+            child = self._slots.get((slot, key))
+            if child is None:
+                child = self.slot_count
+                self.slot_count += 1
+                self._slots[(slot, key)] = child
+                self._lookups.append((slot, key, child))
+            slot = child
+
+        self._path_slots[path] = slot
+        return slot
+
+    def float_slot(self, path: str) -> int:
+        """Slot holding the value of a metric path converted to float"""
+        slot = self.path_slot(path)
+        float_slot = self._float_slots.get(slot)
+        if float_slot is None:
+            float_slot = self.slot_count
+            self.slot_count += 1
+            self._float_slots[slot] = float_slot
+            self._float_sources[float_slot] = slot
+            self._conversions.append((slot, float_slot))
+        return float_slot
+
+    def compile_rule(self, rule: Dict[str, Any]) -> CompiledRule:
+        """
+        Compile one rule dictionary
+
+        Raises:
+            RuleCompileError: If the rule is malformed or can never match
+        """
+        missing = [key for key in REQUIRED_RULE_KEYS if key not in rule]
+        if missing:
+            raise RuleCompileError(f"missing {', '.join(missing)}")
+
+        conditions = rule.get('conditions', [])
+        if not isinstance(conditions, list):
+            raise RuleCompileError("conditions must be a list")
+
+        compiled_conditions = []
+        metric_slots: Dict[str, int] = {}
+        for condition in conditions:
+            try:
+                path, op_name, threshold = condition['metric'], condition['operator'], condition['threshold']
+            except (KeyError, TypeError):
+                raise RuleCompileError(f"condition needs metric, operator and threshold: {condition!r}")
+            if not isinstance(path, str):
+                raise RuleCompileError(f"metric path must be a string: {path!r}")
+
+            op, argument, numeric = compile_operator(op_name, threshold)
+            metric_slots.setdefault(path, self.path_slot(path))
+            slot = self.float_slot(path) if numeric else metric_slots[path]
+            compiled_conditions.append((slot, op, argument))
+
+        return CompiledRule(rule, tuple(compiled_conditions), tuple(metric_slots.items()))
+
+    def add_rules(self, rules: Sequence[Dict[str, Any]]):
+        """Compile rules, skipping (and logging) the ones that cannot be compiled"""
+        for rule in rules:
+            rule_id = rule.get('id') if isinstance(rule, dict) else None
+            try:
+                if not isinstance(rule, dict):
+                    raise RuleCompileError("rule must be a mapping")
+                self.rules.append(self.compile_rule(rule))
+            except RuleCompileError as e:
+                logger.error(f"Skipping rule {rule_id}: {e}")
+
+        # Stable, so rules of equal severity keep their load order
+        self.rules.sort(key=lambda rule: rule.severity_rank)
+
+    def lookup(self, metrics: Dict[str, Any]) -> List[Any]:
+        """Look up every metric path once, leaving the float slots empty"""
+        values: List[Any] = [None] * self.slot_count
+        values[self.ROOT_SLOT] = metrics
+        for parent, key, slot in self._lookups:
+            container = values[parent]
+            if isinstance(container, dict):
+                values[slot] = container.get(key)
+        return values
+
+    def resolve(self, metrics: Dict[str, Any]) -> List[Any]:
+        """Look up every metric path once, returning the slot values"""
+        values = self.lookup(metrics)
+        for slot, float_slot in self._conversions:
+            values[float_slot] = to_float(values[slot])
+        return values
+
+    def evaluate(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Evaluate all rules against one set of metrics
+
+        Returns:
+            Diagnostic results of the matching rules, ordered by severity
+        """
+        values = self.resolve(metrics)
+        results = []
+        for rule in self.rules:
+            for slot, op, argument in rule.conditions:
+                if not op(values[slot], argument):
+                    break
+            else:
+                results.append(rule.result(values))
+        return results
+
+    def evaluate_many(self, metrics_list: Sequence[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluate all rules against many sets of metrics at once
+
+        Every numeric condition is evaluated as one vectorized mask over all
+        reports, and a rule stops as soon as no report still matches.
+
+        Args:
+            metrics_list: Metrics of each report
+
+        Returns:
+            Diagnostic results per report, the same as evaluate() for each
+        """
+        rows = [self.lookup(metrics) for metrics in metrics_list]
+        results: List[List[Dict[str, Any]]] = [[] for _ in rows]
+        if not rows:
+            return results
+
+        count = len(rows)
+        columns: Dict[int, np.ndarray] = {}
+        masks: Dict[Tuple[int, Any, Any], np.ndarray] = {}
+
+        def column(slot: int) -> np.ndarray:
+            values = columns.get(slot)
+            if values is None:
+                source = self._float_sources.get(slot)
+                if source is None:
+                    values = np.fromiter((row[slot] for row in rows), object, count)
+                else:
+                    values = to_float_column(column(source))
+                columns[slot] = values
+            return values
+
+        def condition_mask(slot: int, op: Callable, argument: Any) -> np.ndarray:
+            if slot not in self._float_sources and not is_scalar(argument):
+                # Would broadcast against the column, compare row by row
+                return np.fromiter((bool(op(row[slot], argument)) for row in rows), bool, count)
+
+            key = (slot, op, argument)
+            mask = masks.get(key)
+            if mask is None:
+                mask = masks[key] = np.asarray(VECTOR_OPERATORS.get(op, op)(column(slot), argument), dtype=bool)
+            return mask
+
+        for rule in self.rules:
+            matched = np.ones(count, dtype=bool)
+            for slot, op, argument in rule.conditions:
+                matched = matched & condition_mask(slot, op, argument)
+                if not matched.any():
+                    break
+            else:
+                for index in np.flatnonzero(matched).tolist():
+                    results[index].append(rule.result(rows[index]))
+
+        return results
+
+
+def rules_version(rules: Sequence[Dict[str, Any]]) -> str:
+    """Digest of the rule definitions, changes whenever any rule does"""
+    canonical = json.dumps(list(rules), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def compile_rules(rules: Sequence[Dict[str, Any]]) -> CompiledRuleSet:
+    """Compile rule dictionaries as loaded from the YAML rule files"""
+    rule_set = CompiledRuleSet()
+    rule_set.add_rules(rules)
+    rule_set.version = rules_version(rules)
+    return rule_set
@@ -0,0 +1,111 @@
+"""
+Process-wide Rule Registry
+
+Each process keeps one compiled rule set per rules directory instead of
+reading the YAML files for every analysis. The directory is checked at
+most every RULES_RELOAD_INTERVAL seconds: when the name, size or mtime of
+a rule file changes, the rules are loaded and compiled again, and the new
+engine replaces the old one if its version (the digest of the rule
+definitions) differs. Callers take one engine per task and use it until
+they finish, so a reload never mixes two rule sets in one analysis.
+"""
+
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.core.analyzer.rule_engine import RuleEngine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (file name, mtime in ns, size) of every rule file
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def rule_files_signature(rules_dir: Path) -> Signature:
+    """Cheap fingerprint of the rule files, changes when any of them is edited, added or removed"""
+    signature = []
+    for rule_file in sorted(rules_dir.glob("*.yaml")):
+        try:
+            stat = rule_file.stat()
+        except OSError:
+            continue
+        signature.append((rule_file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class RuleRegistry:
+    """Cached rule engine of one rules directory, reloaded when the files change"""
+
+    def __init__(self, rules_dir: str, check_interval: Optional[float] = None):
+        """
+        Args:
+            rules_dir: Directory containing YAML rule files
+            check_interval: Seconds between checks for changed files (default: RULES_RELOAD_INTERVAL)
+        """
+        self.rules_dir = Path(rules_dir)
+        self.check_interval = settings.RULES_RELOAD_INTERVAL if check_interval is None else check_interval
+        self._lock = threading.Lock()
+        self._engine: Optional[RuleEngine] = None
+        self._signature: Optional[Signature] = None
+        self._checked_at = 0.0
+
+    def get(self) -> RuleEngine:
+        """Current rule engine, reloading it first if the rule files changed"""
+        engine = self._engine
+        if engine is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return engine
+
+        with self._lock:
+            if self._engine is None or time.monotonic() - self._checked_at >= self.check_interval:
+                self._refresh()
+            return self._engine
+
+    def _refresh(self):
+        """Reload the rules if the files changed; called with the lock held"""
+        self._checked_at = time.monotonic()
+        signature = rule_files_signature(self.rules_dir)
+        if self._engine is not None and signature == self._signature:
+            return
+
+        engine = RuleEngine(str(self.rules_dir))
+
+        if self._engine is not None:
+            if engine.load_errors:
+                # Probably a file caught mid-write, keep the current rules and retry at the next check
+                logger.error(
+                    f"Keeping rule set version {self._engine.version}, "
+                    f"failed to reload {len(engine.load_errors)} rule files"
+                )
+                return
+            if engine.version == self._engine.version:
+                self._signature = signature
+                return
+
+        self._signature = signature
+        previous = self._engine
+        self._engine = engine
+        if previous is None:
+            logger.info(f"Loaded rule set version {engine.version} ({len(engine.compiled.rules)} rules)")
+        else:
+            logger.info(
+                f"Reloaded rule set: version {previous.version} -> {engine.version} "
+                f"({len(engine.compiled.rules)} rules)"
+            )
+
+
+_registries: Dict[str, RuleRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_rule_registry(rules_dir: Optional[str] = None) -> RuleRegistry:
+    """Registry of a rules directory (default: RULES_DIR), shared by the whole process"""
+    key = str(Path(rules_dir or settings.RULES_DIR).resolve())
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.setdefault(key, RuleRegistry(key))
+    return registry
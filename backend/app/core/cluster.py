@@ -0,0 +1,347 @@
+"""
+RAC Cluster Aggregates
+
+Every instance of a RAC database writes its own AWR report, but all
+instances share the DB Id and the snap ids. Reports of RAC instances
+(instance_info['rac']) with the same (dbid, begin_snap_id, end_snap_id)
+are merged into one ClusterSnapshot row as each of them finishes parsing;
+single-instance databases get no cluster snapshot:
+
+    1. the report is reduced to a compact contribution (load profile
+       rates, wait event totals, additive top SQL statistics)
+    2. the contribution is stored under its instance number in the
+       locked cluster row, replacing an earlier upload of that instance
+    3. the aggregates are recomputed from the stored contributions
+
+Siblings are never re-read from performance_metrics; a merge only touches
+the one cluster row.
+
+Top SQL lists are per-instance top-N lists, so cluster totals of a
+statement only cover the instances where it made the list.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.cluster_snapshot import ClusterSnapshot
+from app.core.sql_stats import PER_EXEC_SQL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Top SQL statistics summed across instances
+ADDITIVE_SQL_FIELDS = (
+    'executions',
+    'elapsed_time_s',
+    'cpu_time_s',
+    'buffer_gets',
+    'physical_reads',
+    'rows_processed',
+    'user_io_time_s',
+    'cluster_wait_time_s',
+    'parse_calls',
+)
+
+# Wait event statistics kept per instance
+WAIT_EVENT_FIELDS = ('waits', 'time_waited', 'avg_wait', 'pct_db_time')
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _ratio(numerator: Optional[float], denominator: Optional[float]) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return round(numerator / denominator, 6)
+
+
+def instance_contribution(report_id: int, metadata: Mapping[str, Any], records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compact metrics of one instance, as stored in ClusterSnapshot.instances
+
+    Args:
+        report_id: Report of the instance
+        metadata: AWRReport values of the report
+        records: PerformanceMetric values of the report
+    """
+    metrics = {record['metric_category']: record['metric_data'] for record in records}
+
+    load_profile = {
+        key: values['per_second']
+        for key, values in (metrics.get('load_profile') or {}).items()
+        if isinstance(values, Mapping) and _number(values.get('per_second')) is not None
+    }
+
+    wait_events = {
+        key: {
+            'name': event.get('name', key),
+            **{field: event[field] for field in WAIT_EVENT_FIELDS if _number(event.get(field)) is not None},
+        }
+        for key, event in (metrics.get('wait_events') or {}).items()
+    }
+
+    top_sql = {}
+    for sql_id, statement in (metrics.get('top_sql') or {}).items():
+        entry = {field: statement[field] for field in ADDITIVE_SQL_FIELDS if _number(statement.get(field)) is not None}
+        if isinstance(statement.get('sql_text'), str):
+            entry['sql_text'] = statement['sql_text']
+        top_sql[sql_id] = entry
+
+    return {
+        'report_id': report_id,
+        'instance_name': metadata.get('instance_name'),
+        'host_name': metadata.get('host_name'),
+        'load_profile': load_profile,
+        'wait_events': wait_events,
+        'top_sql': top_sql,
+    }
+
+
+def _skew(values: Mapping[str, float]) -> Optional[Dict[str, Any]]:
+    """Spread of one metric over the instances; ratio is max / mean (1 = balanced)"""
+    if len(values) < 2:
+        return None
+    mean = sum(values.values()) / len(values)
+    max_instance = max(values, key=values.get)
+    return {
+        'values': dict(values),
+        'max_instance': max_instance,
+        'ratio': round(values[max_instance] / mean, 4) if mean else None,
+    }
+
+
+def aggregate_instances(instances: Mapping[str, Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Cluster-wide metrics from the contributions of the instances
+
+    load_profile    per-second rates summed; per_txn from the summed transactions
+    wait_events     waits and time summed, avg_wait weighted by waits,
+                    pct_db_time weighted by the instances' DB time
+    top_sql         additive statistics summed, per-exec values recomputed
+    skew            per metric, the value of every instance, the busiest
+                    instance and max / mean
+    """
+    load_profile: Dict[str, Dict[str, Any]] = {}
+    for contribution in instances.values():
+        for key, value in contribution['load_profile'].items():
+            load_profile.setdefault(key, {'per_second': 0})['per_second'] += value
+    transactions = load_profile.get('transactions', {}).get('per_second')
+    for values in load_profile.values():
+        values['per_second'] = round(values['per_second'], 6)
+        values['per_txn'] = _ratio(values['per_second'], transactions)
+
+    db_time = {
+        instance: contribution['load_profile'].get('db_time_s', 0)
+        for instance, contribution in instances.items()
+    }
+    total_db_time = sum(db_time.values())
+
+    wait_events: Dict[str, Dict[str, Any]] = {}
+    for instance, contribution in instances.items():
+        for key, event in contribution['wait_events'].items():
+            merged = wait_events.setdefault(key, {
+                'name': event['name'], 'waits': 0, 'time_waited': 0,
+                '_weighted_wait': 0, '_weighted_pct': 0, 'instances': [],
+            })
+            waits = event.get('waits', 0)
+            merged['waits'] += waits
+            merged['time_waited'] += event.get('time_waited', 0)
+            merged['_weighted_wait'] += event.get('avg_wait', 0) * waits
+            merged['_weighted_pct'] += event.get('pct_db_time', 0) * db_time[instance]
+            merged['instances'].append(instance)
+    for merged in wait_events.values():
+        merged['avg_wait'] = _ratio(merged.pop('_weighted_wait'), merged['waits'])
+        weighted_pct = merged.pop('_weighted_pct')
+        merged['pct_db_time'] = round(weighted_pct / total_db_time, 2) if total_db_time else None
+
+    top_sql: Dict[str, Dict[str, Any]] = {}
+    for instance, contribution in instances.items():
+        for sql_id, statement in contribution['top_sql'].items():
+            merged = top_sql.setdefault(sql_id, {'instances': []})
+            for field in ADDITIVE_SQL_FIELDS:
+                if field in statement:
+                    merged[field] = merged.get(field, 0) + statement[field]
+            if 'sql_text' in statement:
+                merged.setdefault('sql_text', statement['sql_text'])
+            merged['instances'].append(instance)
+    for merged in top_sql.values():
+        for field, total_field in PER_EXEC_SQL_FIELDS.items():
+            if total_field in merged:
+                merged[field] = _ratio(merged[total_field], merged.get('executions'))
+
+    skew = {
+        'load_profile': {},
+        'wait_events': {},
+        'db_time_share': {
+            instance: round(value / total_db_time * 100, 2)
+            for instance, value in db_time.items()
+        } if total_db_time else {},
+    }
+    for key in load_profile:
+        spread = _skew({
+            instance: contribution['load_profile'][key]
+            for instance, contribution in instances.items()
+            if key in contribution['load_profile']
+        })
+        if spread:
+            skew['load_profile'][key] = spread
+    for key in wait_events:
+        spread = _skew({
+            instance: contribution['wait_events'][key].get('time_waited', 0)
+            for instance, contribution in instances.items()
+            if key in contribution['wait_events']
+        })
+        if spread:
+            skew['wait_events'][key] = spread
+
+    return {
+        'load_profile': load_profile,
+        'wait_events': wait_events,
+        'top_sql': top_sql,
+        'skew': skew,
+    }
+
+
+def _cluster_key(metadata: Mapping[str, Any]) -> Optional[tuple]:
+    key = (metadata.get('dbid'), metadata.get('begin_snap_id'), metadata.get('end_snap_id'))
+    if None in key or metadata.get('instance_number') is None:
+        return None
+    return key
+
+
+def is_cluster_instance(metadata: Mapping[str, Any]) -> bool:
+    """Whether a report belongs in a cluster snapshot: a RAC instance with DB Id, instance number and snap ids"""
+    return bool(metadata.get('rac')) and _cluster_key(metadata) is not None
+
+
+def _locked_cluster(db: Session, dbid: int, begin_snap_id: int, end_snap_id: int) -> Optional[ClusterSnapshot]:
+    return db.scalar(
+        select(ClusterSnapshot).where(
+            ClusterSnapshot.dbid == dbid,
+            ClusterSnapshot.begin_snap_id == begin_snap_id,
+            ClusterSnapshot.end_snap_id == end_snap_id,
+        ).with_for_update()
+    )
+
+
+def _recompute(cluster: ClusterSnapshot, instances: Dict[str, Any]):
+    # JSONB columns are replaced as a whole so the change is detected
+    cluster.instances = instances
+    cluster.instance_count = len(instances)
+    cluster.aggregates = aggregate_instances(instances)
+
+
+def merge_report(
+    db: Session,
+    report_id: int,
+    metadata: Mapping[str, Any],
+    records: Iterable[Dict[str, Any]],
+) -> Optional[ClusterSnapshot]:
+    """
+    Merge a parsed report into the cluster snapshot of its snap range
+
+    The cluster row is locked until the caller commits, so instances
+    finishing at the same time are merged one after the other.
+
+    Args:
+        db: Database session
+        report_id: Parsed report
+        metadata: AWRReport values of the report (dbid, instance_number, snap ids, ...)
+        records: PerformanceMetric values of the report
+
+    Returns:
+        The updated cluster snapshot, or None if the report is not from a
+        RAC instance or lacks the DB Id, instance number or snap ids. The
+        caller commits.
+    """
+    if not is_cluster_instance(metadata):
+        return None
+    key = _cluster_key(metadata)
+
+    cluster = _locked_cluster(db, *key)
+    if cluster is None:
+        try:
+            # Savepoint, so losing a race with a sibling keeps the caller's transaction
+            with db.begin_nested():
+                cluster = ClusterSnapshot(
+                    dbid=key[0],
+                    begin_snap_id=key[1],
+                    end_snap_id=key[2],
+                    instances={},
+                    instance_count=0,
+                    aggregates={},
+                )
+                db.add(cluster)
+        except IntegrityError:
+            pass  # created by a sibling in the meantime
+        cluster = _locked_cluster(db, *key)
+
+    cluster.db_name = metadata.get('db_name')
+    cluster.snapshot_begin = cluster.snapshot_begin or metadata.get('snapshot_begin')
+    cluster.snapshot_end = cluster.snapshot_end or metadata.get('snapshot_end')
+
+    instances = dict(cluster.instances or {})
+    instances[str(metadata['instance_number'])] = instance_contribution(report_id, metadata, records)
+    _recompute(cluster, instances)
+
+    logger.info(f"Merged report {report_id} into cluster snapshot {cluster.id} ({cluster.instance_count} instances)")
+    return cluster
+
+
+def remove_report(db: Session, report: Any) -> Optional[ClusterSnapshot]:
+    """
+    Take a report's instance out of its cluster snapshot, e.g. before deleting it
+
+    If another parsed report of the same instance and snap range remains
+    (a re-upload of the same report), the instance stays and points at that
+    report instead. The cluster snapshot is deleted with its last instance.
+    The caller commits.
+
+    Args:
+        db: Database session
+        report: AWRReport to remove
+
+    Returns:
+        The updated cluster snapshot, or None if the report was not merged
+        or was its last instance
+    """
+    metadata = {field: getattr(report, field) for field in ('dbid', 'begin_snap_id', 'end_snap_id', 'instance_number')}
+    key = _cluster_key(metadata)
+    if key is None:
+        return None
+
+    cluster = _locked_cluster(db, *key)
+    instance = str(report.instance_number)
+    if cluster is None or (cluster.instances or {}).get(instance, {}).get('report_id') != report.id:
+        return None
+
+    duplicate = db.scalar(
+        select(AWRReport.id).where(
+            AWRReport.dbid == report.dbid,
+            AWRReport.begin_snap_id == report.begin_snap_id,
+            AWRReport.end_snap_id == report.end_snap_id,
+            AWRReport.instance_number == report.instance_number,
+            AWRReport.status == ReportStatus.PARSED,
+            AWRReport.id != report.id,
+        ).order_by(AWRReport.id.desc()).limit(1)
+    )
+    if duplicate is not None:
+        instances = dict(cluster.instances)
+        instances[instance] = {**instances[instance], 'report_id': duplicate}
+        cluster.instances = instances
+        return cluster
+
+    instances = {number: data for number, data in cluster.instances.items() if number != instance}
+    if not instances:
+        db.delete(cluster)
+        return None
+
+    _recompute(cluster, instances)
+    return cluster
@@ -0,0 +1 @@
+"""Comparison and Trend Engine"""
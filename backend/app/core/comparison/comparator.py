@@ -0,0 +1,212 @@
+"""
+Report-to-report Comparison
+
+Aligns the normalized metrics of a target report with those of a baseline
+by metric key and computes absolute and relative deltas. The baseline is
+either one report or a window of reports, whose values are averaged per
+key.
+
+Results are stored in comparison_results, one row per target and
+baseline set. The row is reused while the parsed data of the compared
+reports is unchanged (same parser version and report content), so repeat
+views of a pair are a single row read; it is recomputed in place after a
+report is parsed by a new parser version.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.comparison_result import ComparisonResult
+from app.core.analyzer.fleet import load_report_metrics
+from app.core.comparison.trend_analyzer import FLAT_TREND_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of comparison_data changes, so stored results are recomputed
+COMPARISON_VERSION = '1'
+
+# Metric categories that are compared
+COMPARISON_CATEGORIES = (
+    'load_profile',
+    'wait_events',
+    'top_sql',
+    'memory_stats',
+    'io_stats',
+    'instance_efficiency',
+    'derived',
+)
+
+# Keys skipped when flattening: ranks are positions, not amounts
+SKIPPED_KEYS = frozenset({'rank'})
+
+# Biggest movers kept per category
+MOVERS_PER_CATEGORY = 10
+
+
+def flatten(data: Mapping[str, Any], prefix: str = '') -> Iterator[Tuple[str, float]]:
+    """Dotted keys (relative to the category) and values of the numeric leaves"""
+    for key, value in data.items():
+        if key in SKIPPED_KEYS:
+            continue
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, Mapping):
+            yield from flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, float(value)
+
+
+def compare_values(baseline: Optional[float], target: Optional[float]) -> Dict[str, Any]:
+    """
+    Delta of one metric
+
+    The trend is up, down or flat (change below FLAT_TREND_THRESHOLD of
+    the baseline), new if only the target has the metric and gone if only
+    the baseline has it. diff_pct is None when the baseline is missing or 0.
+    """
+    if baseline is None:
+        return {'baseline': None, 'target': target, 'diff_abs': None, 'diff_pct': None, 'trend': 'new'}
+    if target is None:
+        return {'baseline': baseline, 'target': None, 'diff_abs': None, 'diff_pct': None, 'trend': 'gone'}
+
+    diff = target - baseline
+    if abs(diff) <= FLAT_TREND_THRESHOLD * abs(baseline):
+        trend = 'flat'
+    else:
+        trend = 'up' if diff > 0 else 'down'
+
+    return {
+        'baseline': baseline,
+        'target': target,
+        'diff_abs': round(diff, 6),
+        'diff_pct': round(diff / abs(baseline) * 100, 2) if baseline else None,
+        'trend': trend,
+    }
+
+
+def compare_metrics(target: Mapping[str, Any], baselines: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare the metrics of a report with one or more baseline reports
+
+    Args:
+        target: {category: metric_data} of the target report
+        baselines: {category: metric_data} of each baseline report
+
+    Returns:
+        {'categories': {category: {key: delta}}, 'movers': {category: [delta]}}.
+        With several baselines the baseline value of a key is the average
+        of the reports that have it, and baseline_min / baseline_max /
+        baseline_count are added. Movers are the metrics present on both
+        sides, by absolute relative change.
+    """
+    categories: Dict[str, Dict[str, Any]] = {}
+    movers: Dict[str, List[Dict[str, Any]]] = {}
+
+    for category in COMPARISON_CATEGORIES:
+        target_values = dict(flatten(target.get(category) or {}))
+        baseline_values: Dict[str, List[float]] = {}
+        for baseline in baselines:
+            for key, value in flatten(baseline.get(category) or {}):
+                baseline_values.setdefault(key, []).append(value)
+        if not target_values and not baseline_values:
+            continue
+
+        deltas = {}
+        for key in sorted(target_values.keys() | baseline_values.keys()):
+            values = baseline_values.get(key)
+            delta = compare_values(sum(values) / len(values) if values else None, target_values.get(key))
+            if len(baselines) > 1 and values:
+                delta.update(baseline_min=min(values), baseline_max=max(values), baseline_count=len(values))
+            deltas[key] = delta
+        categories[category] = deltas
+
+        ranked = sorted(
+            (key for key, delta in deltas.items() if delta['diff_pct'] is not None and delta['trend'] != 'flat'),
+            key=lambda key: abs(deltas[key]['diff_pct']),
+            reverse=True,
+        )
+        movers[category] = [{'key': key, **deltas[key]} for key in ranked[:MOVERS_PER_CATEGORY]]
+
+    return {'categories': categories, 'movers': movers}
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def baseline_window(db: Session, target: AWRReport, size: int) -> List[AWRReport]:
+    """
+    The size parsed reports of the same database and instance preceding the target
+
+    Returns:
+        Reports by snapshot time, newest first; empty if the target's
+        snapshot time is unknown
+    """
+    if target.snapshot_begin is None:
+        return []
+
+    return db.scalars(
+        select(AWRReport).where(
+            AWRReport.db_name == target.db_name,
+            AWRReport.instance_name == target.instance_name,
+            AWRReport.status == ReportStatus.PARSED,
+            AWRReport.snapshot_begin < target.snapshot_begin,
+            AWRReport.id != target.id,
+        ).order_by(AWRReport.snapshot_begin.desc(), AWRReport.id.desc()).limit(size)
+    ).all()
+
+
+def compare_reports(db: Session, target: AWRReport, baselines: Sequence[AWRReport]) -> Tuple[ComparisonResult, bool]:
+    """
+    Stored comparison of a target report with baseline reports, computed if needed
+
+    Args:
+        db: Database session
+        target: Report to compare
+        baselines: Baseline reports, the first one is stored as baseline_report_id
+
+    Returns:
+        The comparison and whether it was reused without recomputing
+    """
+    baseline_ids = [report.id for report in baselines]
+    pair_key = _digest(COMPARISON_VERSION, target.id, *sorted(baseline_ids))
+    # Identity of the parsed data; updated_at would also change with every analysis run
+    data_version = _digest(*(
+        f"{report.id}/{report.parser_version}/{report.content_hash}"
+        for report in [target, *sorted(baselines, key=lambda report: report.id)]
+    ))
+
+    result = db.scalar(select(ComparisonResult).where(ComparisonResult.pair_key == pair_key))
+    if result is not None and result.data_version == data_version:
+        return result, True
+
+    metrics = load_report_metrics(db, [target.id, *baseline_ids], COMPARISON_CATEGORIES)
+    comparison_data = compare_metrics(metrics[target.id], [metrics[report_id] for report_id in baseline_ids])
+
+    if result is None:
+        result = ComparisonResult(pair_key=pair_key)
+        db.add(result)
+    result.baseline_report_id = baseline_ids[0]
+    result.target_report_id = target.id
+    result.baseline_report_ids = baseline_ids
+    result.data_version = data_version
+    result.comparison_data = comparison_data
+    result.created_at = datetime.utcnow()
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Computed concurrently by another request, use its result
+        db.rollback()
+        result = db.scalar(select(ComparisonResult).where(ComparisonResult.pair_key == pair_key))
+        return result, True
+
+    db.refresh(result)
+    logger.info(f"Compared report {target.id} with {baseline_ids}: comparison {result.id}")
+    return result, False
@@ -0,0 +1,200 @@
+"""
+Metric Trends over Snapshot History
+
+Reads one metric of one database from the metric_samples time series,
+aggregated per snapshot time (RAC instances and duplicate uploads of a
+snapshot share a point), and downsamples it on the server so a chart of
+years of hourly snapshots still gets only a few hundred points:
+
+    lttb     Largest-Triangle-Three-Buckets, keeps the visual shape
+    minmax   the minimum and maximum of each bucket, keeps every spike
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.metric_sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES = {
+    'avg': func.avg,
+    'sum': func.sum,
+    'min': func.min,
+    'max': func.max,
+}
+
+DOWNSAMPLING_METHODS = ('lttb', 'minmax')
+
+# Relative change over the range below which a trend counts as flat
+FLAT_TREND_THRESHOLD = 0.05
+
+
+def load_series(
+    db: Session,
+    db_name: str,
+    metric_key: str,
+    instance_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    aggregate: str = 'avg',
+) -> Tuple[List[datetime], np.ndarray]:
+    """
+    One value per snapshot time of a metric of a database
+
+    Args:
+        db: Database session
+        db_name: Database name
+        metric_key: Dotted metric key, e.g. load_profile.redo_size_bytes.per_second
+        instance_name: Only this instance (default: all instances)
+        start: First snapshot time (inclusive)
+        end: Last snapshot time (exclusive)
+        aggregate: How values of the same snapshot time are combined (avg, sum, min, max)
+
+    Returns:
+        Snapshot times in ascending order and their values
+    """
+    query = select(
+        MetricSample.snapshot_begin,
+        AGGREGATES[aggregate](MetricSample.value),
+    ).where(
+        MetricSample.db_name == db_name,
+        MetricSample.metric_key == metric_key,
+    )
+    if instance_name:
+        query = query.where(MetricSample.instance_name == instance_name)
+    if start:
+        query = query.where(MetricSample.snapshot_begin >= start)
+    if end:
+        query = query.where(MetricSample.snapshot_begin < end)
+
+    rows = db.execute(query.group_by(MetricSample.snapshot_begin).order_by(MetricSample.snapshot_begin)).all()
+    return [row[0] for row in rows], np.array([row[1] for row in rows], dtype=float)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The points in between are
+    split into threshold - 2 buckets, and each bucket keeps the point
+    forming the largest triangle with the point kept from the previous
+    bucket and the average of the next bucket.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0] = 0
+    kept[-1] = count - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_low, next_high = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_low, next_high = count - 1, count
+        next_x = x[next_low:next_high].mean()
+        next_y = y[next_low:next_high].mean()
+
+        # Twice the triangle areas, the constant factor does not change the argmax
+        areas = np.abs(
+            (x[previous] - next_x) * (y[low:high] - y[previous])
+            - (x[previous] - x[low:high]) * (next_y - y[previous])
+        )
+        previous = low + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+def minmax(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of threshold / 2 buckets, in time order"""
+    count = len(y)
+    if threshold >= count or threshold < 2:
+        return np.arange(count)
+
+    kept = []
+    for bucket in np.array_split(np.arange(count), threshold // 2):
+        values = y[bucket]
+        kept.extend(sorted({bucket[int(np.argmin(values))], bucket[int(np.argmax(values))]}))
+    return np.array(kept, dtype=int)
+
+
+def downsample(times: List[datetime], values: np.ndarray, points: int, method: str = 'lttb') -> np.ndarray:
+    """Indices of at most points samples representing the series"""
+    if method == 'minmax':
+        return minmax(values, points)
+    x = np.array([moment.timestamp() for moment in times], dtype=float)
+    return lttb(x, values, points)
+
+
+def summarize(times: List[datetime], values: np.ndarray) -> Dict[str, Any]:
+    """
+    Statistics of the full series
+
+    The trend direction comes from a least-squares line over time: it is
+    flat if the line changes by less than FLAT_TREND_THRESHOLD of the mean
+    absolute value over the whole range.
+    """
+    if not len(values):
+        return {'count': 0}
+
+    summary = {
+        'count': int(len(values)),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'avg': float(values.mean()),
+        'first': float(values[0]),
+        'last': float(values[-1]),
+        'slope_per_day': 0.0,
+        'trend': 'flat',
+    }
+
+    if len(values) > 1:
+        days = np.array([(moment - times[0]).total_seconds() / 86400 for moment in times])
+        if days[-1] > 0:
+            slope = float(np.polyfit(days, values, 1)[0])
+            summary['slope_per_day'] = slope
+            scale = float(np.abs(values).mean())
+            change = slope * days[-1]
+            if scale and abs(change) >= FLAT_TREND_THRESHOLD * scale:
+                summary['trend'] = 'up' if change > 0 else 'down'
+
+    return summary
+
+
+def metric_trend(
+    db: Session,
+    db_name: str,
+    metric_key: str,
+    points: int,
+    method: str = 'lttb',
+    instance_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    aggregate: str = 'avg',
+) -> Dict[str, Any]:
+    """
+    Downsampled series of a metric with statistics of the full series
+
+    Returns:
+        Dictionary with timestamps, values, total_points and summary
+    """
+    times, values = load_series(db, db_name, metric_key, instance_name, start, end, aggregate)
+    kept = downsample(times, values, points, method)
+
+    return {
+        'total_points': len(times),
+        'timestamps': [times[index] for index in kept.tolist()],
+        'values': values[kept].tolist(),
+        'summary': summarize(times, values),
+    }
@@ -0,0 +1,143 @@
+"""AWR Report Ingestion Helpers"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.parser.factory import AWRParserFactory
+from app.core.normalizer import normalize_metrics
+from app.core.storage import report_size
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sections of the normalized metric map stored as PerformanceMetric rows
+METRIC_CATEGORIES = [
+    'load_profile',
+    'wait_events',
+    'top_sql',
+    'memory_stats',
+    'io_stats',
+    'instance_efficiency',
+    'derived',
+]
+
+# AWRReport columns filled from parsed data
+REPORT_METADATA_FIELDS = (
+    'oracle_version',
+    'db_name',
+    'dbid',
+    'instance_name',
+    'instance_number',
+    'host_name',
+    'rac',
+    'begin_snap_id',
+    'end_snap_id',
+    'snapshot_begin',
+    'snapshot_end',
+    'snapshot_interval',
+)
+
+
+# Sections report_metadata() reads
+METADATA_SECTIONS = ('instance_info', 'snapshot_info')
+
+
+def parse_report_file(
+    file_path: str,
+    file_size: Optional[int] = None,
+    backend: Optional[str] = None,
+    sections: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a stored AWR report
+
+    The report is decompressed straight into the parser. Reports larger than
+    STREAMING_PARSE_THRESHOLD, and compressed reports of unknown size, use
+    the bounded-memory streaming parser instead of a full tree.
+
+    Args:
+        file_path: Path of the stored report (optionally compressed)
+        file_size: Uncompressed size in bytes, if known
+        backend: Document backend for in-memory parses (defaults to PARSER_BACKEND)
+        sections: Sections to parse (defaults to all)
+
+    Returns:
+        Dictionary containing the parsed sections
+    """
+    if file_size is None:
+        file_size = report_size(file_path)
+
+    if file_size is None or file_size > settings.STREAMING_PARSE_THRESHOLD:
+        parser = AWRParserFactory.create_streaming_parser(file_path)
+    else:
+        parser = AWRParserFactory.create_file_parser(file_path, backend=backend or settings.PARSER_BACKEND)
+
+    return parser.parse(sections=sections)
+
+
+def parse_report_metadata(file_path: str, file_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    AWRReport column values of a stored report, parsing only METADATA_SECTIONS
+
+    Args:
+        file_path: Path of the stored report (optionally compressed)
+        file_size: Uncompressed size in bytes, if known
+
+    Returns:
+        Dictionary of AWRReport attribute name to value
+    """
+    return report_metadata(parse_report_file(file_path, file_size, sections=METADATA_SECTIONS))
+
+
+def report_metadata(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract AWRReport column values from parsed data
+
+    Args:
+        parsed_data: Result of parser.parse(), at least METADATA_SECTIONS
+
+    Returns:
+        Dictionary of AWRReport attribute name to value
+    """
+    instance_info = parsed_data.get('instance_info', {})
+    snapshot_info = parsed_data.get('snapshot_info', {})
+
+    metadata = {
+        'oracle_version': instance_info.get('oracle_version'),
+        'db_name': instance_info.get('db_name'),
+        'dbid': instance_info.get('dbid'),
+        'instance_name': instance_info.get('instance_name'),
+        'instance_number': instance_info.get('instance_number'),
+        'host_name': instance_info.get('host_name'),
+        'rac': instance_info.get('rac'),
+        'begin_snap_id': snapshot_info.get('begin_snap_id'),
+        'end_snap_id': snapshot_info.get('end_snap_id'),
+        'snapshot_begin': snapshot_info.get('begin_time'),
+        'snapshot_end': snapshot_info.get('end_time'),
+        'snapshot_interval': None,
+    }
+
+    # Calculate snapshot interval in minutes
+    if metadata['snapshot_begin'] and metadata['snapshot_end']:
+        elapsed_seconds = snapshot_info.get('elapsed_time', 0)
+        metadata['snapshot_interval'] = int(elapsed_seconds / 60) if elapsed_seconds > 0 else None
+
+    return metadata
+
+
+def metric_records(parsed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build PerformanceMetric values for every non-empty metric category
+
+    Args:
+        parsed_data: Result of parser.parse()
+
+    Returns:
+        List of dictionaries with metric_category and the normalized metric_data
+    """
+    metrics = normalize_metrics(parsed_data)
+    return [
+        {'metric_category': category, 'metric_data': metrics[category]}
+        for category in METRIC_CATEGORIES
+        if metrics.get(category)
+    ]
@@ -0,0 +1,134 @@
+"""
+Metric Categories of a Report in One Query
+
+Loads several metric categories of a report at once, optionally projected
+to selected fields. Projection happens in PostgreSQL: a projected
+category is returned as a JSONB object of the selected paths (extracted
+with #>), so only those values leave the database. Other databases load
+the whole category and apply the same paths in Python.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.performance_metric import PerformanceMetric
+from app.core.ingest import METRIC_CATEGORIES
+
+# Paths to select per category, None for the whole category
+Projection = Dict[str, Optional[List[Tuple[str, ...]]]]
+
+
+def parse_projection(categories: Optional[Sequence[str]], fields: Optional[Sequence[str]]) -> Projection:
+    """
+    Build a projection from requested categories and dotted field paths
+
+    Args:
+        categories: Categories to load (default: all, or those named by fields)
+        fields: Paths such as "top_sql.abcd1234" or "load_profile.db_time_s.per_second";
+            a category with fields returns only those paths
+
+    Returns:
+        Projection in METRIC_CATEGORIES order
+
+    Raises:
+        ValueError: If a category is unknown or a field has no path within its category
+    """
+    requested = set(categories or ())
+    unknown = requested - set(METRIC_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown metric categories: {', '.join(sorted(unknown))}")
+
+    paths: Dict[str, List[Tuple[str, ...]]] = {}
+    for field in fields or ():
+        category, _, path = field.partition('.')
+        if category not in METRIC_CATEGORIES:
+            raise ValueError(f"Unknown metric category in field: {field}")
+        if not path:
+            raise ValueError(f"Field needs a path within its category: {field}")
+        category_paths = paths.setdefault(category, [])
+        if tuple(path.split('.')) not in category_paths:
+            category_paths.append(tuple(path.split('.')))
+
+    if not requested:
+        requested = set(paths) if paths else set(METRIC_CATEGORIES)
+    requested.update(paths)
+
+    return {category: paths.get(category) for category in METRIC_CATEGORIES if category in requested}
+
+
+def _set_path(target: Dict[str, Any], path: Tuple[str, ...], value: Any):
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    target[path[-1]] = value
+
+
+def _get_path(data: Any, path: Tuple[str, ...]) -> Any:
+    """Value at a path, like #> in PostgreSQL: keys of objects, indexes of arrays"""
+    for key in path:
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and key.lstrip('-').isdigit() and -len(data) <= int(key) < len(data):
+            data = data[int(key)]
+        else:
+            return None
+    return data
+
+
+def load_metrics(db: Session, report_id: int, projection: Projection) -> Dict[str, Any]:
+    """
+    Load the projected metric categories of a report
+
+    Args:
+        db: Database session
+        report_id: Report to load
+        projection: Result of parse_projection()
+
+    Returns:
+        {category: data}; categories the report has no metrics for are
+        omitted, and so are selected paths that do not exist
+    """
+    data = PerformanceMetric.metric_data
+    projected = {category: paths for category, paths in projection.items() if paths}
+    in_database = db.get_bind().dialect.name == 'postgresql'
+
+    if projected and in_database:
+        data = case(
+            *[
+                (
+                    PerformanceMetric.metric_category == category,
+                    func.jsonb_build_object(*[
+                        argument
+                        for path in paths
+                        for argument in (literal('.'.join(path)), PerformanceMetric.metric_data[path])
+                    ], type_=JSONB),
+                )
+                for category, paths in projected.items()
+            ],
+            else_=PerformanceMetric.metric_data,
+        )
+
+    query = select(PerformanceMetric.metric_category, data).where(
+        PerformanceMetric.report_id == report_id,
+        PerformanceMetric.metric_category.in_(list(projection)),
+    ).order_by(PerformanceMetric.id.desc())
+
+    metrics: Dict[str, Any] = {}
+    for category, category_data in db.execute(query):
+        if category in metrics:
+            continue  # the newest row wins if the report was parsed more than once
+        if category in projected:
+            values: Dict[str, Any] = {}
+            for path in projected[category]:
+                if in_database:
+                    value = category_data.get('.'.join(path))
+                else:
+                    value = _get_path(category_data, path)
+                if value is not None:
+                    _set_path(values, path, value)
+            category_data = values
+        metrics[category] = category_data
+
+    return {category: metrics[category] for category in projection if category in metrics}
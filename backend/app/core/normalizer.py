@@ -0,0 +1,149 @@
+"""
+Metric Normalization
+
+Turns parser output into the keyed metric map that is stored, served by
+the API and read by the rule engine. Every level is a dictionary with
+canonical keys, so any metric is reached by a dotted path such as
+wait_events.db_file_sequential_read.pct_db_time without scanning lists:
+
+    load_profile   metric_key(statistic) -> {per_second, per_txn}
+    wait_events    metric_key(event)     -> {name, waits, time_waited, avg_wait, pct_db_time, wait_class}
+    top_sql        sql_id                -> {sql_text, <statistics>, rank, pct_total}
+    derived        ratios computed from the sections above
+"""
+
+import re
+from typing import Any, Dict, Mapping, Optional
+
+# Sections copied unchanged
+PASSTHROUGH_SECTIONS = ('instance_info', 'snapshot_info')
+
+# Sections whose keys are statistic names
+KEYED_SECTIONS = ('memory_stats', 'io_stats', 'instance_efficiency')
+
+# SQL statistics that differ between the "SQL ordered by" tables
+PER_ORDERING_FIELDS = ('pct_total',)
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+
+def metric_key(name: str) -> str:
+    """
+    Canonical key of a statistic, event or column name
+
+    Examples:
+        "Physical read (blocks):" -> "physical_read_blocks"
+        "db file sequential read" -> "db_file_sequential_read"
+        "SQL*Net message from client" -> "sql_net_message_from_client"
+        "%Total" -> "pct_total"
+    """
+    name = str(name).lower().replace('%', ' pct ')
+    return _NON_ALNUM_RE.sub('_', name).strip('_')
+
+
+def _ratio(numerator: Optional[float], denominator: Optional[float], scale: float = 1.0) -> Optional[float]:
+    if not isinstance(numerator, (int, float)) or not isinstance(denominator, (int, float)) or not denominator:
+        return None
+    return round(numerator / denominator * scale, 2)
+
+
+def normalize_load_profile(load_profile: Mapping[str, Any]) -> Dict[str, Any]:
+    """Load Profile keyed by statistic"""
+    return {metric_key(name): values for name, values in load_profile.items() if metric_key(name)}
+
+
+def normalize_wait_events(wait_events: Mapping[str, Any]) -> Dict[str, Any]:
+    """Wait events keyed by event; the first (highest ranked) row of an event wins"""
+    events = {}
+    for event in wait_events.get('events', []):
+        key = metric_key(event.get('name', ''))
+        if key and key not in events:
+            events[key] = event.to_dict()
+    return events
+
+
+def normalize_top_sql(top_sql: Mapping[str, Any], sql_text: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """
+    Merge the "SQL ordered by" lists into one entry per sql_id
+
+    Each entry holds the statistics of the statement once, its rank in
+    every list it appears in, and the list-specific %Total values. The
+    truncated sql_text of the lists is replaced by the full text where
+    the Complete List of SQL Text has it.
+    """
+    statements: Dict[str, Dict[str, Any]] = {}
+
+    for ordering, sql_list in top_sql.items():
+        for rank, row in enumerate(sql_list, 1):
+            fields = row.to_dict()
+            sql_id = fields.pop('sql_id', None)
+            if not sql_id:
+                continue
+
+            entry = statements.setdefault(sql_id, {'rank': {}, 'pct_total': {}})
+            entry['rank'].setdefault(ordering, rank)
+            for field, value in fields.items():
+                if field in PER_ORDERING_FIELDS:
+                    entry[field].setdefault(ordering, value)
+                else:
+                    entry.setdefault(field, value)
+
+    for sql_id, text in (sql_text or {}).items():
+        if sql_id in statements:
+            statements[sql_id]['sql_text'] = text
+
+    return statements
+
+
+def derived_metrics(metrics: Mapping[str, Any]) -> Dict[str, Any]:
+    """Ratios computed from the normalized sections, omitted when their inputs are missing"""
+    load_profile = metrics.get('load_profile', {})
+
+    def per_second(key: str) -> Optional[float]:
+        return load_profile.get(key, {}).get('per_second')
+
+    derived = {
+        'hard_parse_ratio': _ratio(per_second('hard_parses_sql'), per_second('parses_sql'), 100),
+        'executions_per_parse': _ratio(per_second('executes_sql'), per_second('parses_sql')),
+        'db_cpu_ratio': _ratio(per_second('db_cpu_s'), per_second('db_time_s'), 100),
+    }
+
+    buffer_hit = metrics.get('instance_efficiency', {}).get('buffer_hit_pct')
+    if isinstance(buffer_hit, (int, float)):
+        derived['buffer_hit_ratio'] = buffer_hit
+    else:
+        physical_reads = _ratio(per_second('physical_read_blocks'), per_second('logical_read_blocks'), 100)
+        derived['buffer_hit_ratio'] = None if physical_reads is None else round(100 - physical_reads, 2)
+
+    return {name: value for name, value in derived.items() if value is not None}
+
+
+def normalize_metrics(parsed_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build the keyed metric map from parser output
+
+    Args:
+        parsed_data: Result of parser.parse() (a dict or a lazy ParseResult)
+
+    Returns:
+        Dictionary of section name to keyed metrics
+    """
+    metrics: Dict[str, Any] = {}
+
+    for section in PASSTHROUGH_SECTIONS:
+        if section in parsed_data:
+            metrics[section] = parsed_data[section]
+
+    if 'load_profile' in parsed_data:
+        metrics['load_profile'] = normalize_load_profile(parsed_data['load_profile'])
+    if 'wait_events' in parsed_data:
+        metrics['wait_events'] = normalize_wait_events(parsed_data['wait_events'])
+    if 'top_sql' in parsed_data:
+        metrics['top_sql'] = normalize_top_sql(parsed_data['top_sql'], parsed_data.get('sql_text'))
+
+    for section in KEYED_SECTIONS:
+        if section in parsed_data:
+            metrics[section] = {metric_key(name): value for name, value in parsed_data[section].items()}
+
+    metrics['derived'] = derived_metrics(metrics)
+    return metrics
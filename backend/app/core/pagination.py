@@ -0,0 +1,68 @@
+"""
+Keyset Pagination and Row Count Estimates
+
+Report lists are ordered by (upload_time, id) descending. A cursor holds
+the sort key of the last row of a page, and the next page starts after it
+through the matching composite index instead of skipping OFFSET rows, so
+every page costs the same however deep it is.
+
+Exact counts scan every matching row. estimate_count() asks PostgreSQL's
+planner instead, which reads table statistics in constant time.
+"""
+
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Query, Session
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ('exact', 'estimated', 'none')
+
+
+def encode_cursor(upload_time: Optional[datetime], report_id: int) -> str:
+    """Opaque cursor pointing after a report"""
+    key = [upload_time.isoformat() if upload_time else None, report_id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Sort key stored in a cursor
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor()
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        upload_time, report_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(upload_time) if upload_time else None), int(report_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def estimate_count(db: Session, query: Query) -> Optional[int]:
+    """
+    Planner estimate of the number of rows a query returns
+
+    Returns:
+        Estimated row count, or None if the database cannot estimate it
+        (only PostgreSQL is supported)
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        return None
+
+    try:
+        compiled = query.statement.compile(db.get_bind())
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    except Exception as e:
+        logger.warning(f"Failed to estimate row count: {e}")
+        db.rollback()
+        return None
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
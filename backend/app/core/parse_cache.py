@@ -0,0 +1,83 @@
+"""Parse Result Cache Keyed by Report Content Hash"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.awr_report import AWRReport, ReportStatus
+from app.models.performance_metric import PerformanceMetric
+from app.core.parser.base import PARSER_VERSION
+from app.core.ingest import REPORT_METADATA_FIELDS
+from app.core.timeseries import copy_samples
+from app.core.sql_stats import copy_sql_stats
+
+logger = logging.getLogger(__name__)
+
+
+def find_parsed_report(db: Session, content_hash: str, exclude_id: Optional[int] = None) -> Optional[AWRReport]:
+    """
+    Find a report with the same content already parsed by this parser version
+
+    Args:
+        db: Database session
+        content_hash: SHA-256 of the report HTML
+        exclude_id: Report to ignore (usually the one being parsed)
+
+    Returns:
+        Oldest matching parsed report, or None
+    """
+    query = db.query(AWRReport).filter(
+        AWRReport.content_hash == content_hash,
+        AWRReport.parser_version == PARSER_VERSION,
+        AWRReport.status == ReportStatus.PARSED,
+    )
+    if exclude_id is not None:
+        query = query.filter(AWRReport.id != exclude_id)
+
+    return query.order_by(AWRReport.id).first()
+
+
+def reuse_parse_result(db: Session, source: AWRReport, report: AWRReport):
+    """
+    Give a report the parsed metadata and metrics of an identical report
+
+    Metrics, metric samples and SQL statistics are copied with
+    INSERT ... SELECT, so each report still owns its rows and can be
+    deleted independently. The RAC cluster snapshot keeps pointing at the
+    source; it moves to the copy if the source is deleted (see
+    app.core.cluster.remove_report). The caller commits.
+
+    Args:
+        db: Database session
+        source: Parsed report with the same content hash
+        report: Report to fill in
+    """
+    for field in REPORT_METADATA_FIELDS:
+        setattr(report, field, getattr(source, field))
+
+    report.parser_version = source.parser_version
+    report.rules_version = None
+    report.status = ReportStatus.PARSED
+    report.error_message = None
+    report.updated_at = datetime.utcnow()
+    db.flush()
+
+    db.execute(delete(PerformanceMetric).where(PerformanceMetric.report_id == report.id))
+    db.execute(
+        insert(PerformanceMetric).from_select(
+            ['report_id', 'metric_category', 'metric_data', 'created_at'],
+            select(
+                literal(report.id),
+                PerformanceMetric.metric_category,
+                PerformanceMetric.metric_data,
+                literal(datetime.utcnow()),
+            ).where(PerformanceMetric.report_id == source.id)
+        )
+    )
+    copy_samples(db, source.id, report.id)
+    copy_sql_stats(db, source.id, report.id)
+
+    logger.info(f"Reused parse result of report {source.id} for report {report.id}")
@@ -1,6 +1,7 @@
 """AWR Parser Module"""
 
 from app.core.parser.factory import AWRParserFactory
-from app.core.parser.base import BaseAWRParser
+from app.core.parser.base import BaseAWRParser, PARSER_VERSION
+from app.core.parser.result import ParseResult
 
-__all__ = ["AWRParserFactory", "BaseAWRParser"]
+__all__ = ["AWRParserFactory", "BaseAWRParser", "ParseResult", "PARSER_VERSION"]
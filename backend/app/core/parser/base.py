@@ -1,57 +1,159 @@
 """Base AWR Parser"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from bs4 import BeautifulSoup, Tag
+from typing import Dict, Any, BinaryIO, Iterable, List, Optional, Tuple, Union
 import re
 import logging
 
-from app.core.parser.utils import parse_value, clean_text
+from app.core.parser.utils import parse_value
+from app.core.parser.columns import Record, TableSchema
+from app.core.parser.document import AWRDocument, StreamingDocument, load_document
+from app.core.parser.result import ParseResult
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever parse output changes, so cached parse results are not reused
+# 2: metrics stored as the normalized map of app.core.normalizer
+# 3: instance and snapshot info read from the header tables (dbid, snap ids)
+# 4: wait event and SQL tables read through column schemas, all SQL rows kept
+# 5: all "SQL ordered by" tables and the complete SQL text list
+# 6: RAC flag stored with the report, only RAC instances are merged into clusters
+PARSER_VERSION = "6"
+
 
 class BaseAWRParser(ABC):
     """Base class for AWR parsers"""
 
-    def __init__(self, html_content: str):
+    # Sections returned by parse(), each produced by _parse_<section>()
+    SECTIONS: Tuple[str, ...] = (
+        'instance_info',
+        'snapshot_info',
+        'load_profile',
+        'wait_events',
+        'top_sql',
+        'sql_text',
+        'memory_stats',
+        'io_stats',
+        'instance_efficiency',
+    )
+
+    # Every header passed to _find_table_by_header. A streaming parse keeps
+    # all rows of the tables these headers can resolve to.
+    SECTION_HEADERS: Tuple[str, ...] = ()
+
+    # Substrings scanned for across all tables (header key/value rows).
+    # A streaming parse keeps only the matching rows of the other tables.
+    ROW_KEYWORDS: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        html_content: Optional[str] = None,
+        backend: Optional[str] = None,
+        document: Optional[AWRDocument] = None,
+    ):
         """
-        Initialize parser with HTML content
+        Initialize parser with HTML content or an already loaded document
 
         Args:
             html_content: AWR report HTML string
+            backend: Document backend, "lxml" or "bs4" (defaults to lxml)
+            document: Pre-built document, e.g. from a streaming parse
         """
+        if document is None:
+            if html_content is None:
+                raise ValueError("Either html_content or document is required")
+            document = load_document(html_content, backend)
+
         self.html_content = html_content
-        self.soup = BeautifulSoup(html_content, 'lxml')
+        self.document: AWRDocument = document
+        self.section_index = self.document.section_index
         self.data: Dict[str, Any] = {}
 
-    def parse(self) -> Dict[str, Any]:
+    @classmethod
+    def from_stream(cls, source: Union[str, BinaryIO], encoding: str = 'utf-8') -> "BaseAWRParser":
+        """
+        Create a parser that reads the report incrementally from disk
+
+        The raw HTML is never held in memory as a whole; see
+        StreamingDocument for what is retained.
+
+        Args:
+            source: File path or binary file object of the AWR report
+            encoding: Character encoding of the report
+
+        Returns:
+            Parser instance ready for parse()
+        """
+        document = StreamingDocument(source, cls.SECTION_HEADERS, cls.ROW_KEYWORDS, encoding)
+        return cls(document=document)
+
+    def parse(
+        self,
+        sections: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+    ) -> Union[Dict[str, Any], ParseResult]:
         """
         Main parsing entry point
 
+        Args:
+            sections: Section names to parse (defaults to all of SECTIONS)
+            lazy: If True, return a ParseResult that parses each section
+                on first access instead of parsing them all now
+
         Returns:
-            Dictionary containing all parsed data
+            Dictionary (or lazy mapping) of section name to parsed data
+
+        Raises:
+            ValueError: If a section name is unknown
         """
+        selected = self._select_sections(sections)
+
+        if lazy:
+            return ParseResult(self, selected)
+
         logger.info("Starting AWR report parsing")
 
-        try:
-            self.data = {
-                'instance_info': self._parse_instance_info(),
-                'snapshot_info': self._parse_snapshot_info(),
-                'load_profile': self._parse_load_profile(),
-                'wait_events': self._parse_wait_events(),
-                'top_sql': self._parse_top_sql(),
-                'memory_stats': self._parse_memory_stats(),
-                'io_stats': self._parse_io_stats(),
-                'instance_efficiency': self._parse_instance_efficiency(),
-            }
-
-            logger.info("AWR report parsing completed successfully")
-            return self.data
-
-        except Exception as e:
-            logger.error(f"Error parsing AWR report: {e}", exc_info=True)
-            raise
+        result = {section: self.parse_section(section) for section in selected}
+
+        logger.info("AWR report parsing completed successfully")
+        return result
+
+    def parse_section(self, section: str) -> Any:
+        """
+        Parse a single section, memoized in self.data
+
+        Args:
+            section: Section name from SECTIONS
+
+        Returns:
+            Parsed section data
+
+        Raises:
+            ValueError: If the section name is unknown
+        """
+        if section not in self.data:
+            if section not in self.SECTIONS:
+                raise ValueError(f"Unknown AWR section: {section}")
+
+            try:
+                self.data[section] = getattr(self, f"_parse_{section}")()
+            except Exception as e:
+                logger.error(f"Error parsing AWR section {section}: {e}", exc_info=True)
+                raise
+
+        return self.data[section]
+
+    def _select_sections(self, sections: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Validate requested section names, keeping SECTIONS order"""
+        if sections is None:
+            return self.SECTIONS
+
+        requested = set(sections)
+        unknown = requested.difference(self.SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown AWR sections: {', '.join(sorted(unknown))}")
+
+        return tuple(section for section in self.SECTIONS if section in requested)
 
     @abstractmethod
     def _parse_instance_info(self) -> Dict[str, Any]:
@@ -78,6 +180,11 @@ class BaseAWRParser(ABC):
         """Parse Top SQL statistics (must be implemented by subclasses)"""
         pass
 
+    def _parse_sql_text(self) -> Dict[str, str]:
+        """Parse the full SQL text by sql_id (optional, can be overridden)"""
+        logger.debug("Parsing SQL text")
+        return {}
+
     def _parse_memory_stats(self) -> Dict[str, Any]:
         """Parse memory statistics (optional, can be overridden)"""
         logger.debug("Parsing memory statistics")
@@ -93,53 +200,77 @@ class BaseAWRParser(ABC):
         logger.debug("Parsing instance efficiency")
         return {}
 
-    def _find_table_by_header(self, header_text: str, exact: bool = False) -> Optional[Tag]:
+    def _find_table_by_header(self, header_text: str, exact: bool = False) -> Optional[Any]:
         """
-        Find table by header text using multiple strategies
+        Find table by header text using the section index
+
+        Lookups are resolved against the index built at construction
+        (<th> text, then anchors, then section headings, then table
+        summary attributes) and memoized per header text.
 
         Args:
             header_text: Text to search for in headers
             exact: If True, requires exact match; if False, uses substring match
 
         Returns:
-            BeautifulSoup Tag object for the table, or None if not found
-        """
-        # Strategy 1: Search in <th> tags
-        for th in self.soup.find_all('th'):
-            th_text = clean_text(th.get_text())
-            if exact:
-                if th_text == header_text:
-                    return th.find_parent('table')
-            else:
-                if header_text.lower() in th_text.lower():
-                    return th.find_parent('table')
-
-        # Strategy 2: Search in <a> tags with 'name' attribute (anchors)
-        for a in self.soup.find_all('a', attrs={'name': True}):
-            anchor_name = a['name'].lower()
-            if header_text.lower().replace(' ', '') in anchor_name:
-                # Find next table after this anchor
-                next_table = a.find_next('table')
-                if next_table:
-                    return next_table
-
-        # Strategy 3: Search in <h2>, <h3>, <b> tags (section headers)
-        for tag in self.soup.find_all(['h2', 'h3', 'b']):
-            tag_text = clean_text(tag.get_text())
-            if header_text.lower() in tag_text.lower():
-                next_table = tag.find_next('table')
-                if next_table:
-                    return next_table
-
-        logger.warning(f"Table not found for header: {header_text}")
-        return None
-
-    def _parse_table_to_dict(self, table: Tag, key_col: int = 0, value_col: int = 1) -> Dict[str, Any]:
+            Table element, or None if not found
+        """
+        table = self.document.find_table(header_text, exact=exact)
+
+        if table is None:
+            logger.warning(f"Table not found for header: {header_text}")
+
+        return table
+
+    def _table_rows(self, table: Any, keywords: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """
+        Get the cleaned cell texts of a table, row by row
+
+        Args:
+            table: Table element returned by _find_table_by_header
+            keywords: If given, only rows containing one of them are returned,
+                which avoids extracting cells the caller would skip anyway
+
+        Returns:
+            List of rows, each a list of cell texts
+        """
+        return self.document.table_rows(table, keywords)
+
+    def _parse_records(self, schema: TableSchema, headers: Iterable[str]) -> List[Record]:
+        """
+        Parse the first table whose header row has the columns of a schema
+
+        The schema is resolved once against the header row; the data rows
+        are then read through the resulting index map.
+
+        Args:
+            schema: Columns to read
+            headers: Lookups passed to the section index, in order of preference
+
+        Returns:
+            One record per data row, empty if no candidate table has the
+            required columns
+        """
+        for header_text in headers:
+            table = self.document.find_table(header_text)
+            if table is None:
+                continue
+
+            rows = self._table_rows(table)
+            column_map = schema.resolve(rows[0]) if rows else None
+            if column_map is not None:
+                return column_map.records(rows[1:])
+            logger.debug(f"Table for {header_text} lacks the {schema.name} columns")
+
+        logger.warning(f"Table not found for {schema.name}")
+        return []
+
+    def _parse_table_to_dict(self, table: Any, key_col: int = 0, value_col: int = 1) -> Dict[str, Any]:
         """
         Parse a simple key-value table into dictionary
 
         Args:
-            table: BeautifulSoup table Tag
+            table: Table element
             key_col: Column index for keys (0-based)
             value_col: Column index for values (0-based)
 
@@ -148,17 +279,13 @@ class BaseAWRParser(ABC):
         """
         result = {}
 
-        if not table:
+        if table is None:
             return result
 
-        rows = table.find_all('tr')
-
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-
+        for cells in self._table_rows(table):
             if len(cells) > max(key_col, value_col):
-                key = clean_text(cells[key_col].get_text())
-                value_text = clean_text(cells[value_col].get_text())
+                key = cells[key_col]
+                value_text = cells[value_col]
 
                 if key:
                     # Try to parse as number, fall back to string
@@ -166,12 +293,31 @@ class BaseAWRParser(ABC):
 
         return result
 
-    def _parse_table_to_list(self, table: Tag, skip_header: bool = True) -> list:
+    def _header_record(self, table: Any) -> Dict[str, str]:
+        """
+        Parse a report header table, a row of column names over a row of values
+
+        Args:
+            table: Table element
+
+        Returns:
+            Cell texts of the first data row keyed by column name
+        """
+        if table is None:
+            return {}
+
+        rows = self._table_rows(table)
+        if len(rows) < 2:
+            return {}
+
+        return dict(zip(rows[0], rows[1]))
+
+    def _parse_table_to_list(self, table: Any, skip_header: bool = True) -> list:
         """
         Parse table into list of dictionaries
 
         Args:
-            table: BeautifulSoup table Tag
+            table: Table element
             skip_header: Whether to skip the first row (header)
 
         Returns:
@@ -179,30 +325,26 @@ class BaseAWRParser(ABC):
         """
         result = []
 
-        if not table:
+        if table is None:
             return result
 
-        rows = table.find_all('tr')
+        rows = self._table_rows(table)
 
         if not rows:
             return result
 
         # Extract headers
-        header_row = rows[0]
-        headers = [clean_text(th.get_text()) for th in header_row.find_all(['th', 'td'])]
+        headers = rows[0]
 
         # Parse data rows
         start_index = 1 if skip_header else 0
 
-        for row in rows[start_index:]:
-            cells = row.find_all(['td', 'th'])
-
+        for cells in rows[start_index:]:
             if len(cells) >= len(headers):
                 row_data = {}
                 for i, header in enumerate(headers):
                     if i < len(cells):
-                        cell_text = clean_text(cells[i].get_text())
-                        row_data[header] = cell_text
+                        row_data[header] = cells[i]
 
                 if row_data:
                     result.append(row_data)
@@ -0,0 +1,185 @@
+"""
+Declarative Column Schemas for AWR Tables
+
+The column layout of an AWR table differs between releases (extra PDB
+Name columns, renamed headers such as "Wait Avg(ms)" / "Avg Wait"). A
+TableSchema lists the columns a parser reads, each with every header text
+it appears under. The schema is resolved once per table against the
+header row into a fixed index map, and the data rows are then converted
+column by column into compact records:
+
+    schema = TableSchema('wait events', WaitEventRecord, columns, required=('name', 'pct_db_time'))
+    column_map = schema.resolve(rows[0])      # None if a required column is missing
+    events = column_map.records(rows[1:])
+"""
+
+from itertools import repeat
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from app.core.parser.utils import parse_milliseconds, parse_values
+
+# Column kinds and the conversion of a whole column of cells
+COLUMN_CONVERTERS: Dict[str, Callable[[Sequence[str]], List[Any]]] = {
+    'text': list,
+    'number': parse_values,
+    'ms': lambda texts: [parse_milliseconds(text) for text in texts],
+}
+
+
+class Record:
+    """
+    Base of the row records, one slot per field
+
+    Fields whose column is missing from a table are None. Records support
+    the read-only dict idioms the callers use (get, to_dict).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values: Any):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = getattr(self, field, None)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fields that have a value"""
+        return {field: getattr(self, field) for field in self.__slots__ if getattr(self, field) is not None}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{field}={value!r}" for field, value in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class WaitEventRecord(Record):
+    """A wait event; time_waited in seconds, avg_wait in milliseconds"""
+
+    __slots__ = ('name', 'waits', 'time_waited', 'avg_wait', 'pct_db_time', 'wait_class')
+
+
+class SqlStatRecord(Record):
+    """A statement of a "SQL ordered by" table; field names are metric_key() of the headers"""
+
+    __slots__ = (
+        'sql_id',
+        'sql_text',
+        'sql_module',
+        'pdb_name',
+        'executions',
+        'pct_total',
+        'elapsed_time_s',
+        'elapsed_time_per_exec_s',
+        'cpu_time_s',
+        'cpu_per_exec_s',
+        'buffer_gets',
+        'gets_per_exec',
+        'physical_reads',
+        'reads_per_exec',
+        'rows_processed',
+        'rows_per_exec',
+        'user_io_time_s',
+        'uio_per_exec_s',
+        'cluster_wait_time_s',
+        'parse_calls',
+        'version_count',
+        'sharable_mem_b',
+        'pct_cpu',
+        'pct_io',
+        'pct_clu',
+    )
+
+
+class Column(NamedTuple):
+    """A field and the header texts it appears under"""
+
+    field: str
+    headers: Tuple[str, ...]
+    kind: str = 'number'
+
+
+class ColumnMap:
+    """A TableSchema resolved against the header row of one table"""
+
+    def __init__(self, schema: "TableSchema", indexes: Dict[str, Tuple[int, str]]):
+        """
+        Args:
+            schema: The resolved schema
+            indexes: Field to (cell index, column kind) of the columns found
+        """
+        self.schema = schema
+        self.indexes = indexes
+        self.width = max(index for index, kind in indexes.values()) + 1
+
+    def records(self, rows: Sequence[Sequence[str]]) -> List[Record]:
+        """
+        Records of the data rows
+
+        Rows shorter than the resolved columns (sub-headers, notes) and rows
+        with an empty key cell are skipped. All rows are kept otherwise.
+        """
+        key_index = self.indexes[self.schema.key][0]
+        rows = [cells for cells in rows if len(cells) >= self.width and cells[key_index]]
+        if not rows:
+            return []
+
+        columns = {
+            field: COLUMN_CONVERTERS[kind]([cells[index] for cells in rows])
+            for field, (index, kind) in self.indexes.items()
+        }
+        record_type = self.schema.record_type
+        series = [columns[field] if field in columns else repeat(None) for field in record_type.__slots__]
+        return [record_type(*values) for values in zip(*series)]
+
+
+class TableSchema:
+    """Columns read from one kind of AWR table"""
+
+    def __init__(
+        self,
+        name: str,
+        record_type: Type[Record],
+        columns: Sequence[Column],
+        required: Sequence[str] = (),
+    ):
+        """
+        Args:
+            name: Table description for log messages
+            record_type: Record class, with a slot for every column field
+            columns: Columns that are read when the table has them
+            required: Fields the table must have; the first one is the row key
+        """
+        self.name = name
+        self.record_type = record_type
+        self.columns = tuple(columns)
+        self.required = tuple(required)
+        self.key = self.required[0] if self.required else self.columns[0].field
+        self._fields = {header: column for column in self.columns for header in column.headers}
+
+    def resolve(self, header_row: Sequence[str]) -> Optional[ColumnMap]:
+        """
+        Index map of the columns in a header row
+
+        The first cell under a known header wins.
+
+        Returns:
+            The column map, or None if a required column is missing
+        """
+        indexes: Dict[str, Tuple[int, str]] = {}
+        for index, header in enumerate(header_row):
+            column = self._fields.get(header)
+            if column is not None and column.field not in indexes:
+                indexes[column.field] = (index, column.kind)
+
+        if any(field not in indexes for field in self.required) or self.key not in indexes:
+            return None
+        return ColumnMap(self, indexes)
+
+    def __repr__(self) -> str:
+        return f"<TableSchema {self.name}>"
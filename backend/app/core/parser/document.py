@@ -0,0 +1,388 @@
+"""AWR Document Backends"""
+
+from abc import ABC, abstractmethod
+import re
+from typing import Any, BinaryIO, Iterable, List, Optional, Union
+from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+import logging
+
+from app.core.parser.section_index import SectionIndex, HEADING_TAGS
+from app.core.parser.utils import clean_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "lxml"
+
+# Bytes read from disk per step of a streaming parse
+STREAM_CHUNK_SIZE = 64 * 1024
+# A table larger than this is parsed in pieces, cut between rows
+STREAM_FRAGMENT_SIZE = 1024 * 1024
+
+# Tags at which a streaming parse may cut the report
+_BOUNDARY_RE = re.compile(rb'<table\b|</table\s*>|</tr\s*>', re.IGNORECASE)
+# Longest stretch at the end of a buffer that may hold an incomplete boundary tag
+_BOUNDARY_MARGIN = 32
+
+
+class AWRDocument(ABC):
+    """
+    Parsed AWR report tree
+
+    Parsers only talk to the document through the section index and
+    ``table_rows``, so the tree implementation can be swapped without
+    changing their output.
+    """
+
+    backend: str = ""
+
+    def __init__(self):
+        self.section_index: SectionIndex = SectionIndex()
+
+    @property
+    def tables(self) -> List[Any]:
+        """All tables in document order"""
+        return self.section_index.tables
+
+    def find_table(self, header_text: str, exact: bool = False) -> Optional[Any]:
+        """Find the table for a section header"""
+        return self.section_index.find(header_text, exact=exact)
+
+    def table_rows(self, table: Any, keywords: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """
+        Extract the cleaned text of every <td>/<th> cell, row by row
+
+        Args:
+            table: Table element from this document
+            keywords: If given, only rows whose space-joined cell texts
+                contain one of them are extracted
+
+        Returns:
+            List of rows, each a list of cell texts
+        """
+        if not keywords:
+            return [self._row_cells(row) for row in self._rows(table)]
+
+        # Raw text is checked word by word first, so rows that cannot match
+        # are skipped without extracting their cells
+        keyword_words = [keyword.split() for keyword in keywords]
+        if not _may_contain(self._text(table), keyword_words):
+            return []
+
+        return [
+            cells for cells in (
+                self._row_cells(row) for row in self._rows(table)
+                if _may_contain(self._text(row), keyword_words)
+            )
+            if row_contains(cells, keywords)
+        ]
+
+    @abstractmethod
+    def _rows(self, table: Any) -> Iterable[Any]:
+        """<tr> elements of a table, including those of nested tables"""
+        pass
+
+    @abstractmethod
+    def _row_cells(self, row: Any) -> List[str]:
+        """Cleaned texts of the <td>/<th> cells of a row"""
+        pass
+
+    @abstractmethod
+    def _text(self, element: Any) -> str:
+        """Raw text content of an element"""
+        pass
+
+
+def row_contains(cells: List[str], keywords: Iterable[str]) -> bool:
+    """Check whether the space-joined cells of a row contain one of the keywords"""
+    row_text = ' '.join(cells)
+    return any(keyword in row_text for keyword in keywords)
+
+
+def _may_contain(text: str, keyword_words: List[List[str]]) -> bool:
+    """Cheap superset test for row_contains on unnormalized text"""
+    return any(all(word in text for word in words) for words in keyword_words)
+
+
+class SoupDocument(AWRDocument):
+    """Document backed by a BeautifulSoup tree"""
+
+    backend = "bs4"
+
+    def __init__(self, html_content: Union[str, BinaryIO], encoding: str = 'utf-8'):
+        super().__init__()
+        if isinstance(html_content, str):
+            self.soup = BeautifulSoup(html_content, 'lxml')
+        else:
+            self.soup = BeautifulSoup(html_content, 'lxml', from_encoding=encoding)
+        self.section_index = SectionIndex.from_soup(self.soup)
+
+    def _rows(self, table: Any) -> Iterable[Any]:
+        return table.find_all('tr')
+
+    def _row_cells(self, row: Any) -> List[str]:
+        return [clean_text(cell.get_text()) for cell in row.find_all(['td', 'th'])]
+
+    def _text(self, element: Any) -> str:
+        return element.get_text()
+
+
+class LxmlDocument(AWRDocument):
+    """Document backed by an lxml.html tree, with XPath row extraction"""
+
+    backend = "lxml"
+
+    def __init__(self, html_content: Union[str, BinaryIO], encoding: str = 'utf-8'):
+        super().__init__()
+        if isinstance(html_content, str):
+            self.root = lxml.html.document_fromstring(html_content)
+        else:
+            # libxml2 pulls from the stream while building the tree
+            parser = lxml.html.HTMLParser(encoding=encoding)
+            self.root = lxml.html.parse(html_content, parser=parser).getroot()
+        self.section_index = SectionIndex.from_lxml(self.root)
+
+    def _rows(self, table: Any) -> Iterable[Any]:
+        return table.iter('tr')
+
+    def _row_cells(self, row: Any) -> List[str]:
+        return [clean_text(cell.xpath('string()')) for cell in row.iter('td', 'th')]
+
+    def _text(self, element: Any) -> str:
+        return element.xpath('string()')
+
+
+class StreamedTable:
+    """Table captured by StreamingDocument, reduced to its cell texts"""
+
+    __slots__ = ('rows', 'is_section')
+
+    def __init__(self):
+        self.rows: List[List[str]] = []
+        # True once a declared section header can resolve to this table
+        self.is_section = False
+
+
+class StreamingDocument(AWRDocument):
+    """
+    Bounded-memory document built from fixed-size chunks of the report
+
+    The byte stream is cut into fragments that end right after a top-level
+    ``</table>``, or after a ``</tr>`` once a single table has grown past
+    STREAM_FRAGMENT_SIZE. Each fragment is parsed with lxml on its own,
+    reduced to cell texts and discarded, so memory stays bounded by the
+    fragment size instead of the report size. (libxml2's incremental HTML
+    parser keeps all consumed input, so it cannot be used for this.)
+
+    Only what the parser can use is retained. Section markers are indexed
+    only if they match one of ``section_headers``; tables they resolve to
+    keep every row, all other tables keep only rows containing one of
+    ``row_keywords``. Both lists are declared by the parser class (see
+    BaseAWRParser.SECTION_HEADERS / ROW_KEYWORDS), which makes the parsed
+    output identical to a full-tree parse as long as a table's section
+    markers (summary, preceding heading or header row) precede its data.
+    """
+
+    backend = "stream"
+
+    def __init__(
+        self,
+        source: Union[str, BinaryIO],
+        section_headers: Iterable[str] = (),
+        row_keywords: Iterable[str] = (),
+        encoding: str = 'utf-8',
+    ):
+        """
+        Stream a report into the section index
+
+        Args:
+            source: File path or binary file object of the AWR report
+            section_headers: Headers the parser resolves with find_table
+            row_keywords: Row substrings the parser scans for in any table
+            encoding: Character encoding of the report
+        """
+        super().__init__()
+        self._needles = [header.lower() for header in section_headers]
+        self._anchor_needles = [needle.replace(' ', '') for needle in self._needles]
+        self._row_keywords = list(row_keywords)
+        self._html_parser = lxml.html.HTMLParser(encoding=encoding)
+
+        # Table left open by a fragment that was cut between rows
+        self._open_table: Optional[StreamedTable] = None
+
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                self._stream(f)
+        else:
+            self._stream(source)
+
+        self.section_index.log_summary()
+
+    def _stream(self, stream: BinaryIO):
+        """Read the report chunk by chunk and emit parseable fragments"""
+        buffer = b''
+        scan_pos = 0
+        depth = 0
+        eof = False
+
+        while not eof:
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            eof = not chunk
+            buffer += chunk
+
+            # Tokens near the end of the buffer may still be incomplete
+            scan_limit = len(buffer) if eof else len(buffer) - _BOUNDARY_MARGIN
+            fragment_start = 0
+            next_scan = max(scan_pos, scan_limit)
+
+            for match in _BOUNDARY_RE.finditer(buffer, scan_pos):
+                if match.end() > scan_limit:
+                    next_scan = match.start()
+                    break
+
+                token = match.group(0).lower()
+                if token.startswith(b'<table'):
+                    depth += 1
+                elif token.startswith(b'</table'):
+                    depth = max(depth - 1, 0)
+                    if depth == 0:
+                        self._parse_fragment(buffer[fragment_start:match.end()], table_open=False)
+                        fragment_start = match.end()
+                elif depth == 1 and match.end() - fragment_start >= STREAM_FRAGMENT_SIZE:
+                    self._parse_fragment(buffer[fragment_start:match.end()], table_open=True)
+                    fragment_start = match.end()
+
+            buffer = buffer[fragment_start:]
+            scan_pos = max(next_scan - fragment_start, 0)
+
+        if buffer.strip():
+            self._parse_fragment(buffer, table_open=False)
+
+    def _parse_fragment(self, fragment: bytes, table_open: bool):
+        """
+        Parse one fragment and record its markers and rows
+
+        Args:
+            fragment: Raw HTML of the fragment
+            table_open: True if the fragment was cut inside a table
+        """
+        continued_table = self._open_table
+        if continued_table is not None:
+            # Rows of a table split across fragments need a table around them
+            fragment = b'<table>' + fragment
+
+        try:
+            root = lxml.html.document_fromstring(fragment, parser=self._html_parser)
+        except etree.ParserError:
+            # Whitespace or comment-only fragment
+            return
+
+        index = self.section_index
+        tables = []
+        table_map = {}
+
+        for element in root.iter('table', 'th', 'a', *HEADING_TAGS):
+            tag = element.tag
+
+            if tag == 'table':
+                if continued_table is not None and not tables:
+                    table = continued_table
+                else:
+                    table = StreamedTable()
+                    markers = index.add_table(table, element.get('summary'))
+                    # Pending anchors and headings were filtered on arrival
+                    table.is_section = any(
+                        self._matches(marker) or self._matches(marker, anchor=True)
+                        for marker in markers
+                    )
+                tables.append((element, table))
+                table_map[element] = table
+
+            elif tag == 'th':
+                th_text = clean_text(element.xpath('string()'))
+                if self._matches(th_text.lower()):
+                    parent = next(element.iterancestors('table'), None)
+                    parent_table = table_map.get(parent) if parent is not None else None
+                    index.add_header(th_text, parent_table)
+                    if parent_table is not None:
+                        parent_table.is_section = True
+
+            elif tag == 'a' and element.get('name') is not None:
+                anchor_name = element.get('name')
+                if self._matches(anchor_name.lower(), anchor=True):
+                    index.add_anchor(anchor_name)
+
+            if tag in HEADING_TAGS:
+                heading_text = clean_text(element.xpath('string()'))
+                if self._matches(heading_text.lower()):
+                    index.add_heading(heading_text)
+
+        for element, table in tables:
+            rows = [
+                [clean_text(cell.xpath('string()')) for cell in row.iter('td', 'th')]
+                for row in element.iter('tr')
+            ]
+            if not table.is_section:
+                rows = [cells for cells in rows if row_contains(cells, self._row_keywords)]
+            table.rows.extend(rows)
+
+        # The last top-level table continues in the next fragment
+        self._open_table = None
+        if table_open:
+            top_level = [
+                table for element, table in tables
+                if next(element.iterancestors('table'), None) is None
+            ]
+            if top_level:
+                self._open_table = top_level[-1]
+
+    def _matches(self, marker: str, anchor: bool = False) -> bool:
+        """Check whether a lower-cased marker can satisfy a declared section header"""
+        needles = self._anchor_needles if anchor else self._needles
+        return any(needle in marker for needle in needles)
+
+    def _rows(self, table: StreamedTable) -> Iterable[List[str]]:
+        return table.rows
+
+    def _row_cells(self, row: List[str]) -> List[str]:
+        # Rows are stored already cleaned
+        return row
+
+    def _text(self, element: Union[StreamedTable, List[str]]) -> str:
+        if isinstance(element, StreamedTable):
+            return '\n'.join(' '.join(cells) for cells in element.rows)
+        return ' '.join(element)
+
+
+DOCUMENT_BACKENDS = {
+    SoupDocument.backend: SoupDocument,
+    LxmlDocument.backend: LxmlDocument,
+}
+
+
+def load_document(
+    html_content: Union[str, BinaryIO],
+    backend: Optional[str] = None,
+    encoding: str = 'utf-8',
+) -> AWRDocument:
+    """
+    Parse HTML into a document using the requested backend
+
+    Args:
+        html_content: AWR report HTML string, or binary stream of the report
+        backend: "lxml" or "bs4" (defaults to DEFAULT_BACKEND)
+        encoding: Character encoding of a binary stream
+
+    Returns:
+        Parsed document
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = backend or DEFAULT_BACKEND
+
+    if backend not in DOCUMENT_BACKENDS:
+        raise ValueError(f"Unsupported parser backend: {backend}")
+
+    return DOCUMENT_BACKENDS[backend](html_content, encoding)
@@ -1,11 +1,13 @@
 """AWR Parser Factory"""
 
 import logging
-from typing import Type
+from typing import Optional, Type
 
 from app.core.parser.base import BaseAWRParser
 from app.core.parser.oracle19c import Oracle19cParser
-from app.core.parser.version_detector import detect_oracle_version
+from app.core.parser.document import load_document
+from app.core.parser.version_detector import detect_oracle_version, HEADER_SCAN_CHARS
+from app.core.storage import open_report
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +16,13 @@ class AWRParserFactory:
     """Factory for creating appropriate AWR parser based on Oracle version"""
 
     @staticmethod
-    def create_parser(html_content: str) -> BaseAWRParser:
+    def create_parser(html_content: str, backend: Optional[str] = None) -> BaseAWRParser:
         """
         Create appropriate parser based on detected Oracle version
 
         Args:
             html_content: AWR report HTML string
+            backend: Document backend, "lxml" or "bs4" (defaults to lxml)
 
         Returns:
             Instance of appropriate parser
@@ -28,21 +31,91 @@ class AWRParserFactory:
             ValueError: If unsupported Oracle version
         """
         version = detect_oracle_version(html_content)
+        parser_class = AWRParserFactory.get_parser_class(version)
+        return parser_class(html_content, backend=backend)
+
+    @staticmethod
+    def create_file_parser(file_path: str, backend: Optional[str] = None, encoding: str = 'utf-8') -> BaseAWRParser:
+        """
+        Create a parser for a stored report, decompressing it straight into the tree
+
+        The report is never held in memory as a string.
+
+        Args:
+            file_path: Path of the stored report (optionally compressed)
+            backend: Document backend, "lxml" or "bs4" (defaults to lxml)
+            encoding: Character encoding of the report
+
+        Returns:
+            Instance of appropriate parser
+
+        Raises:
+            ValueError: If unsupported Oracle version
+        """
+        parser_class = AWRParserFactory._detect_file_parser_class(file_path, encoding)
+
+        with open_report(file_path) as f:
+            document = load_document(f, backend, encoding)
+        return parser_class(document=document)
+
+    @staticmethod
+    def create_streaming_parser(file_path: str, encoding: str = 'utf-8') -> BaseAWRParser:
+        """
+        Create a bounded-memory parser that streams the report from disk
+
+        Args:
+            file_path: Path of the stored report (optionally compressed)
+            encoding: Character encoding of the report
+
+        Returns:
+            Instance of appropriate parser
+
+        Raises:
+            ValueError: If unsupported Oracle version
+        """
+        parser_class = AWRParserFactory._detect_file_parser_class(file_path, encoding)
+
+        with open_report(file_path) as f:
+            return parser_class.from_stream(f, encoding=encoding)
+
+    @staticmethod
+    def _detect_file_parser_class(file_path: str, encoding: str) -> Type[BaseAWRParser]:
+        """Select the parser class from the header of a stored report"""
+        with open_report(file_path) as f:
+            header = f.read(HEADER_SCAN_CHARS).decode(encoding, errors='ignore')
+
+        version = detect_oracle_version(header)
+        return AWRParserFactory.get_parser_class(version)
+
+    @staticmethod
+    def get_parser_class(version: str) -> Type[BaseAWRParser]:
+        """
+        Select the parser class for an Oracle version
+
+        Args:
+            version: Version string from detect_oracle_version
+
+        Returns:
+            Parser class
+
+        Raises:
+            ValueError: If unsupported Oracle version
+        """
         logger.info(f"Creating parser for Oracle version: {version}")
 
         # Extract major version
         major_version = version.split('.')[0]
 
         if major_version in ['19', '21', '23']:
-            return Oracle19cParser(html_content)
+            return Oracle19cParser
         elif major_version == '12':
             # For now, use 19c parser as 12c has similar structure
             # TODO: Implement dedicated Oracle12cParser
             logger.warning("Using Oracle19cParser for version 12c")
-            return Oracle19cParser(html_content)
+            return Oracle19cParser
         elif major_version == '11':
             # TODO: Implement dedicated Oracle11gParser
             logger.warning("Using Oracle19cParser for version 11g")
-            return Oracle19cParser(html_content)
+            return Oracle19cParser
         else:
             raise ValueError(f"Unsupported Oracle version: {version}")
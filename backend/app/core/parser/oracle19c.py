@@ -1,59 +1,158 @@
 """Oracle 19c AWR Parser"""
 
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 import logging
 from datetime import datetime
 
 from app.core.parser.base import BaseAWRParser
-from app.core.parser.utils import parse_value, clean_text
+from app.core.parser.columns import Column, SqlStatRecord, TableSchema, WaitEventRecord
+from app.core.parser.utils import parse_value
 
 logger = logging.getLogger(__name__)
 
 
+def _int_or_none(text) -> Optional[int]:
+    """Integer value of a cell, None if it is empty or not an integer"""
+    try:
+        return int(str(text).replace(',', '').strip())
+    except (TypeError, ValueError):
+        return None
+
+
+# Header texts are those of 11g, 12c and 19c reports
+WAIT_EVENT_COLUMNS = (
+    Column('name', ('Event',), 'text'),
+    Column('waits', ('Waits',)),
+    Column('time_waited', ('Total Wait Time (sec)', 'Total Wait Time (s)', 'Time(s)')),
+    Column('avg_wait', ('Wait Avg(ms)', 'Avg Wait', 'Avg wait (ms)', 'Avg wait', 'Avg Wait(ms)'), 'ms'),
+    Column('pct_db_time', ('% DB time', '% Total Call Time')),
+    Column('wait_class', ('Wait Class',), 'text'),
+)
+
+SQL_COLUMNS = (
+    Column('sql_id', ('SQL Id',), 'text'),
+    Column('sql_text', ('SQL Text',), 'text'),
+    Column('sql_module', ('SQL Module',), 'text'),
+    Column('pdb_name', ('PDB Name',), 'text'),
+    Column('executions', ('Executions',)),
+    Column('pct_total', ('%Total', '% Total', '% Total Parses')),
+    Column('elapsed_time_s', ('Elapsed Time (s)', 'Elapsed Time(s)')),
+    Column('elapsed_time_per_exec_s', ('Elapsed Time per Exec (s)',)),
+    Column('cpu_time_s', ('CPU Time (s)',)),
+    Column('cpu_per_exec_s', ('CPU per Exec (s)',)),
+    Column('buffer_gets', ('Buffer Gets',)),
+    Column('gets_per_exec', ('Gets per Exec',)),
+    Column('physical_reads', ('Physical Reads',)),
+    Column('reads_per_exec', ('Reads per Exec',)),
+    Column('rows_processed', ('Rows Processed',)),
+    Column('rows_per_exec', ('Rows per Exec',)),
+    Column('user_io_time_s', ('User I/O Time (s)',)),
+    Column('uio_per_exec_s', ('UIO per Exec (s)',)),
+    Column('cluster_wait_time_s', ('Cluster Wait Time (s)',)),
+    Column('parse_calls', ('Parse Calls',)),
+    Column('version_count', ('Version Count',)),
+    Column('sharable_mem_b', ('Sharable Mem (b)',)),
+    Column('pct_cpu', ('%CPU',)),
+    Column('pct_io', ('%IO',)),
+    Column('pct_clu', ('%Clu',)),
+)
+
+# Complete List of SQL Text placeholder of statements aged out of the shared pool
+SQL_TEXT_NOT_AVAILABLE = '** SQL Text Not Available **'
+
+
+def _sql_schema(name: str, ordered_by: str) -> TableSchema:
+    """Schema of a "SQL ordered by" table, which must have its ordering column"""
+    return TableSchema(name, SqlStatRecord, SQL_COLUMNS, required=('sql_id', ordered_by))
+
+
 class Oracle19cParser(BaseAWRParser):
     """Parser for Oracle 19c AWR reports"""
 
+    WAIT_EVENT_SCHEMA = TableSchema(
+        'wait events', WaitEventRecord, WAIT_EVENT_COLUMNS,
+        required=('name', 'waits', 'time_waited', 'pct_db_time'),
+    )
+
+    # Lookups of the wait event table, in order of preference: the top 10
+    # (top 5 before 11gR2) events including DB CPU, then all foreground events
+    WAIT_EVENT_TABLES = (
+        "top 10 wait events",
+        "Top 5 Timed",
+        "Foreground Wait Events",
+    )
+
+    # Ordering, lookup and schema of the "SQL ordered by" tables
+    SQL_TABLES = (
+        ('by_cpu', "SQL ordered by CPU", _sql_schema('SQL ordered by CPU', 'cpu_time_s')),
+        ('by_elapsed', "SQL ordered by Elapsed", _sql_schema('SQL ordered by Elapsed', 'elapsed_time_s')),
+        ('by_gets', "SQL ordered by Gets", _sql_schema('SQL ordered by Gets', 'buffer_gets')),
+        ('by_reads', "SQL ordered by Reads", _sql_schema('SQL ordered by Reads', 'physical_reads')),
+        ('by_executions', "SQL ordered by Executions", _sql_schema('SQL ordered by Executions', 'executions')),
+        ('by_user_io', "SQL ordered by User I/O", _sql_schema('SQL ordered by User I/O', 'user_io_time_s')),
+        ('by_cluster_wait', "SQL ordered by Cluster", _sql_schema('SQL ordered by Cluster Wait', 'cluster_wait_time_s')),
+        ('by_parse_calls', "SQL ordered by Parse", _sql_schema('SQL ordered by Parse Calls', 'parse_calls')),
+        ('by_version_count', "SQL ordered by Version", _sql_schema('SQL ordered by Version Count', 'version_count')),
+        ('by_sharable_memory', "SQL ordered by Sharable", _sql_schema('SQL ordered by Sharable Memory', 'sharable_mem_b')),
+    )
+
+    SQL_TEXT_SCHEMA = TableSchema('SQL text', SqlStatRecord, SQL_COLUMNS, required=('sql_id', 'sql_text'))
+
+    SECTION_HEADERS = (
+        "Load Profile",
+        *WAIT_EVENT_TABLES,
+        "SQL ordered by CPU",
+        "SQL ordered by Elapsed",
+        "SQL ordered by Gets",
+        "SQL ordered by Reads",
+        "SQL ordered by Executions",
+        "SQL ordered by User I/O",
+        "SQL ordered by Cluster",
+        "SQL ordered by Parse",
+        "SQL ordered by Version",
+        "SQL ordered by Sharable",
+        "Complete List of SQL Text",
+        # Report header tables
+        "DB Name",
+        "Inst Num",
+        "Host Name",
+        "Snap Id",
+    )
+
     def _parse_instance_info(self) -> Dict[str, Any]:
-        """Parse instance information from the report header"""
+        """Parse instance information from the report header tables"""
         logger.debug("Parsing instance information")
 
         info = {
             'oracle_version': None,
             'db_name': None,
+            'dbid': None,
             'instance_name': None,
+            'instance_number': None,
             'host_name': None,
+            'rac': None,
         }
 
-        # Find the top summary table
-        # Usually contains DB Name, DB Id, Instance, Instance Number, Release, etc.
-        for table in self.soup.find_all('table'):
-            rows = table.find_all('tr')
-
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-
-                for i in range(len(cells) - 1):
-                    key = clean_text(cells[i].get_text())
-                    value = clean_text(cells[i+1].get_text())
-
-                    if 'DB Name' in key:
-                        info['db_name'] = value
-                    elif 'Instance' == key:
-                        info['instance_name'] = value
-                    elif 'Host' in key or 'Hostname' in key:
-                        info['host_name'] = value
-                    elif 'Release' in key or 'Version' in key:
-                        info['oracle_version'] = value
-
-            # If we found db_name, this is likely the right table
-            if info['db_name']:
-                break
+        # DB Name, DB Id, Release, RAC; before 12c also Instance and Inst num
+        database = self._header_record(self._find_table_by_header("DB Name", exact=True))
+        # Instance and Inst Num (a table of its own since 12c)
+        instance = self._header_record(self._find_table_by_header("Inst Num"))
+        host = self._header_record(self._find_table_by_header("Host Name", exact=True))
+
+        info['db_name'] = database.get('DB Name') or None
+        info['dbid'] = _int_or_none(database.get('DB Id'))
+        info['oracle_version'] = database.get('Release') or None
+        if database.get('RAC'):
+            info['rac'] = database['RAC'].upper() == 'YES'
+        info['instance_name'] = instance.get('Instance') or None
+        info['instance_number'] = _int_or_none(instance.get('Inst Num', instance.get('Inst num')))
+        info['host_name'] = host.get('Host Name') or None
 
         logger.debug(f"Instance info: {info}")
         return info
 
     def _parse_snapshot_info(self) -> Dict[str, Any]:
-        """Parse snapshot time range and interval"""
+        """Parse snapshot ids, time range and interval"""
         logger.debug("Parsing snapshot information")
 
         snapshot_info = {
@@ -63,60 +162,36 @@ class Oracle19cParser(BaseAWRParser):
             'end_time': None,
             'elapsed_time': 0,  # in seconds
             'db_time': 0,  # in seconds
+            'instances': None,  # instances open at the end snapshot (RAC)
         }
 
-        # Look for snapshot information in tables
-        for table in self.soup.find_all('table'):
-            rows = table.find_all('tr')
-
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_text = ' '.join([clean_text(cell.get_text()) for cell in cells])
-
-                if 'Begin Snap' in row_text or 'Snap Id' in row_text:
-                    # Extract snap IDs and times
-                    for i, cell in enumerate(cells):
-                        text = clean_text(cell.get_text())
-
-                        # Try to parse as datetime
-                        try:
-                            # Common format: 01-Jan-25 10:00:00
-                            if '-' in text and ':' in text:
-                                # This might be a timestamp
-                                parsed_time = self._parse_datetime(text)
-                                if parsed_time:
-                                    if not snapshot_info['begin_time']:
-                                        snapshot_info['begin_time'] = parsed_time
-                                    else:
-                                        snapshot_info['end_time'] = parsed_time
-                        except:
-                            pass
-
-                        # Try to parse as snap ID
-                        if text.isdigit():
-                            snap_id = int(text)
-                            if not snapshot_info['begin_snap_id']:
-                                snapshot_info['begin_snap_id'] = snap_id
-                            else:
-                                snapshot_info['end_snap_id'] = snap_id
-
-                # Look for Elapsed time
-                if 'Elapsed' in row_text:
-                    for cell in cells:
-                        text = clean_text(cell.get_text())
-                        if ':' in text:  # Time format
-                            elapsed_seconds = parse_value(text)
-                            if elapsed_seconds > 0:
-                                snapshot_info['elapsed_time'] = elapsed_seconds
-
-                # Look for DB Time
-                if 'DB Time' in row_text and 'DB CPU' not in row_text:
-                    for cell in cells:
-                        text = clean_text(cell.get_text())
-                        if ':' in text:  # Time format
-                            db_time_seconds = parse_value(text)
-                            if db_time_seconds > 0:
-                                snapshot_info['db_time'] = db_time_seconds
+        table = self._find_table_by_header("Snap Id")
+        if table is None:
+            logger.warning("Snapshot table not found")
+            return snapshot_info
+
+        rows = self._table_rows(table)
+        headers = rows[0] if rows else []
+        instances_col = headers.index('Instances') if 'Instances' in headers else None
+
+        # Rows are labelled "Begin Snap:", "End Snap:", "Elapsed:" and "DB Time:"
+        for cells in rows[1:]:
+            if len(cells) < 3:
+                continue
+            label = cells[0].rstrip(':')
+
+            if label in ('Begin Snap', 'End Snap'):
+                prefix = 'begin' if label == 'Begin Snap' else 'end'
+                snapshot_info[f'{prefix}_snap_id'] = _int_or_none(cells[1])
+                snapshot_info[f'{prefix}_time'] = self._parse_datetime(cells[2])
+                if instances_col is not None and instances_col < len(cells):
+                    snapshot_info['instances'] = _int_or_none(cells[instances_col]) or snapshot_info['instances']
+            elif label in ('Elapsed', 'DB Time'):
+                # e.g. "59.44 (mins)"
+                minutes = parse_value(cells[2].replace('(mins)', '').strip())
+                if isinstance(minutes, (int, float)) and minutes > 0:
+                    key = 'elapsed_time' if label == 'Elapsed' else 'db_time'
+                    snapshot_info[key] = round(minutes * 60, 2)
 
         logger.debug(f"Snapshot info: {snapshot_info}")
         return snapshot_info
@@ -130,19 +205,17 @@ class Oracle19cParser(BaseAWRParser):
         # Find Load Profile table
         table = self._find_table_by_header("Load Profile")
 
-        if not table:
+        if table is None:
             logger.warning("Load Profile table not found")
             return load_profile
 
-        rows = table.find_all('tr')
-
-        for row in rows[1:]:  # Skip header
-            cells = row.find_all(['td', 'th'])
+        rows = self._table_rows(table)
 
+        for cells in rows[1:]:  # Skip header
             if len(cells) >= 3:
-                metric_name = clean_text(cells[0].get_text())
-                per_second = parse_value(cells[1].get_text())
-                per_txn = parse_value(cells[2].get_text())
+                metric_name = cells[0]
+                per_second = parse_value(cells[1])
+                per_txn = parse_value(cells[2])
 
                 if metric_name:
                     load_profile[metric_name] = {
@@ -157,128 +230,35 @@ class Oracle19cParser(BaseAWRParser):
         """Parse Top Wait Events"""
         logger.debug("Parsing wait events")
 
-        wait_events = {
-            'events': []
-        }
-
-        # Find Top 5 Timed Events or similar
-        table = self._find_table_by_header("Top")
-        if not table:
-            table = self._find_table_by_header("Wait Events")
-
-        if not table:
-            logger.warning("Wait events table not found")
-            return wait_events
-
-        rows = table.find_all('tr')
-
-        # Find header row to identify columns
-        header_row = rows[0] if rows else None
-        if not header_row:
-            return wait_events
+        events = self._parse_records(self.WAIT_EVENT_SCHEMA, self.WAIT_EVENT_TABLES)
 
-        headers = [clean_text(th.get_text()) for th in header_row.find_all(['th', 'td'])]
-
-        # Parse data rows
-        for row in rows[1:]:
-            cells = row.find_all(['td', 'th'])
-
-            if len(cells) >= 3:
-                event = {
-                    'name': clean_text(cells[0].get_text()),
-                    'waits': 0,
-                    'time_waited': 0,
-                    'avg_wait': 0,
-                    'pct_db_time': 0
-                }
-
-                # Parse values based on available columns
-                for i, cell in enumerate(cells[1:], 1):
-                    if i < len(cells):
-                        value = parse_value(cell.get_text())
-
-                        # Map to appropriate field
-                        if i == 1:
-                            event['waits'] = value
-                        elif i == 2:
-                            event['time_waited'] = value
-                        elif i == 3:
-                            event['avg_wait'] = value
-                        elif 'DB Time' in headers[i] if i < len(headers) else False:
-                            event['pct_db_time'] = value
-
-                if event['name']:
-                    wait_events['events'].append(event)
-
-        logger.debug(f"Parsed {len(wait_events['events'])} wait events")
-        return wait_events
+        logger.debug(f"Parsed {len(events)} wait events")
+        return {'events': events}
 
     def _parse_top_sql(self) -> Dict[str, Any]:
-        """Parse Top SQL statistics"""
+        """Parse Top SQL statistics, every row of each "SQL ordered by" table"""
         logger.debug("Parsing Top SQL")
 
-        top_sql = {
-            'by_cpu': [],
-            'by_elapsed': [],
-            'by_gets': [],
-            'by_reads': [],
-            'by_executions': []
-        }
-
-        # Find SQL sections
-        sql_sections = [
-            ('SQL ordered by CPU', 'by_cpu'),
-            ('SQL ordered by Elapsed', 'by_elapsed'),
-            ('SQL ordered by Gets', 'by_gets'),
-            ('SQL ordered by Reads', 'by_reads'),
-            ('SQL ordered by Executions', 'by_executions'),
-        ]
-
-        for section_name, key in sql_sections:
-            table = self._find_table_by_header(section_name)
-
-            if table:
-                sql_list = self._parse_sql_table(table)
-                top_sql[key] = sql_list
-                logger.debug(f"Parsed {len(sql_list)} SQL statements for {section_name}")
+        top_sql = {}
+        for key, section_name, schema in self.SQL_TABLES:
+            top_sql[key] = self._parse_records(schema, (section_name,))
+            logger.debug(f"Parsed {len(top_sql[key])} SQL statements for {section_name}")
 
         return top_sql
 
-    def _parse_sql_table(self, table) -> list:
-        """Parse a SQL statistics table"""
-        sql_list = []
-
-        rows = table.find_all('tr')
+    def _parse_sql_text(self) -> Dict[str, str]:
+        """Parse the Complete List of SQL Text, the untruncated text of every listed statement"""
+        logger.debug("Parsing SQL text")
 
-        if len(rows) < 2:
-            return sql_list
-
-        # Get headers
-        header_row = rows[0]
-        headers = [clean_text(th.get_text()) for th in header_row.find_all(['th', 'td'])]
-
-        # Parse data rows
-        for row in rows[1:]:
-            cells = row.find_all(['td', 'th'])
-
-            if len(cells) >= 2:
-                sql_data = {}
-
-                for i, cell in enumerate(cells):
-                    if i < len(headers):
-                        header = headers[i]
-                        value_text = clean_text(cell.get_text())
-
-                        # Keep SQL ID and text as strings
-                        if 'SQL Id' in header or 'SQL Text' in header:
-                            sql_data[header] = value_text
-                        else:
-                            sql_data[header] = parse_value(value_text)
-
-                if sql_data:
-                    sql_list.append(sql_data)
+        statements = self._parse_records(self.SQL_TEXT_SCHEMA, ("Complete List of SQL Text",))
+        sql_text = {
+            statement.sql_id: statement.sql_text
+            for statement in statements
+            if statement.sql_text != SQL_TEXT_NOT_AVAILABLE
+        }
 
-        return sql_list[:10]  # Top 10
+        logger.debug(f"Parsed the text of {len(sql_text)} SQL statements")
+        return sql_text
 
     def _parse_datetime(self, text: str) -> datetime:
         """Parse datetime from AWR report format"""
@@ -0,0 +1,50 @@
+"""Lazily Evaluated AWR Parse Result"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ParseResult(Mapping):
+    """
+    Read-only mapping of section name to parsed section data
+
+    A section is parsed the first time it is accessed and memoized in the
+    parser's ``data`` dict, so sections that are never read cost nothing
+    and repeated access never parses twice. Behaves like the dict returned
+    by an eager ``parse()`` (``get``, ``in``, ``keys``, ``items``).
+    """
+
+    def __init__(self, parser, sections: Tuple[str, ...]):
+        """
+        Args:
+            parser: BaseAWRParser instance the sections are parsed from
+            sections: Section names exposed by this result, in order
+        """
+        self._parser = parser
+        self._sections = sections
+
+    def __getitem__(self, section: str) -> Any:
+        if section not in self._sections:
+            raise KeyError(section)
+        return self._parser.parse_section(section)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def is_parsed(self, section: str) -> bool:
+        """Check whether a section has already been parsed"""
+        return section in self._parser.data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Parse all remaining sections and return a plain dict"""
+        return {section: self[section] for section in self._sections}
+
+    def __repr__(self) -> str:
+        parsed = [section for section in self._sections if self.is_parsed(section)]
+        return f"<ParseResult sections={list(self._sections)} parsed={parsed}>"
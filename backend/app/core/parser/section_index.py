@@ -0,0 +1,192 @@
+"""Section Index for AWR Reports"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+import logging
+
+from app.core.parser.utils import clean_text
+
+logger = logging.getLogger(__name__)
+
+HEADING_TAGS = ('h2', 'h3', 'b')
+
+
+class SectionIndex:
+    """
+    Single-pass index of the section markers in an AWR report
+
+    The document is walked once at construction. Table headers, named
+    anchors, section headings and table ``summary`` attributes are recorded
+    together with the table they belong to, so later lookups only compare
+    strings instead of traversing the whole tree again.
+
+    The index is independent of the tree implementation: tables are stored
+    as whatever element type the document backend uses.
+    """
+
+    def __init__(self):
+        self.tables: List[Any] = []
+
+        # (lower-cased text, enclosing table) in document order
+        self._headers: List[Tuple[str, Optional[Any]]] = []
+        self._exact_headers: Dict[str, Optional[Any]] = {}
+        # (lower-cased marker, table following it) in document order
+        self._anchors: List[Tuple[str, Any]] = []
+        self._headings: List[Tuple[str, Any]] = []
+        self._summaries: List[Tuple[str, Any]] = []
+
+        # Anchors and headings waiting for the next table in document order
+        self._pending_anchors: List[str] = []
+        self._pending_headings: List[str] = []
+
+        self._cache: Dict[Tuple[str, bool], Optional[Any]] = {}
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup) -> "SectionIndex":
+        """
+        Build the index from a BeautifulSoup document
+
+        Args:
+            soup: BeautifulSoup document of the AWR report
+
+        Returns:
+            Populated SectionIndex
+        """
+        index = cls()
+
+        for tag in soup.find_all(True):
+            name = tag.name
+
+            if name == 'table':
+                index.add_table(tag, tag.get('summary'))
+            elif name == 'th':
+                index.add_header(clean_text(tag.get_text()), tag.find_parent('table'))
+            elif name == 'a' and tag.get('name') is not None:
+                index.add_anchor(tag['name'])
+
+            if name in HEADING_TAGS:
+                index.add_heading(clean_text(tag.get_text()))
+
+        index.log_summary()
+        return index
+
+    @classmethod
+    def from_lxml(cls, root) -> "SectionIndex":
+        """
+        Build the index from an lxml.html document
+
+        Args:
+            root: Root element of the parsed AWR report
+
+        Returns:
+            Populated SectionIndex
+        """
+        index = cls()
+
+        for element in root.iter('table', 'th', 'a', *HEADING_TAGS):
+            tag = element.tag
+
+            if tag == 'table':
+                index.add_table(element, element.get('summary'))
+            elif tag == 'th':
+                parent_table = next(element.iterancestors('table'), None)
+                index.add_header(clean_text(element.text_content()), parent_table)
+            elif tag == 'a' and element.get('name') is not None:
+                index.add_anchor(element.get('name'))
+
+            if tag in HEADING_TAGS:
+                index.add_heading(clean_text(element.text_content()))
+
+        index.log_summary()
+        return index
+
+    def add_table(self, table: Any, summary: Optional[str] = None) -> List[str]:
+        """
+        Record a table in document order and resolve pending markers
+
+        Returns:
+            Lower-cased anchors, headings and summary now pointing at the table
+        """
+        self.tables.append(table)
+
+        for anchor_name in self._pending_anchors:
+            self._anchors.append((anchor_name, table))
+        for heading_text in self._pending_headings:
+            self._headings.append((heading_text, table))
+        markers = self._pending_anchors + self._pending_headings
+        self._pending_anchors = []
+        self._pending_headings = []
+
+        if summary:
+            summary_text = clean_text(summary).lower()
+            self._summaries.append((summary_text, table))
+            markers.append(summary_text)
+
+        return markers
+
+    def add_header(self, text: str, table: Optional[Any]):
+        """Record a <th> cell with the table that contains it"""
+        self._headers.append((text.lower(), table))
+        self._exact_headers.setdefault(text, table)
+
+    def add_anchor(self, name: str):
+        """Record a named anchor; it points at the next table"""
+        self._pending_anchors.append(name.lower())
+
+    def add_heading(self, text: str):
+        """Record a section heading; it points at the next table"""
+        self._pending_headings.append(text.lower())
+
+    def log_summary(self):
+        """Log index statistics"""
+        logger.debug(
+            f"Indexed {len(self.tables)} tables, {len(self._headers)} headers, "
+            f"{len(self._anchors)} anchors, {len(self._summaries)} summaries"
+        )
+
+    def find(self, header_text: str, exact: bool = False) -> Optional[Any]:
+        """
+        Find the table for a section (memoized)
+
+        Args:
+            header_text: Text to search for in headers
+            exact: If True, requires exact match on <th> text
+
+        Returns:
+            Table element, or None if not found
+        """
+        key = (header_text, exact)
+        if key not in self._cache:
+            self._cache[key] = self._lookup(header_text, exact)
+        return self._cache[key]
+
+    def _lookup(self, header_text: str, exact: bool) -> Optional[Any]:
+        """Resolve a section using the same strategy order as the tree scan"""
+        needle = header_text.lower()
+
+        # Strategy 1: <th> text
+        if exact:
+            if header_text in self._exact_headers:
+                return self._exact_headers[header_text]
+        else:
+            for th_text, table in self._headers:
+                if needle in th_text:
+                    return table
+
+        # Strategy 2: <a name="..."> anchors
+        anchor_needle = needle.replace(' ', '')
+        for anchor_name, table in self._anchors:
+            if anchor_needle in anchor_name:
+                return table
+
+        # Strategy 3: <h2>, <h3>, <b> section headers
+        for heading_text, table in self._headings:
+            if needle in heading_text:
+                return table
+
+        # Strategy 4: table summary attribute
+        for summary, table in self._summaries:
+            if needle in summary:
+                return table
+
+        return None
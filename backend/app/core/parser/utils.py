@@ -1,7 +1,59 @@
 """Parser Utility Functions"""
 
 import re
-from typing import Union, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+# Unit suffixes of scaled values, e.g. "12.34M"
+UNIT_MULTIPLIERS = {
+    'K': 1e3,
+    'M': 1e6,
+    'G': 1e9,
+    'T': 1e12
+}
+
+# Cell forms the fast path converts directly, after stripping and removing
+# thousand separators. Anything else goes through _parse_value_fallback().
+_VALUE_RE = re.compile(r"""
+      (?P<int>[+-]?[0-9]+)
+    | (?P<float>[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+))
+    | (?P<percent>[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)%)
+    | (?P<scaled>[+-]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)[KMGTkmgt])
+    | (?P<clock>[0-9]+:(?:[0-9]+:)?[0-9]+(?:\.[0-9]*)?)
+""", re.VERBOSE)
+
+# Milliseconds per wait time unit, e.g. "502.71ms" or "120.47us" (19c)
+DURATION_UNITS_MS = {
+    'ns': 1e-6,
+    'us': 1e-3,
+    'ms': 1,
+    's': 1e3,
+}
+
+_DURATION_RE = re.compile(r'(?P<value>[0-9.]+)\s*(?P<unit>ns|us|ms|s)', re.IGNORECASE)
+
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_FLOAT_RE = re.compile(r'inf|nan', re.IGNORECASE)
+
+
+def _clock_seconds(text: str) -> float:
+    """Seconds of "HH:MM:SS(.ms)" or "MM:SS(.ms)" """
+    parts = text.split(':')
+    if len(parts) == 3:
+        return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
+    return int(parts[0]) * 60 + float(parts[1])
+
+
+# Converter per _VALUE_RE group
+_CONVERTERS = {
+    'int': int,
+    'float': float,
+    'percent': lambda text: float(text[:-1]),
+    'scaled': lambda text: float(text[:-1]) * UNIT_MULTIPLIERS[text[-1].upper()],
+    'clock': _clock_seconds,
+}
 
 
 def parse_value(text: str) -> Union[float, int, str]:
@@ -13,53 +65,56 @@ def parse_value(text: str) -> Union[float, int, str]:
         "12.34M" -> 12340000.0
         "99.99%" -> 99.99
         "00:12:34.56" -> 754.56 (seconds)
+
+    Common forms are classified with one precompiled regex and converted
+    directly; unusual ones (exponents, embedded spaces, text) take the
+    fallback, which also returns 0 for text that is not a number.
     """
     if not text or not isinstance(text, str):
         return 0
 
-    text = text.strip()
+    cleaned = text.strip().replace(',', '')
+    match = _VALUE_RE.fullmatch(cleaned)
+    if match is None:
+        return _parse_value_fallback(cleaned)
+
+    try:
+        return _CONVERTERS[match.lastgroup](cleaned)
+    except ValueError:
+        # e.g. an integer beyond int()'s digit limit
+        return _parse_value_fallback(cleaned)
 
-    # Remove thousand separators
-    text = text.replace(',', '')
+
+def _parse_value_fallback(text: str) -> Union[float, int]:
+    """parse_value() of a stripped cell without thousand separators that the fast path does not match"""
+    # Labels and other text: without a digit only inf / nan can convert
+    if _DIGIT_RE.search(text) is None and _SPECIAL_FLOAT_RE.search(text) is None:
+        return 0
 
     # Handle percentage
     if '%' in text:
         try:
             return float(text.replace('%', ''))
-        except:
+        except ValueError:
             return 0
 
     # Handle unit suffixes (K, M, G, T)
-    multipliers = {
-        'K': 1e3,
-        'M': 1e6,
-        'G': 1e9,
-        'T': 1e12
-    }
-
-    for suffix, mult in multipliers.items():
-        if text.upper().endswith(suffix):
-            try:
-                return float(text[:-1]) * mult
-            except:
-                return 0
-
-    # Handle time format HH:MM:SS or HH:MM:SS.ms
-    if ':' in text:
+    multiplier = UNIT_MULTIPLIERS.get(text.upper()[-1:])
+    if multiplier is not None:
         try:
-            parts = text.split(':')
-            if len(parts) == 3:
-                hours = int(parts[0])
-                minutes = int(parts[1])
-                seconds = float(parts[2])
-                return hours * 3600 + minutes * 60 + seconds
-            elif len(parts) == 2:
-                minutes = int(parts[0])
-                seconds = float(parts[1])
-                return minutes * 60 + seconds
-        except:
+            return float(text[:-1]) * multiplier
+        except ValueError:
             return 0
 
+    # Handle time format HH:MM:SS or MM:SS
+    if ':' in text:
+        parts = text.split(':')
+        if len(parts) in (2, 3):
+            try:
+                return _clock_seconds(text)
+            except ValueError:
+                return 0
+
     # Handle regular numbers
     try:
         # Try integer first
@@ -67,9 +122,51 @@ def parse_value(text: str) -> Union[float, int, str]:
             return int(text)
         else:
             return float(text)
-    except:
+    except ValueError:
+        return 0
+
+
+def parse_values(texts: Iterable[str]) -> List[Union[float, int, str]]:
+    """parse_value() of a whole column of cells"""
+    # Columns repeat values ("0", "0.00", ...), each distinct cell is parsed once
+    cache: Dict[str, Union[float, int, str]] = {}
+    values = []
+    for text in texts:
+        if text not in cache:
+            cache[text] = parse_value(text)
+        values.append(cache[text])
+    return values
+
+
+def parse_milliseconds(text: str) -> Union[float, int]:
+    """
+    Parse a wait time in milliseconds
+
+    Examples:
+        "502.71ms" -> 502.71
+        "120.47us" -> 0.12047
+        "1.2s" -> 1200.0
+        "11512" -> 11512 (columns without a unit are in ms)
+    """
+    if not text or not isinstance(text, str):
         return 0
 
+    match = _DURATION_RE.fullmatch(text.strip().replace(',', ''))
+    if match is None:
+        return parse_value(text)
+
+    value = parse_value(match.group('value'))
+    return value * DURATION_UNITS_MS[match.group('unit').lower()]
+
+
+def parse_value_array(texts: Sequence[str]) -> np.ndarray:
+    """
+    parse_value() of a whole column of cells as a float64 array
+
+    Integers above 2**53 are rounded to the nearest float, as float() would.
+    """
+    return np.fromiter(parse_values(texts), dtype=np.float64, count=len(texts))
+
 
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
@@ -2,56 +2,70 @@
 
 import re
 import logging
-from bs4 import BeautifulSoup
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# The report title and the header table with the Release column are
+# always within the first few KB, right after the inline stylesheet
+HEADER_SCAN_CHARS = 64 * 1024
+
+_TAG_RE = re.compile(r'<[^>]*>')
+_ROW_RE = re.compile(r'<tr\b.*?</tr>', re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(r'<t[hd]\b[^>]*>(.*?)</t[hd]>', re.IGNORECASE | re.DOTALL)
+_RELEASE_RE = re.compile(r'Release\s+(\d+\.\d+\.\d+)', re.IGNORECASE)
+_VERSION_RE = re.compile(r'Version\s+(\d+\.\d+\.\d+)', re.IGNORECASE)
+_VERSION_NUMBER_RE = re.compile(r'^(\d+\.\d+\.\d+)')
+
 
 def detect_oracle_version(html_content: str) -> str:
     """
     Detect Oracle version from AWR HTML report
 
+    Every strategy inspects only a bounded prefix of the raw HTML, so no
+    document tree is built here and the parser remains the only full parse.
+
     Args:
         html_content: AWR report HTML string
 
     Returns:
         Version string (e.g., "19.3.0", "12.2.0", "11.2.0")
     """
-    soup = BeautifulSoup(html_content, 'lxml')
+    header = html_content[:HEADER_SCAN_CHARS]
 
-    # Strategy 1: Look for explicit version/release information
-    for tag in soup.find_all(['td', 'th', 'p', 'div']):
-        text = tag.get_text()
+    # Strategy 1: Release column of the header table
+    version = _find_release_column(header)
+    if version:
+        logger.info(f"Detected Oracle version: {version}")
+        return version
 
-        # Pattern: Release 19.3.0.0.0 or Version 12.2.0.1.0
-        match = re.search(r'Release\s+(\d+\.\d+\.\d+)', text, re.IGNORECASE)
-        if match:
-            version = match.group(1)
-            logger.info(f"Detected Oracle version: {version}")
-            return version
+    # Strategy 2: Look for explicit version/release information
+    # Tags are replaced by a separator so a match never spans two elements
+    header_text = _TAG_RE.sub('|', header)
 
-        match = re.search(r'Version\s+(\d+\.\d+\.\d+)', text, re.IGNORECASE)
+    # Pattern: Release 19.3.0.0.0 or Version 12.2.0.1.0
+    for pattern in (_RELEASE_RE, _VERSION_RE):
+        match = pattern.search(header_text)
         if match:
             version = match.group(1)
             logger.info(f"Detected Oracle version: {version}")
             return version
 
-    # Strategy 2: Look for version-specific features
-    full_text = soup.get_text()
-
+    # Strategy 3: Look for version-specific features
+    # Also limited to the header, feature names deeper in the report are section content
     # Check for 19c features
-    if 'Pluggable Database' in full_text or 'PDB' in full_text:
-        if 'Automatic Indexing' in full_text or 'Real-Time Statistics' in full_text:
+    if 'Pluggable Database' in header or 'PDB' in header:
+        if 'Automatic Indexing' in header or 'Real-Time Statistics' in header:
             logger.info("Detected Oracle 19c based on features")
             return "19.0.0"
 
     # Check for 12c features
-    if 'Multitenant' in full_text or 'Container Database' in full_text:
+    if 'Multitenant' in header or 'Container Database' in header:
         logger.info("Detected Oracle 12c based on features")
         return "12.2.0"
 
     # Check for 11g features
-    if 'Automatic Workload Repository' in full_text:
+    if 'Automatic Workload Repository' in header:
         # 11g is the oldest supported version
         logger.info("Detected Oracle 11g based on features")
         return "11.2.0"
@@ -59,3 +73,33 @@ def detect_oracle_version(html_content: str) -> str:
     # Default to 19c if cannot determine
     logger.warning("Could not determine Oracle version, defaulting to 19c")
     return "19.0.0"
+
+
+def _find_release_column(header: str) -> Optional[str]:
+    """
+    Read the Release column of the database instance header table
+
+    Args:
+        header: Raw HTML prefix of the report
+
+    Returns:
+        Version string, or None if the header table was not found
+    """
+    release_index = None
+
+    for row in _ROW_RE.finditer(header):
+        cells = [_TAG_RE.sub('', cell).strip() for cell in _CELL_RE.findall(row.group(0))]
+
+        if release_index is None:
+            if 'Release' in cells:
+                release_index = cells.index('Release')
+            continue
+
+        if release_index < len(cells):
+            match = _VERSION_NUMBER_RE.match(cells[release_index])
+            if match:
+                return match.group(1)
+
+        return None
+
+    return None
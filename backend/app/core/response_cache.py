@@ -0,0 +1,175 @@
+"""
+Redis Cache of Serialized API Responses
+
+Read endpoints of parsed reports store their gzip-compressed JSON bodies
+here. Keys hold the report id, the endpoint name (with its arguments,
+e.g. the metric category) and the report's data version, the updated_at
+timestamp that changes whenever parsing or analysis rewrites the
+report's data. Writers
+also drop the report's entries after committing; the version in the key
+keeps a reader that loaded the old data just before that from caching it
+under the new version.
+
+The cache is best effort: when Redis is unreachable requests are served
+from the database and the cache is bypassed for a while.
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "awr:response"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+# Seconds to bypass the cache after a Redis error
+RETRY_AFTER = 30
+
+
+class ResponseCache:
+    """Serialized responses in Redis, grouped per report for invalidation"""
+
+    def __init__(self, redis_url: str, ttl: int):
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self._client: Optional[redis.Redis] = None
+        self._unavailable_until = 0.0
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """Redis client, or None while Redis is considered unavailable"""
+        if time.monotonic() < self._unavailable_until:
+            return None
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.redis_url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        return self._client
+
+    def _failed(self, action: str, error: Exception):
+        logger.warning(f"Response cache {action} failed, bypassing cache for {RETRY_AFTER}s: {error}")
+        self._unavailable_until = time.monotonic() + RETRY_AFTER
+
+    @staticmethod
+    def _index_key(report_id: int) -> str:
+        return f"{KEY_PREFIX}:report:{report_id}"
+
+    @staticmethod
+    def key(report_id: int, version: Optional[datetime], name: str) -> str:
+        """Cache key of one response of a report at a data version"""
+        stamp = version.isoformat() if version else "none"
+        return f"{KEY_PREFIX}:report:{report_id}:{stamp}:{name}"
+
+    def get(self, key: str, endpoint: str) -> Optional[bytes]:
+        """
+        Cached response body, or None
+
+        Every lookup is counted as a request of the endpoint; set() counts
+        the misses, so a hit costs a single round trip.
+        """
+        client = self.client
+        if client is None:
+            return None
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.hincrby(STATS_KEY, f"{endpoint}:requests", 1)
+            value, _ = pipe.execute()
+            return value
+        except redis.RedisError as e:
+            self._failed("read", e)
+            return None
+
+    def set(self, report_id: int, key: str, body: bytes, endpoint: str):
+        """Store a response body after a miss and record it under its report"""
+        client = self.client
+        if client is None:
+            return
+
+        index_key = self._index_key(report_id)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(key, body, ex=self.ttl)
+            pipe.hincrby(STATS_KEY, f"{endpoint}:misses", 1)
+            pipe.sadd(index_key, key)
+            pipe.expire(index_key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._failed("write", e)
+
+    def record_miss(self, endpoint: str):
+        """Count a miss whose response is not cached (e.g. an error response)"""
+        client = self.client
+        if client is None:
+            return
+
+        try:
+            client.hincrby(STATS_KEY, f"{endpoint}:misses", 1)
+        except redis.RedisError as e:
+            self._failed("write", e)
+
+    def invalidate(self, report_ids: Iterable[int]):
+        """Drop every cached response of the reports"""
+        report_ids = list(report_ids)
+        client = self.client
+        if client is None or not report_ids:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for report_id in report_ids:
+                pipe.smembers(self._index_key(report_id))
+            keys = [key for members in pipe.execute() for key in members]
+            keys.extend(self._index_key(report_id) for report_id in report_ids)
+            client.delete(*keys)
+        except redis.RedisError as e:
+            self._failed("invalidation", e)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hits, misses and hit ratio per endpoint, across all API processes"""
+        client = self.client
+        if client is None:
+            return {}
+
+        try:
+            counters = client.hgetall(STATS_KEY)
+        except redis.RedisError as e:
+            self._failed("stats", e)
+            return {}
+
+        stats: Dict[str, Dict[str, float]] = {}
+        for field, count in counters.items():
+            endpoint, counter = field.decode().rsplit(":", 1)
+            stats.setdefault(endpoint, {"requests": 0, "misses": 0})[counter] = int(count)
+        for endpoint_stats in stats.values():
+            requests = endpoint_stats["requests"]
+            endpoint_stats["hits"] = max(requests - endpoint_stats["misses"], 0)
+            endpoint_stats["hit_ratio"] = round(endpoint_stats["hits"] / requests, 4) if requests else 0.0
+        return stats
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Response cache of this process, None when CACHE_TTL is 0"""
+    global _response_cache
+    if settings.CACHE_TTL <= 0:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(settings.REDIS_URL, settings.CACHE_TTL)
+    return _response_cache
+
+
+def invalidate_reports(report_ids: Iterable[int]):
+    """Drop the cached responses of reports whose data was rewritten or deleted"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(report_ids)
@@ -0,0 +1,148 @@
+"""
+Per-report SQL Statistics
+
+Every statement of a report's normalized top_sql map (one entry per
+sql_id, merged from all "SQL ordered by" lists) is also stored as a
+SqlStat row. The rows are indexed by sql_id, so the history of a
+statement across reports, e.g. every report where it was in the top 10
+with its elapsed time per execution, is one index range scan.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.sql_stat import SqlStat
+from app.core.parser.oracle19c import Oracle19cParser
+
+logger = logging.getLogger(__name__)
+
+# "SQL ordered by" lists, the keys of SqlStat.ranks
+SQL_ORDERINGS = tuple(ordering for ordering, section_name, schema in Oracle19cParser.SQL_TABLES)
+
+# Numeric statistics stored as SqlStat columns
+SQL_STAT_FIELDS = (
+    'executions',
+    'elapsed_time_s',
+    'elapsed_time_per_exec_s',
+    'cpu_time_s',
+    'cpu_per_exec_s',
+    'user_io_time_s',
+    'uio_per_exec_s',
+    'cluster_wait_time_s',
+    'buffer_gets',
+    'gets_per_exec',
+    'physical_reads',
+    'reads_per_exec',
+    'rows_processed',
+    'rows_per_exec',
+    'parse_calls',
+    'version_count',
+    'sharable_mem_b',
+)
+
+# Per-execution statistics and the totals they are computed from, for
+# statements missing from the lists that report them and for cluster sums
+PER_EXEC_SQL_FIELDS = {
+    'elapsed_time_per_exec_s': 'elapsed_time_s',
+    'cpu_per_exec_s': 'cpu_time_s',
+    'gets_per_exec': 'buffer_gets',
+    'reads_per_exec': 'physical_reads',
+    'rows_per_exec': 'rows_processed',
+    'uio_per_exec_s': 'user_io_time_s',
+}
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def sql_stat_rows(report_id: int, metadata: Mapping[str, Any], records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    SqlStat rows of a report, one per statement
+
+    Per-execution values missing from the lists a statement appears in are
+    computed from its totals, so e.g. elapsed per exec is known for a
+    statement that is only in the CPU list.
+
+    Args:
+        report_id: Report the statements belong to
+        metadata: AWRReport values (db_name, instance_name, snapshot_begin)
+        records: PerformanceMetric values of the report
+    """
+    statements = next(
+        (record['metric_data'] for record in records if record['metric_category'] == 'top_sql'),
+        {},
+    )
+
+    rows = []
+    for sql_id, statement in statements.items():
+        ranks = statement.get('rank') or {}
+        if not ranks:
+            continue
+
+        row = {
+            'report_id': report_id,
+            'sql_id': sql_id,
+            'db_name': metadata.get('db_name'),
+            'instance_name': metadata.get('instance_name'),
+            'snapshot_begin': metadata.get('snapshot_begin'),
+            'sql_module': statement.get('sql_module') or None,
+            'sql_text': statement.get('sql_text') or None,
+            'ranks': ranks,
+            'best_rank': min(ranks.values()),
+            'pct_total': statement.get('pct_total') or {},
+            **{field: _number(statement.get(field)) for field in SQL_STAT_FIELDS},
+        }
+        executions = row['executions']
+        for field, total_field in PER_EXEC_SQL_FIELDS.items():
+            if row[field] is None and row[total_field] is not None and executions:
+                row[field] = round(row[total_field] / executions, 6)
+        rows.append(row)
+
+    return rows
+
+
+def insert_sql_stats(db: Session, rows: Sequence[Dict[str, Any]]):
+    """Bulk insert SqlStat rows. The caller commits."""
+    if rows:
+        db.execute(insert(SqlStat), rows)
+
+
+def store_sql_stats(db: Session, report_id: int, metadata: Mapping[str, Any], records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Replace the SQL statistics of a report
+
+    Args:
+        db: Database session
+        report_id: Report the statements belong to
+        metadata: AWRReport values (db_name, instance_name, snapshot_begin)
+        records: PerformanceMetric values of the report
+
+    Returns:
+        Number of statements stored. The caller commits.
+    """
+    db.execute(delete(SqlStat).where(SqlStat.report_id == report_id))
+    rows = sql_stat_rows(report_id, metadata, records)
+    insert_sql_stats(db, rows)
+    return len(rows)
+
+
+def copy_sql_stats(db: Session, source_id: int, report_id: int):
+    """Copy the SQL statistics of a report to an identical one with INSERT ... SELECT. The caller commits."""
+    columns = [column.name for column in SqlStat.__table__.columns if column.name not in ('id', 'report_id')]
+
+    db.execute(delete(SqlStat).where(SqlStat.report_id == report_id))
+    db.execute(
+        insert(SqlStat).from_select(
+            ['report_id', *columns],
+            select(
+                literal(report_id),
+                *(SqlStat.__table__.c[column] for column in columns),
+            ).where(SqlStat.report_id == source_id)
+        )
+    )
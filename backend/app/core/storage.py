@@ -0,0 +1,164 @@
+"""Report File Storage"""
+
+import os
+import gzip
+import hashlib
+import logging
+from typing import BinaryIO, Optional
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+# Bytes read or written per step when copying, hashing or uploading reports
+CHUNK_SIZE = 1024 * 1024
+
+# Compression -> file name suffix of stored reports
+COMPRESSION_SUFFIXES = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def new_content_hasher():
+    """Hash object used for AWRReport.content_hash"""
+    return hashlib.sha256()
+
+
+def storage_suffix(compression: str) -> str:
+    """
+    File name suffix for a compression setting
+
+    Raises:
+        ValueError: If the compression is unknown
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported report compression: {compression}")
+    return COMPRESSION_SUFFIXES[compression]
+
+
+def with_compression(file_path: str, compression: str) -> str:
+    """Path of a stored report after converting it to another compression"""
+    current_suffix = COMPRESSION_SUFFIXES[compression_of(file_path)]
+    base_path = file_path[:-len(current_suffix)] if current_suffix else file_path
+    return base_path + storage_suffix(compression)
+
+
+def compression_of(file_path: str) -> str:
+    """Compression of a stored report, from its file name suffix"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and file_path.endswith(suffix):
+            return compression
+    return 'none'
+
+
+class ReportWriter:
+    """
+    Write a report to storage chunk by chunk
+
+    Chunks are compressed as they are written, while the size and content
+    hash of the uncompressed report are tracked, so a report never needs
+    to be held in memory as a whole.
+    """
+
+    def __init__(self, file_path: str, compression: str = 'none'):
+        """
+        Args:
+            file_path: Destination path, including the compression suffix
+            compression: "none", "gzip" or "zstd"
+        """
+        storage_suffix(compression)
+
+        self.file_path = file_path
+        self.size = 0
+        self._hasher = new_content_hasher()
+
+        if compression == 'gzip':
+            self._file = gzip.open(file_path, 'wb', compresslevel=GZIP_LEVEL)
+        elif compression == 'zstd':
+            self._file = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(file_path, 'wb'))
+        else:
+            self._file = open(file_path, 'wb')
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the uncompressed bytes written so far"""
+        return self._hasher.hexdigest()
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self._hasher.update(chunk)
+        self._file.write(chunk)
+
+    def copy_from(self, stream: BinaryIO):
+        """Write everything remaining in a binary stream"""
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self.write(chunk)
+
+    def close(self):
+        self._file.close()
+
+    def discard(self):
+        """Close and delete a partially written report"""
+        self.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def open_report(file_path: str) -> BinaryIO:
+    """
+    Open a stored report for reading, decompressing it as it is read
+
+    Args:
+        file_path: Path of the stored report
+
+    Returns:
+        Binary file object yielding the original HTML bytes
+    """
+    compression = compression_of(file_path)
+
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'zstd':
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'))
+    return open(file_path, 'rb')
+
+
+def report_size(file_path: str) -> Optional[int]:
+    """
+    Uncompressed size of a stored report if it is known without reading it
+
+    Returns:
+        Size in bytes, or None for compressed reports
+    """
+    if compression_of(file_path) != 'none':
+        return None
+    return os.path.getsize(file_path)
+
+
+def hash_report(file_path: str) -> str:
+    """Content hash of the uncompressed bytes of a stored report"""
+    hasher = new_content_hasher()
+    with open_report(file_path) as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
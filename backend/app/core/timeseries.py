@@ -0,0 +1,166 @@
+"""
+Per-snapshot Metric Time Series
+
+Every numeric leaf of the normalized metrics (except the per-statement
+top_sql entries) is also stored as a MetricSample row keyed by database,
+instance, snapshot time and dotted metric key. Trend queries read these
+narrow rows through the series index instead of loading whole JSONB
+documents.
+
+In PostgreSQL metric_samples is partitioned by month of snapshot_begin;
+the partition of a month is created the first time a report of that
+month is stored.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from app.models.metric_sample import MetricSample
+
+logger = logging.getLogger(__name__)
+
+# Metric categories whose numeric values become samples
+TIMESERIES_CATEGORIES = (
+    'load_profile',
+    'wait_events',
+    'memory_stats',
+    'io_stats',
+    'instance_efficiency',
+    'derived',
+)
+
+# Serializes partition creation across workers (arbitrary advisory lock key)
+PARTITION_LOCK_KEY = 0x415752  # "AWR"
+
+
+def numeric_leaves(data: Mapping[str, Any], prefix: str) -> Iterator[Tuple[str, float]]:
+    """Dotted keys and values of the numeric leaves under a mapping"""
+    for key, value in data.items():
+        path = f"{prefix}.{key}"
+        if isinstance(value, Mapping):
+            yield from numeric_leaves(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, float(value)
+
+
+def sample_values(records: Iterable[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    """
+    Metric keys and values of a report
+
+    Args:
+        records: PerformanceMetric values (metric_category, metric_data),
+            as built by app.core.ingest.metric_records()
+    """
+    values = []
+    for record in records:
+        category = record['metric_category']
+        if category in TIMESERIES_CATEGORIES:
+            values.extend(numeric_leaves(record['metric_data'], category))
+    return values
+
+
+def sample_rows(report_id: int, metadata: Mapping[str, Any], records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    MetricSample rows of a report, none if its snapshot time is unknown
+
+    Args:
+        report_id: Report the samples belong to
+        metadata: AWRReport values (db_name, instance_name, snapshot_begin)
+        records: PerformanceMetric values of the report
+    """
+    snapshot_begin = metadata.get('snapshot_begin')
+    if snapshot_begin is None:
+        return []
+
+    return [
+        {
+            'report_id': report_id,
+            'db_name': metadata.get('db_name'),
+            'instance_name': metadata.get('instance_name'),
+            'snapshot_begin': snapshot_begin,
+            'metric_key': metric_key,
+            'value': value,
+        }
+        for metric_key, value in sample_values(records)
+    ]
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def ensure_partitions(db: Session, snapshot_times: Iterable[Optional[datetime]]):
+    """
+    Create the monthly partitions the snapshot times fall into
+
+    Only needed in PostgreSQL; a no-op on other databases. Creation is
+    serialized with a transaction-level advisory lock, held until the
+    caller commits.
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        return
+
+    months = sorted({_month_start(moment) for moment in snapshot_times if moment is not None})
+    if not months:
+        return
+
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': PARTITION_LOCK_KEY})
+    for month in months:
+        partition = f"{MetricSample.__tablename__}_{month:%Y_%m}"
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {MetricSample.__tablename__} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        ))
+
+
+def insert_samples(db: Session, rows: Sequence[Dict[str, Any]]):
+    """Bulk insert MetricSample rows, creating their partitions first. The caller commits."""
+    if not rows:
+        return
+    ensure_partitions(db, {row['snapshot_begin'] for row in rows})
+    db.execute(insert(MetricSample), rows)
+
+
+def store_samples(db: Session, report_id: int, metadata: Mapping[str, Any], records: Iterable[Dict[str, Any]]) -> int:
+    """
+    Replace the samples of a report
+
+    Args:
+        db: Database session
+        report_id: Report the samples belong to
+        metadata: AWRReport values (db_name, instance_name, snapshot_begin)
+        records: PerformanceMetric values of the report
+
+    Returns:
+        Number of samples stored. The caller commits.
+    """
+    db.execute(delete(MetricSample).where(MetricSample.report_id == report_id))
+    rows = sample_rows(report_id, metadata, records)
+    insert_samples(db, rows)
+    return len(rows)
+
+
+def copy_samples(db: Session, source_id: int, report_id: int):
+    """Copy the samples of a report to an identical one with INSERT ... SELECT. The caller commits."""
+    db.execute(delete(MetricSample).where(MetricSample.report_id == report_id))
+    db.execute(
+        insert(MetricSample).from_select(
+            ['report_id', 'db_name', 'instance_name', 'snapshot_begin', 'metric_key', 'value'],
+            select(
+                literal(report_id),
+                MetricSample.db_name,
+                MetricSample.instance_name,
+                MetricSample.snapshot_begin,
+                MetricSample.metric_key,
+                MetricSample.value,
+            ).where(MetricSample.report_id == source_id)
+        )
+    )
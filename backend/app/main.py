@@ -2,11 +2,13 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 import logging
 
 from app.config import settings
-from app.api.v1 import reports, analysis
+from app.api.v1 import reports, analysis, trends, comparison, clusters, sql
+from app.core.response_cache import get_response_cache
 
 # Configure logging
 logging.basicConfig(
@@ -32,8 +34,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Cache"],
 )
 
+# Compress other JSON responses (report lists etc.); responses that are
+# already gzip-encoded, such as cached metrics, pass through unchanged
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE, compresslevel=6)
+
 
 # Health check endpoint
 @app.get("/health")
@@ -42,9 +49,24 @@ async def health_check():
     return {"status": "healthy", "version": settings.APP_VERSION}
 
 
+@app.get("/health/cache")
+def cache_stats():
+    """Response cache hits and misses per endpoint"""
+    cache = get_response_cache()
+    return {
+        "enabled": cache is not None,
+        "ttl": settings.CACHE_TTL,
+        "endpoints": cache.stats() if cache is not None else {},
+    }
+
+
 # Include routers
 app.include_router(reports.router, prefix="/api/v1")
 app.include_router(analysis.router, prefix="/api/v1")
+app.include_router(trends.router, prefix="/api/v1")
+app.include_router(comparison.router, prefix="/api/v1")
+app.include_router(clusters.router, prefix="/api/v1")
+app.include_router(sql.router, prefix="/api/v1")
 
 
 # Global exception handler
@@ -4,6 +4,10 @@ from app.models.database import Base, engine, get_db
 from app.models.awr_report import AWRReport, ReportStatus
 from app.models.performance_metric import PerformanceMetric
 from app.models.diagnostic_result import DiagnosticResult, Severity
+from app.models.metric_sample import MetricSample
+from app.models.comparison_result import ComparisonResult
+from app.models.cluster_snapshot import ClusterSnapshot
+from app.models.sql_stat import SqlStat
 
 __all__ = [
     "Base",
@@ -14,4 +18,8 @@ __all__ = [
     "PerformanceMetric",
     "DiagnosticResult",
     "Severity",
+    "MetricSample",
+    "ComparisonResult",
+    "ClusterSnapshot",
+    "SqlStat",
 ]
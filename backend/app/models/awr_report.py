@@ -1,6 +1,6 @@
 """AWR Report Model"""
 
-from sqlalchemy import Column, Integer, String, BigInteger, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, BigInteger, Boolean, DateTime, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -28,14 +28,20 @@ class AWRReport(Base):
     file_path = Column(String(512), nullable=False)
     file_size = Column(BigInteger)
     upload_time = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the HTML
 
     # Instance information
     oracle_version = Column(String(50))
     db_name = Column(String(100), index=True)
+    dbid = Column(BigInteger)
     instance_name = Column(String(100))
+    instance_number = Column(Integer)
     host_name = Column(String(100))
+    rac = Column(Boolean)  # instance of a RAC database
 
     # Snapshot information
+    begin_snap_id = Column(Integer)
+    end_snap_id = Column(Integer)
     snapshot_begin = Column(DateTime, index=True)
     snapshot_end = Column(DateTime)
     snapshot_interval = Column(Integer)  # minutes
@@ -43,6 +49,8 @@ class AWRReport(Base):
     # Status
     status = Column(Enum(ReportStatus), default=ReportStatus.PENDING, index=True)
     error_message = Column(Text, nullable=True)
+    parser_version = Column(String(20))  # PARSER_VERSION that produced the metrics
+    rules_version = Column(String(16))  # Rule set version of the stored diagnostics
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -52,5 +60,15 @@ class AWRReport(Base):
     metrics = relationship("PerformanceMetric", back_populates="report", cascade="all, delete-orphan")
     diagnostics = relationship("DiagnosticResult", back_populates="report", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination order of the report list
+        Index("ix_awr_reports_upload_time_id", upload_time.desc(), id.desc()),
+        # Substring (ILIKE '%...%') search on db_name, needs the pg_trgm extension
+        Index(
+            "ix_awr_reports_db_name_trgm", "db_name",
+            postgresql_using="gin", postgresql_ops={"db_name": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<AWRReport(id={self.id}, db_name={self.db_name}, status={self.status})>"
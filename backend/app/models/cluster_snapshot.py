@@ -0,0 +1,47 @@
+"""Cluster Snapshot Model"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from app.models.database import Base
+
+
+class ClusterSnapshot(Base):
+    """
+    Cluster-wide view of one snapshot range of a RAC database
+
+    Each instance of a RAC database has its own AWR report. Reports with
+    the same DB Id and snap id range are merged here as they are parsed
+    (see app.core.cluster).
+    """
+    __tablename__ = "cluster_snapshots"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Cluster identity
+    dbid = Column(BigInteger, nullable=False)
+    db_name = Column(String(100), index=True)
+    begin_snap_id = Column(Integer, nullable=False)
+    end_snap_id = Column(Integer, nullable=False)
+    snapshot_begin = Column(DateTime)
+    snapshot_end = Column(DateTime)
+
+    # Compact metrics of each merged instance, keyed by instance number
+    instances = Column(JSONB, nullable=False, default=dict)
+    instance_count = Column(Integer, nullable=False, default=0)
+
+    # Cluster-wide load profile, wait events, top SQL and per-instance skew
+    aggregates = Column(JSONB, nullable=False, default=dict)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("dbid", "begin_snap_id", "end_snap_id", name="uq_cluster_snapshots_range"),
+    )
+
+    def __repr__(self):
+        return f"<ClusterSnapshot(id={self.id}, db_name={self.db_name}, snaps={self.begin_snap_id}-{self.end_snap_id})>"
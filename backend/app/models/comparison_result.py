@@ -0,0 +1,34 @@
+"""Comparison Result Model"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from app.models.database import Base
+
+
+class ComparisonResult(Base):
+    """Precomputed comparison of a report with a baseline report or window of reports"""
+    __tablename__ = "comparison_results"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Compared reports; baseline_report_id is the most recent baseline report
+    baseline_report_id = Column(Integer, ForeignKey("awr_reports.id", ondelete="CASCADE"), nullable=False, index=True)
+    target_report_id = Column(Integer, ForeignKey("awr_reports.id", ondelete="CASCADE"), nullable=False, index=True)
+    baseline_report_ids = Column(JSONB, nullable=False)
+
+    # Digest of target and baseline ids, one result per pair
+    pair_key = Column(String(64), nullable=False, unique=True)
+    # Digest of the compared reports' parser version and content hash, the result is recomputed when it changes
+    data_version = Column(String(64), nullable=False)
+
+    # Aligned metrics with deltas, and the biggest movers
+    comparison_data = Column(JSONB, nullable=False)
+
+    # Timestamp
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ComparisonResult(id={self.id}, baseline={self.baseline_report_id}, target={self.target_report_id})>"
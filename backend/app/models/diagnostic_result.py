@@ -40,6 +40,9 @@ class DiagnosticResult(Base):
     # Related metric values
     metric_values = Column(JSONB)
 
+    # Version of the rule set that produced the result
+    rules_version = Column(String(16), index=True)
+
     # Timestamp
     created_at = Column(DateTime, default=datetime.utcnow)
 
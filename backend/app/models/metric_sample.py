@@ -0,0 +1,43 @@
+"""Metric Sample Model"""
+
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index, PrimaryKeyConstraint
+
+from app.models.database import Base
+
+
+class MetricSample(Base):
+    """
+    One numeric metric of one report, as a time series point
+
+    A narrow copy of the numeric leaves of the normalized metrics
+    (e.g. load_profile.redo_size_bytes.per_second), so trends over many
+    reports read only the values they need. Partitioned by month of
+    snapshot_begin in PostgreSQL (see app.core.timeseries).
+    """
+    __tablename__ = "metric_samples"
+
+    report_id = Column(Integer, ForeignKey("awr_reports.id", ondelete="CASCADE"), nullable=False)
+
+    # Series identity, copied from the report
+    db_name = Column(String(100))
+    instance_name = Column(String(100))
+    snapshot_begin = Column(DateTime, nullable=False)
+
+    # Dotted path in the normalized metric map
+    metric_key = Column(String(200), nullable=False)
+    value = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # The partition key has to be part of the primary key
+        PrimaryKeyConstraint("snapshot_begin", "report_id", "metric_key"),
+        # Range scans of one metric of one database, answered from the index alone
+        Index(
+            "ix_metric_samples_series", "db_name", "metric_key", "snapshot_begin",
+            postgresql_include=["instance_name", "value"],
+        ),
+        Index("ix_metric_samples_report_id", "report_id"),
+        {"postgresql_partition_by": "RANGE (snapshot_begin)"},
+    )
+
+    def __repr__(self):
+        return f"<MetricSample(report_id={self.report_id}, metric_key={self.metric_key}, value={self.value})>"
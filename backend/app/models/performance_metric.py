@@ -19,7 +19,8 @@ class PerformanceMetric(Base):
     report_id = Column(Integer, ForeignKey("awr_reports.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Metric category
-    # Categories: load_profile, wait_events, sql_stats, io_stats, memory_stats, instance_efficiency
+    # Categories: sections of the normalized metric map (app.core.normalizer):
+    # load_profile, wait_events, top_sql, io_stats, memory_stats, instance_efficiency, derived
     metric_category = Column(String(50), nullable=False, index=True)
 
     # Flexible JSONB storage for different Oracle versions
@@ -0,0 +1,65 @@
+"""SQL Statistics Model"""
+
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.database import Base
+
+
+class SqlStat(Base):
+    """
+    One statement of one report, merged from all "SQL ordered by" lists
+
+    A relational copy of the normalized top_sql entries, so the history of
+    a statement across reports is one indexed lookup by sql_id instead of
+    a scan of every report's top_sql document (see app.core.sql_stats).
+    """
+    __tablename__ = "sql_stats"
+
+    # Primary key
+    id = Column(Integer, primary_key=True)
+
+    report_id = Column(Integer, ForeignKey("awr_reports.id", ondelete="CASCADE"), nullable=False)
+    sql_id = Column(String(20), nullable=False)
+
+    # Report identity, copied from the report
+    db_name = Column(String(100))
+    instance_name = Column(String(100))
+    snapshot_begin = Column(DateTime)
+
+    sql_module = Column(String(100))
+    sql_text = Column(Text)
+
+    # Position in each list ({ordering: rank}) and the best of them
+    ranks = Column(JSONB, nullable=False)
+    best_rank = Column(Integer, nullable=False)
+    # %Total of each list ({ordering: value})
+    pct_total = Column(JSONB)
+
+    # Statistics; None when the statement is in no list reporting them
+    executions = Column(Float)
+    elapsed_time_s = Column(Float)
+    elapsed_time_per_exec_s = Column(Float)
+    cpu_time_s = Column(Float)
+    cpu_per_exec_s = Column(Float)
+    user_io_time_s = Column(Float)
+    uio_per_exec_s = Column(Float)
+    cluster_wait_time_s = Column(Float)
+    buffer_gets = Column(Float)
+    gets_per_exec = Column(Float)
+    physical_reads = Column(Float)
+    reads_per_exec = Column(Float)
+    rows_processed = Column(Float)
+    rows_per_exec = Column(Float)
+    parse_calls = Column(Float)
+    version_count = Column(Float)
+    sharable_mem_b = Column(Float)
+
+    __table_args__ = (
+        UniqueConstraint("report_id", "sql_id", name="uq_sql_stats_report_sql"),
+        # History of a statement in snapshot order
+        Index("ix_sql_stats_sql_id", "sql_id", "snapshot_begin"),
+    )
+
+    def __repr__(self):
+        return f"<SqlStat(report_id={self.report_id}, sql_id={self.sql_id}, best_rank={self.best_rank})>"
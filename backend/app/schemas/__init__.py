@@ -6,8 +6,12 @@ from app.schemas.report import (
     ReportDetail,
     ReportListResponse,
 )
-from app.schemas.metric import MetricResponse
+from app.schemas.metric import MetricResponse, MetricsResponse
 from app.schemas.diagnostic import DiagnosticResponse, DiagnosticItem
+from app.schemas.trend import TrendResponse
+from app.schemas.comparison import ComparisonCreate, ComparisonResponse
+from app.schemas.cluster import ClusterListResponse, ClusterSnapshotDetail
+from app.schemas.sql import SqlHistoryResponse
 
 __all__ = [
     "ReportCreate",
@@ -15,6 +19,13 @@ __all__ = [
     "ReportDetail",
     "ReportListResponse",
     "MetricResponse",
+    "MetricsResponse",
     "DiagnosticResponse",
     "DiagnosticItem",
+    "TrendResponse",
+    "ComparisonCreate",
+    "ComparisonResponse",
+    "ClusterListResponse",
+    "ClusterSnapshotDetail",
+    "SqlHistoryResponse",
 ]
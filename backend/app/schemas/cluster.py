@@ -0,0 +1,42 @@
+"""Cluster Snapshot Schemas"""
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class ClusterInstance(BaseModel):
+    """Report merged into a cluster snapshot"""
+    report_id: int
+    instance_name: Optional[str] = None
+    host_name: Optional[str] = None
+
+
+class ClusterSnapshotResponse(BaseModel):
+    """Schema for a cluster snapshot in a list"""
+    id: int
+    dbid: int
+    db_name: Optional[str] = None
+    begin_snap_id: int
+    end_snap_id: int
+    snapshot_begin: Optional[datetime] = None
+    snapshot_end: Optional[datetime] = None
+    instance_count: int
+    instances: Dict[str, ClusterInstance]  # keyed by instance number
+    updated_at: Optional[datetime] = None
+
+
+class ClusterSnapshotDetail(ClusterSnapshotResponse):
+    """Schema for a cluster snapshot with its cluster-wide metrics"""
+    load_profile: Dict[str, Dict[str, Any]]
+    wait_events: Dict[str, Dict[str, Any]]
+    top_sql: Dict[str, Dict[str, Any]]
+    skew: Dict[str, Any]
+
+
+class ClusterListResponse(BaseModel):
+    """Schema for cluster snapshot list response"""
+    total: int
+    page: int
+    size: int
+    items: List[ClusterSnapshotResponse]
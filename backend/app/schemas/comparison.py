@@ -0,0 +1,37 @@
+"""Comparison Schemas"""
+
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class ComparisonCreate(BaseModel):
+    """
+    Schema for creating a comparison
+
+    The baseline is either one report (baseline_id), several reports
+    (baseline_ids) or the baseline_window parsed reports of the same
+    database and instance preceding the target.
+    """
+    target_id: int
+    baseline_id: Optional[int] = None
+    baseline_ids: Optional[List[int]] = Field(None, min_length=1, max_length=100)
+    baseline_window: Optional[int] = Field(None, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def check_baseline(self):
+        given = [value for value in (self.baseline_id, self.baseline_ids, self.baseline_window) if value is not None]
+        if len(given) != 1:
+            raise ValueError("Exactly one of baseline_id, baseline_ids or baseline_window is required")
+        return self
+
+
+class ComparisonResponse(BaseModel):
+    """Schema for a comparison of a report with a baseline"""
+    id: int
+    baseline_id: int
+    baseline_ids: List[int]
+    target_id: int
+    created_at: datetime
+    comparison: Dict[str, Dict[str, Any]]
+    movers: Dict[str, List[Dict[str, Any]]]
@@ -14,6 +14,7 @@ class DiagnosticItem(BaseModel):
     issue_description: str
     recommendation: str
     metric_values: Optional[Dict[str, Any]] = None
+    rules_version: Optional[str] = None
 
     class Config:
         from_attributes = True
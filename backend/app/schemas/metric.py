@@ -8,3 +8,9 @@ class MetricResponse(BaseModel):
     """Schema for metric response"""
     category: str
     data: Dict[str, Any]
+
+
+class MetricsResponse(BaseModel):
+    """Schema for several metric categories of a report"""
+    report_id: int
+    metrics: Dict[str, Dict[str, Any]]
@@ -39,13 +39,21 @@ class ReportDetail(BaseModel):
     upload_time: datetime
     oracle_version: Optional[str] = None
     db_name: Optional[str] = None
+    dbid: Optional[int] = None
     instance_name: Optional[str] = None
+    instance_number: Optional[int] = None
     host_name: Optional[str] = None
+    rac: Optional[bool] = None
+    begin_snap_id: Optional[int] = None
+    end_snap_id: Optional[int] = None
     snapshot_begin: Optional[datetime] = None
     snapshot_end: Optional[datetime] = None
     snapshot_interval: Optional[int] = None
     status: str
     error_message: Optional[str] = None
+    content_hash: Optional[str] = None
+    parser_version: Optional[str] = None
+    rules_version: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -55,7 +63,9 @@ class ReportDetail(BaseModel):
 
 class ReportListResponse(BaseModel):
     """Schema for report list response"""
-    total: int
+    total: Optional[int] = None  # None when count=none
+    total_estimated: bool = False
     page: int
     size: int
+    next_cursor: Optional[str] = None
     items: List[ReportResponse]
@@ -0,0 +1,47 @@
+"""SQL Statistics Schemas"""
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class SqlStatResponse(BaseModel):
+    """Schema for the statistics of a statement in one report"""
+    report_id: int
+    db_name: Optional[str] = None
+    instance_name: Optional[str] = None
+    snapshot_begin: Optional[datetime] = None
+    sql_module: Optional[str] = None
+    best_rank: int
+    ranks: Dict[str, int]  # rank in each "SQL ordered by" list
+    pct_total: Optional[Dict[str, float]] = None
+    executions: Optional[float] = None
+    elapsed_time_s: Optional[float] = None
+    elapsed_time_per_exec_s: Optional[float] = None
+    cpu_time_s: Optional[float] = None
+    cpu_per_exec_s: Optional[float] = None
+    user_io_time_s: Optional[float] = None
+    uio_per_exec_s: Optional[float] = None
+    cluster_wait_time_s: Optional[float] = None
+    buffer_gets: Optional[float] = None
+    gets_per_exec: Optional[float] = None
+    physical_reads: Optional[float] = None
+    reads_per_exec: Optional[float] = None
+    rows_processed: Optional[float] = None
+    rows_per_exec: Optional[float] = None
+    parse_calls: Optional[float] = None
+    version_count: Optional[float] = None
+    sharable_mem_b: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SqlHistoryResponse(BaseModel):
+    """Schema for the reports a statement appears in"""
+    sql_id: str
+    sql_text: Optional[str] = None
+    total: int
+    page: int
+    size: int
+    items: List[SqlStatResponse]
@@ -0,0 +1,30 @@
+"""Trend Schemas"""
+
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class TrendSummary(BaseModel):
+    """Statistics of the full series before downsampling"""
+    count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    first: Optional[float] = None
+    last: Optional[float] = None
+    slope_per_day: Optional[float] = None
+    trend: Optional[str] = None  # up, down or flat
+
+
+class TrendResponse(BaseModel):
+    """Schema for a metric trend of a database"""
+    db_name: str
+    instance_name: Optional[str] = None
+    metric: str
+    aggregate: str
+    method: str
+    total_points: int
+    timestamps: List[datetime]
+    values: List[float]
+    summary: TrendSummary
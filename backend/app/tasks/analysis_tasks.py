@@ -0,0 +1,110 @@
+"""AWR Report Analysis Tasks"""
+
+import logging
+
+from celery import chain
+
+from app.tasks.celery_app import celery_app
+from app.tasks.parse_tasks import DatabaseTask, parse_awr_report_task
+from app.models.awr_report import AWRReport, ReportStatus
+from app.core.analyzer.rule_registry import get_rule_registry
+from app.core.analyzer.fleet import rediagnose_reports
+from app.core.parser.base import PARSER_VERSION
+from app.core.response_cache import invalidate_reports
+
+logger = logging.getLogger(__name__)
+
+
+def parse_and_analyze(report_id: int):
+    """
+    Parse a report, then analyze it
+
+    The two tasks run on the parse and analysis queues, so their workers
+    scale independently. Analysis skips reports that failed to parse.
+
+    Returns:
+        Celery AsyncResult of the chain
+    """
+    return chain(
+        parse_awr_report_task.si(report_id),
+        analyze_awr_report_task.si(report_id),
+    ).apply_async()
+
+
+@celery_app.task(base=DatabaseTask, bind=True, name="analyze_awr_report")
+def analyze_awr_report_task(self, report_id: int, force: bool = False):
+    """
+    Run the diagnostic rules on a parsed report and store the results
+
+    Idempotent: the report's diagnostics are replaced in one transaction,
+    and a report already analyzed with the current rule set version is
+    skipped unless force is set.
+
+    Args:
+        report_id: ID of the AWR report to analyze
+        force: Re-analyze even if the rule set version is unchanged
+
+    Returns:
+        dict: Analysis result with status and message
+    """
+    logger.info(f"Starting analysis task for report_id={report_id}")
+
+    db = self.db
+    # Cached per process and reloaded when the rule files change; kept for the whole task
+    registry = get_rule_registry()
+    engine = registry.get()
+
+    # Never stamp reports as analyzed by an empty rule set
+    if not engine.compiled.rules:
+        error_msg = f"No diagnostic rules loaded from {registry.rules_dir}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg}
+
+    try:
+        # Lock the report so concurrent analyses of it run one after another
+        report = db.query(AWRReport).filter(AWRReport.id == report_id).with_for_update().first()
+
+        if not report:
+            error_msg = f"Report not found: {report_id}"
+            logger.error(error_msg)
+            return {"status": "error", "message": error_msg}
+
+        if report.status != ReportStatus.PARSED:
+            db.rollback()
+            return {"status": "skipped", "report_id": report_id, "message": f"Report is {report.status.value}"}
+
+        if report.parser_version != PARSER_VERSION:
+            db.rollback()
+            return {
+                "status": "skipped",
+                "report_id": report_id,
+                "message": f"Metrics are from parser version {report.parser_version}, parse the report again",
+            }
+
+        if not force and report.rules_version == engine.version:
+            db.rollback()
+            return {
+                "status": "skipped",
+                "report_id": report_id,
+                "rules_version": engine.version,
+                "message": "Already analyzed with this rule set version",
+            }
+
+        diagnostics_count = rediagnose_reports(db, engine.compiled, [report_id])
+        db.commit()
+        invalidate_reports([report_id])
+
+        logger.info(f"Stored {diagnostics_count} diagnostic results for report_id={report_id}")
+
+        return {
+            "status": "success",
+            "report_id": report_id,
+            "rules_version": engine.version,
+            "diagnostics": diagnostics_count,
+        }
+
+    except Exception as e:
+        error_msg = f"Unexpected error in analysis task: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        db.rollback()
+        return {"status": "error", "message": error_msg}
@@ -28,8 +28,10 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
-# Task routing
+# Task routing (tasks are registered under short names, route those too)
 celery_app.conf.task_routes = {
     "app.tasks.parse_tasks.*": {"queue": "parse"},
     "app.tasks.analysis_tasks.*": {"queue": "analysis"},
+    "parse_awr_report": {"queue": "parse"},
+    "analyze_awr_report": {"queue": "analysis"},
 }
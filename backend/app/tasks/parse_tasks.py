@@ -1,6 +1,7 @@
 """AWR Report Parsing Tasks"""
 
 from celery import Task
+import os
 import logging
 from datetime import datetime
 
@@ -8,7 +9,14 @@ from app.tasks.celery_app import celery_app
 from app.models.database import SessionLocal
 from app.models.awr_report import AWRReport, ReportStatus
 from app.models.performance_metric import PerformanceMetric
-from app.core.parser.factory import AWRParserFactory
+from app.core.parser.base import PARSER_VERSION
+from app.core.ingest import parse_report_file, report_metadata, metric_records
+from app.core.storage import hash_report
+from app.core.parse_cache import find_parsed_report, reuse_parse_result
+from app.core.response_cache import invalidate_reports
+from app.core.timeseries import store_samples
+from app.core.sql_stats import store_sql_stats
+from app.core.cluster import merge_report
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +63,29 @@ def parse_awr_report_task(self, report_id: int):
             logger.error(error_msg)
             return {"status": "error", "message": error_msg}
 
+        # Reports uploaded before content hashing get their hash here
+        if not report.content_hash:
+            try:
+                report.content_hash = hash_report(report.file_path)
+            except Exception as e:
+                logger.warning(f"Failed to hash report file: {e}")
+
+        # Reuse the metrics of an identical report parsed by this parser version
+        if report.content_hash:
+            cached_report = find_parsed_report(db, report.content_hash, exclude_id=report.id)
+            if cached_report:
+                reuse_parse_result(db, cached_report, report)
+                db.commit()
+                invalidate_reports([report.id])
+
+                return {
+                    "status": "success",
+                    "report_id": report_id,
+                    "db_name": report.db_name,
+                    "oracle_version": report.oracle_version,
+                    "cached_from": cached_report.id
+                }
+
         # Update status to parsing
         report.status = ReportStatus.PARSING
         report.updated_at = datetime.utcnow()
@@ -62,23 +93,20 @@ def parse_awr_report_task(self, report_id: int):
 
         logger.info(f"Reading file: {report.file_path}")
 
-        # Read HTML file
-        try:
-            with open(report.file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                html_content = f.read()
-        except Exception as e:
-            error_msg = f"Failed to read file: {str(e)}"
-            logger.error(error_msg, exc_info=True)
+        # Check the stored file before claiming a parser
+        if not os.path.exists(report.file_path):
+            error_msg = f"Failed to read file: No such file: {report.file_path}"
+            logger.error(error_msg)
             report.status = ReportStatus.FAILED
             report.error_message = error_msg
             db.commit()
             return {"status": "error", "message": error_msg}
 
-        # Create parser and parse
+        # Parse, decompressing the stored report straight into the parser
+        # (large reports use the bounded-memory streaming parser)
         try:
             logger.info("Creating parser and parsing AWR report")
-            parser = AWRParserFactory.create_parser(html_content)
-            parsed_data = parser.parse()
+            parsed_data = parse_report_file(report.file_path, report.file_size)
 
             logger.info(f"Successfully parsed AWR report. Keys: {list(parsed_data.keys())}")
 
@@ -91,21 +119,11 @@ def parse_awr_report_task(self, report_id: int):
             return {"status": "error", "message": error_msg}
 
         # Update report metadata
+        metadata = {}
         try:
-            instance_info = parsed_data.get('instance_info', {})
-            snapshot_info = parsed_data.get('snapshot_info', {})
-
-            report.oracle_version = instance_info.get('oracle_version')
-            report.db_name = instance_info.get('db_name')
-            report.instance_name = instance_info.get('instance_name')
-            report.host_name = instance_info.get('host_name')
-            report.snapshot_begin = snapshot_info.get('begin_time')
-            report.snapshot_end = snapshot_info.get('end_time')
-
-            # Calculate snapshot interval in minutes
-            if report.snapshot_begin and report.snapshot_end:
-                elapsed_seconds = snapshot_info.get('elapsed_time', 0)
-                report.snapshot_interval = int(elapsed_seconds / 60) if elapsed_seconds > 0 else None
+            metadata = report_metadata(parsed_data)
+            for field, value in metadata.items():
+                setattr(report, field, value)
 
             logger.info(f"Updated report metadata: db_name={report.db_name}, version={report.oracle_version}")
 
@@ -114,27 +132,27 @@ def parse_awr_report_task(self, report_id: int):
 
         # Store performance metrics
         try:
-            metric_categories = [
-                'load_profile',
-                'wait_events',
-                'top_sql',
-                'memory_stats',
-                'io_stats',
-                'instance_efficiency'
-            ]
-
-            metrics_count = 0
-            for category in metric_categories:
-                if category in parsed_data and parsed_data[category]:
-                    metric = PerformanceMetric(
-                        report_id=report.id,
-                        metric_category=category,
-                        metric_data=parsed_data[category]
-                    )
-                    db.add(metric)
-                    metrics_count += 1
-
-            logger.info(f"Stored {metrics_count} performance metric categories")
+            records = metric_records(parsed_data)
+
+            # A re-parse replaces the metrics of the previous parse
+            db.query(PerformanceMetric).filter_by(report_id=report.id).delete()
+            for record in records:
+                db.add(PerformanceMetric(report_id=report.id, **record))
+            metrics_count = len(records)
+
+            # Numeric metrics as time series points for trends
+            samples_count = store_samples(db, report.id, metadata, records)
+
+            # Statements by sql_id, for their history across reports
+            sql_count = store_sql_stats(db, report.id, metadata, records)
+
+            # RAC instances of the same snapshot range, merged cluster-wide
+            merge_report(db, report.id, metadata, records)
+
+            logger.info(
+                f"Stored {metrics_count} performance metric categories, {samples_count} metric samples "
+                f"and {sql_count} SQL statements"
+            )
 
         except Exception as e:
             error_msg = f"Failed to store performance metrics: {str(e)}"
@@ -146,9 +164,12 @@ def parse_awr_report_task(self, report_id: int):
 
         # Update status to parsed
         report.status = ReportStatus.PARSED
+        report.parser_version = PARSER_VERSION
+        report.rules_version = None  # New metrics need a new analysis
         report.error_message = None
         report.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_reports([report.id])
 
         logger.info(f"Successfully completed parsing task for report_id={report_id}")
 
@@ -0,0 +1,374 @@
+"""
+Benchmark AWR Parser against the Reports in awrrpt/
+
+Runs from backend/ or, as a module, from the project root.
+
+Usage:
+    python benchmark_parser.py
+    python benchmark_parser.py --backends
+    python benchmark_parser.py --streaming
+    python -m backend.benchmark_parser --parse-value
+"""
+
+import re
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Set UTF-8 encoding for Windows
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bs4 import BeautifulSoup
+
+from app.core.parser.factory import AWRParserFactory
+from app.core.parser.section_index import SectionIndex
+from app.core.parser.version_detector import detect_oracle_version
+from app.core.parser.utils import clean_text
+
+# Section lookups performed by Oracle19cParser.parse()
+SECTION_LOOKUPS = [
+    "Load Profile",
+    "top 10 wait events",
+    "Top 5 Timed",
+    "Foreground Wait Events",
+    "SQL ordered by CPU",
+    "SQL ordered by Elapsed",
+    "SQL ordered by Gets",
+    "SQL ordered by Reads",
+    "SQL ordered by Executions",
+    "SQL ordered by User I/O",
+    "SQL ordered by Cluster",
+    "SQL ordered by Parse",
+    "SQL ordered by Version",
+    "SQL ordered by Sharable",
+    "Complete List of SQL Text",
+]
+
+# Sections needed to list a report
+METADATA_SECTIONS = ['instance_info', 'snapshot_info']
+
+
+def scan_table_by_header(soup, header_text):
+    """Reference lookup that walks the whole tree for every header"""
+    for th in soup.find_all('th'):
+        if header_text.lower() in clean_text(th.get_text()).lower():
+            return th.find_parent('table')
+
+    for a in soup.find_all('a', attrs={'name': True}):
+        if header_text.lower().replace(' ', '') in a['name'].lower():
+            next_table = a.find_next('table')
+            if next_table:
+                return next_table
+
+    for tag in soup.find_all(['h2', 'h3', 'b']):
+        if header_text.lower() in clean_text(tag.get_text()).lower():
+            next_table = tag.find_next('table')
+            if next_table:
+                return next_table
+
+    return None
+
+
+def timed(func, *args):
+    """Run func and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_report(html_file):
+    """Benchmark version detection, section lookups and full parse for one report"""
+    with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+        html_content = f.read()
+
+    version, detect_time = timed(detect_oracle_version, html_content)
+
+    soup, tree_time = timed(BeautifulSoup, html_content, 'lxml')
+
+    _, scan_time = timed(lambda: [scan_table_by_header(soup, h) for h in SECTION_LOOKUPS])
+
+    def indexed_lookups():
+        index = SectionIndex.from_soup(soup)
+        return [index.find(h) for h in SECTION_LOOKUPS]
+
+    _, index_time = timed(indexed_lookups)
+
+    _, parse_time = timed(lambda: AWRParserFactory.create_parser(html_content).parse())
+
+    # Metadata-only ingestion
+    _, meta_time = timed(
+        lambda: AWRParserFactory.create_parser(html_content).parse(sections=METADATA_SECTIONS)
+    )
+
+    return {
+        'size': len(html_content),
+        'version': version,
+        'detect': detect_time,
+        'tree': tree_time,
+        'scan': scan_time,
+        'index': index_time,
+        'parse': parse_time,
+        'meta': meta_time,
+    }
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KB on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure_backend(job):
+    """Parse one report with one backend and report CPU time and peak RSS growth"""
+    html_file, backend = job
+    logging.disable(logging.WARNING)
+
+    baseline_rss = peak_rss_kb()
+    cpu_start = time.process_time()
+
+    if backend == 'stream':
+        parser = AWRParserFactory.create_streaming_parser(html_file)
+    else:
+        with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            html_content = f.read()
+        parser = AWRParserFactory.create_parser(html_content, backend=backend)
+
+    result = parser.parse()
+
+    cpu_time = time.process_time() - cpu_start
+    return cpu_time, peak_rss_kb() - baseline_rss, result
+
+
+def measure_isolated(html_file, backend):
+    """Run measure_backend in a fresh process so peak RSS is not shared between runs"""
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        return pool.apply(measure_backend, ((str(html_file), backend),))
+
+
+def inflate_report(html_file, target_bytes, output_dir):
+    """
+    Write a copy of a report grown to target_bytes by repeating the rows
+    of its Complete List of SQL Text table, like long-interval reports
+    """
+    html_content = Path(html_file).read_text(encoding='utf-8', errors='ignore')
+
+    match = re.search(
+        r'(<table[^>]*summary="This table displays the text of the SQL[^"]*">.*?</tr>)(.*?)(</table>)',
+        html_content, re.DOTALL
+    )
+    if not match:
+        return None
+
+    sql_rows = match.group(2)
+    copies = max(1, (target_bytes - len(html_content)) // max(len(sql_rows), 1) + 1)
+
+    output_file = Path(output_dir) / f"{Path(html_file).stem}_{target_bytes // (1024 * 1024)}mb.html"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(html_content[:match.start(2)])
+        for _ in range(copies):
+            f.write(sql_rows)
+        f.write(html_content[match.end(2):])
+
+    return output_file
+
+
+def compare_backends(html_files, awrrpt_dir):
+    """Compare CPU time and peak RSS of the bs4 and lxml backends per report"""
+    backends = ['bs4', 'lxml']
+
+    print(
+        f"{'Report':50s} {'bs4 CPU(ms)':>12s} {'lxml CPU(ms)':>13s} "
+        f"{'bs4 RSS(MB)':>12s} {'lxml RSS(MB)':>13s} {'Output':>10s}"
+    )
+    print("-" * 115)
+
+    totals = {backend: [0.0, 0] for backend in backends}
+
+    for html_file in html_files:
+        measurements = {backend: measure_isolated(html_file, backend) for backend in backends}
+
+        for backend in backends:
+            totals[backend][0] += measurements[backend][0]
+            totals[backend][1] += measurements[backend][1]
+
+        identical = measurements['bs4'][2] == measurements['lxml'][2]
+        print(
+            f"{str(html_file.relative_to(awrrpt_dir)):50s} "
+            f"{measurements['bs4'][0] * 1000:>12.1f} "
+            f"{measurements['lxml'][0] * 1000:>13.1f} "
+            f"{measurements['bs4'][1] / 1024:>12.1f} "
+            f"{measurements['lxml'][1] / 1024:>13.1f} "
+            f"{'identical' if identical else 'DIFFERENT':>10s}"
+        )
+
+    print("-" * 115)
+    print(
+        f"{'Total':50s} "
+        f"{totals['bs4'][0] * 1000:>12.1f} "
+        f"{totals['lxml'][0] * 1000:>13.1f} "
+        f"{totals['bs4'][1] / 1024:>12.1f} "
+        f"{totals['lxml'][1] / 1024:>13.1f}"
+    )
+
+
+def compare_streaming(html_files, awrrpt_dir):
+    """Compare peak RSS of the full lxml tree and the streaming parse, including inflated reports"""
+    print(
+        f"{'Report':50s} {'Size(MB)':>9s} {'lxml RSS(MB)':>13s} {'stream RSS(MB)':>15s} "
+        f"{'stream CPU(ms)':>15s} {'Output':>10s}"
+    )
+    print("-" * 120)
+
+    def report_row(html_file, label):
+        full = measure_isolated(html_file, 'lxml')
+        streamed = measure_isolated(html_file, 'stream')
+        identical = full[2] == streamed[2]
+        print(
+            f"{label:50s} "
+            f"{Path(html_file).stat().st_size / (1024 * 1024):>9.1f} "
+            f"{full[1] / 1024:>13.1f} "
+            f"{streamed[1] / 1024:>15.1f} "
+            f"{streamed[0] * 1000:>15.1f} "
+            f"{'identical' if identical else 'DIFFERENT':>10s}"
+        )
+
+    for html_file in html_files:
+        report_row(html_file, str(html_file.relative_to(awrrpt_dir)))
+
+    # Grow the largest report well past MAX_UPLOAD_SIZE
+    largest = max(html_files, key=lambda f: f.stat().st_size)
+    with tempfile.TemporaryDirectory() as output_dir:
+        for target_mb in (10, 60):
+            inflated = inflate_report(largest, target_mb * 1024 * 1024, output_dir)
+            if inflated:
+                report_row(inflated, f"{largest.name} (inflated to {target_mb}MB)")
+
+
+def compare_parse_value(html_files):
+    """Time parse_value against the reference implementation on every table cell"""
+    from app.core.parser.utils import parse_value, parse_values
+    from test_parser import reference_parse_value
+
+    cells = []
+    for html_file in html_files:
+        document = AWRParserFactory.create_file_parser(str(html_file)).document
+        for table in document.tables:
+            for row in document.table_rows(table):
+                cells.extend(row)
+
+    _, reference_time = timed(lambda: [reference_parse_value(text) for text in cells])
+    _, fast_time = timed(lambda: [parse_value(text) for text in cells])
+    _, column_time = timed(parse_values, cells)
+
+    print(f"{'Cells':>10s} {'Reference(ms)':>14s} {'parse_value(ms)':>16s} {'parse_values(ms)':>17s} {'Speedup':>8s}")
+    print("-" * 70)
+    print(
+        f"{len(cells):>10d} "
+        f"{reference_time * 1000:>14.1f} "
+        f"{fast_time * 1000:>16.1f} "
+        f"{column_time * 1000:>17.1f} "
+        f"{reference_time / fast_time if fast_time else 0:>7.1f}x"
+    )
+
+
+def main():
+    """Benchmark all AWR reports in the awrrpt directory"""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument(
+        '--backends', action='store_true',
+        help='compare CPU time and peak RSS of the bs4 and lxml document backends'
+    )
+    arg_parser.add_argument(
+        '--streaming', action='store_true',
+        help='compare peak RSS of the full lxml parse and the streaming parse'
+    )
+    arg_parser.add_argument(
+        '--parse-value', action='store_true',
+        help='compare parse_value with the reference implementation on every table cell'
+    )
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    project_root = Path(__file__).parent.parent
+    awrrpt_dir = project_root / "awrrpt"
+
+    html_files = sorted(awrrpt_dir.rglob("*.html"))
+
+    if not html_files:
+        print(f"No HTML files found in {awrrpt_dir}")
+        return
+
+    if args.backends:
+        compare_backends(html_files, awrrpt_dir)
+        return
+
+    if args.streaming:
+        compare_streaming(html_files, awrrpt_dir)
+        return
+
+    if args.parse_value:
+        compare_parse_value(html_files)
+        return
+
+    print(
+        f"{'Report':50s} {'Size':>8s} {'Version':>8s} {'Detect(ms)':>11s} {'Tree(ms)':>9s} "
+        f"{'Scan(ms)':>9s} {'Index(ms)':>10s} {'Speedup':>8s} {'Parse(ms)':>10s} {'Meta(ms)':>9s}"
+    )
+    print("-" * 140)
+
+    totals = {'detect': 0.0, 'tree': 0.0, 'scan': 0.0, 'index': 0.0, 'parse': 0.0, 'meta': 0.0}
+
+    for html_file in html_files:
+        result = benchmark_report(html_file)
+        for key in totals:
+            totals[key] += result[key]
+
+        speedup = result['scan'] / result['index'] if result['index'] else 0
+        print(
+            f"{str(html_file.relative_to(awrrpt_dir)):50s} "
+            f"{result['size'] // 1024:>7d}K "
+            f"{result['version']:>8s} "
+            f"{result['detect'] * 1000:>11.2f} "
+            f"{result['tree'] * 1000:>9.1f} "
+            f"{result['scan'] * 1000:>9.1f} "
+            f"{result['index'] * 1000:>10.1f} "
+            f"{speedup:>7.1f}x "
+            f"{result['parse'] * 1000:>10.1f} "
+            f"{result['meta'] * 1000:>9.1f}"
+        )
+
+    print("-" * 140)
+    speedup = totals['scan'] / totals['index'] if totals['index'] else 0
+    print(
+        f"{'Total':50s} {'':>8s} {'':>8s} "
+        f"{totals['detect'] * 1000:>11.2f} "
+        f"{totals['tree'] * 1000:>9.1f} "
+        f"{totals['scan'] * 1000:>9.1f} "
+        f"{totals['index'] * 1000:>10.1f} "
+        f"{speedup:>7.1f}x "
+        f"{totals['parse'] * 1000:>10.1f} "
+        f"{totals['meta'] * 1000:>9.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Benchmark the Rule Engine against the Parsed Reports in awrrpt/"""
+
+import sys
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+
+# Set UTF-8 encoding for Windows
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.analyzer.rule_engine import RuleEngine
+from app.core.analyzer.rule_compiler import compile_rules
+from app.core.parser.factory import AWRParserFactory
+from app.core.normalizer import normalize_metrics
+
+DEFAULT_RULE_COUNT = 1200
+
+# Reports per evaluate_many() call, as in app.core.analyzer.fleet
+FLEET_BATCH_SIZE = 1000
+
+# Paths of sections that exist only in some reports (e.g. RAC wait events)
+MISSING_PATH_SHARE = 0.2
+
+OPERATORS = ['>', '<', '>=', '<=', '==', 'in_range']
+SEVERITIES = ['critical', 'high', 'medium', 'low']
+
+
+class ReferenceRuleEngine:
+    """Reference evaluation that interprets the rule dictionaries on every call"""
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def evaluate(self, metrics):
+        results = []
+        for rule in self.rules:
+            try:
+                if self._match_conditions(rule.get('conditions', []), metrics):
+                    results.append({
+                        'rule_id': rule['id'],
+                        'severity': rule['severity'],
+                        'category': rule['category'],
+                        'issue_title': rule['name'],
+                        'issue_description': rule.get('description', ''),
+                        'recommendation': rule.get('recommendation', ''),
+                        'metric_values': self._extract_metrics(rule, metrics)
+                    })
+            except Exception:
+                pass
+
+        severity_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+        results.sort(key=lambda x: severity_order.get(x['severity'], 999))
+        return results
+
+    def _match_conditions(self, conditions, metrics):
+        for condition in conditions:
+            metric_value = self._get_nested_value(metrics, condition['metric'])
+            if not self._compare(metric_value, condition['operator'], condition['threshold']):
+                return False
+        return True
+
+    def _compare(self, value, operator, threshold):
+        try:
+            if operator == '>':
+                return float(value) > float(threshold)
+            elif operator == '<':
+                return float(value) < float(threshold)
+            elif operator == '>=':
+                return float(value) >= float(threshold)
+            elif operator == '<=':
+                return float(value) <= float(threshold)
+            elif operator == '==':
+                return value == threshold
+            elif operator == 'in_range':
+                return threshold[0] <= float(value) <= threshold[1]
+            return False
+        except (ValueError, TypeError):
+            return False
+
+    def _get_nested_value(self, data, path):
+        value = data
+        for key in path.split('.'):
+            if isinstance(value, dict):
+                value = value.get(key)
+                if value is None:
+                    return None
+            else:
+                return None
+        return value
+
+    def _extract_metrics(self, rule, metrics):
+        result = {}
+        for condition in rule.get('conditions', []):
+            value = self._get_nested_value(metrics, condition['metric'])
+            if value is not None:
+                result[condition['metric']] = value
+        return result
+
+
+def numeric_paths(data, prefix=()):
+    """Dotted paths of all numeric leaves reachable through dictionaries"""
+    for key, value in data.items():
+        path = prefix + (str(key),)
+        if isinstance(value, dict):
+            yield from numeric_paths(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield '.'.join(path), value
+
+
+def generate_rules(corpus, count, seed=0):
+    """
+    Build synthetic rules over the metric paths found in the parsed corpus
+
+    Like the bundled rules, thresholds flag outliers: they are drawn from
+    the tails of the observed values, so each rule matches a few reports.
+    """
+    rng = random.Random(seed)
+
+    observed = {}
+    for metrics in corpus:
+        for path, value in numeric_paths(metrics):
+            observed.setdefault(path, []).append(value)
+    for values in observed.values():
+        values.sort()
+    paths = sorted(observed)
+
+    rules = []
+    for n in range(count):
+        conditions = []
+        for _ in range(rng.choice([1, 1, 2, 3])):
+            if rng.random() < MISSING_PATH_SHARE:
+                path = f"wait_events.synthetic_event_{rng.randrange(50)}.pct_db_time"
+                values = [rng.uniform(0, 100) for _ in range(10)]
+                values.sort()
+            else:
+                path = rng.choice(paths)
+                values = observed[path]
+
+            low, high = values[len(values) // 10], values[-1 - len(values) // 10]
+            op_name = rng.choice(OPERATORS)
+            if op_name in ('>', '>='):
+                threshold = high * rng.uniform(0.9, 1.1)
+            elif op_name in ('<', '<='):
+                threshold = low * rng.uniform(0.9, 1.1)
+            elif op_name == 'in_range':
+                threshold = [high, high * 1.5]
+            else:
+                threshold = rng.choice(values)
+            conditions.append({'metric': path, 'operator': op_name, 'threshold': threshold})
+
+        rules.append({
+            'id': f"SYNTHETIC_{n:05d}",
+            'name': f"Synthetic rule {n}",
+            'category': 'synthetic',
+            'severity': rng.choice(SEVERITIES),
+            'description': '',
+            'conditions': conditions,
+            'recommendation': '',
+        })
+
+    return rules
+
+
+def timed(func, repeat):
+    """Best wall time of repeat runs of func, with its last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare_fleet(compiled, corpus, count):
+    """Time evaluate() per report against evaluate_many() in fleet-sized batches"""
+    fleet = [corpus[n % len(corpus)] for n in range(count)]
+    print(f"{len(compiled.rules)} rules, {count} reports in batches of {FLEET_BATCH_SIZE}")
+    print()
+
+    loop_time = batch_time = 0.0
+    result_count = 0
+    identical = True
+    for start in range(0, count, FLEET_BATCH_SIZE):
+        batch = fleet[start:start + FLEET_BATCH_SIZE]
+        expected, elapsed = timed(lambda: [compiled.evaluate(metrics) for metrics in batch], 1)
+        loop_time += elapsed
+        actual, elapsed = timed(lambda: compiled.evaluate_many(batch), 1)
+        batch_time += elapsed
+
+        result_count += sum(len(results) for results in actual)
+        identical &= actual == expected
+
+    print(f"{'Per report':12s} {loop_time:>8.2f}s {count / loop_time:>10.0f} reports/s")
+    print(f"{'Batch':12s} {batch_time:>8.2f}s {count / batch_time:>10.0f} reports/s")
+    print(f"{result_count} results, {'identical' if identical else 'DIFFERENT'}")
+
+
+def main():
+    """Evaluate the bundled and synthetic rules against every parsed report"""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        '--rules', type=int, default=DEFAULT_RULE_COUNT,
+        help=f'number of synthetic rules (default: {DEFAULT_RULE_COUNT})'
+    )
+    arg_parser.add_argument('--repeat', type=int, default=5, help='timing repetitions (default: 5)')
+    arg_parser.add_argument(
+        '--fleet', type=int, metavar='N',
+        help='compare per-report and batch evaluation over N reports (the corpus repeated)'
+    )
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    project_root = Path(__file__).parent.parent
+    awrrpt_dir = project_root / "awrrpt"
+    html_files = sorted(awrrpt_dir.rglob("*.html"))
+
+    if not html_files:
+        print(f"No HTML files found in {awrrpt_dir}")
+        return
+
+    corpus = [normalize_metrics(AWRParserFactory.create_file_parser(str(f)).parse()) for f in html_files]
+
+    bundled_rules = RuleEngine(str(Path(__file__).parent / "app" / "rules")).rules
+    rules = bundled_rules + generate_rules(corpus, args.rules)
+
+    if args.fleet:
+        compare_fleet(compile_rules(rules), corpus, args.fleet)
+        return
+
+    reference = ReferenceRuleEngine(rules)
+    compiled, compile_time = timed(lambda: compile_rules(rules), 1)
+
+    print(
+        f"{len(rules)} rules ({len(bundled_rules)} bundled), {compiled.path_count} distinct metric paths, "
+        f"{len(corpus)} reports, compiled in {compile_time * 1000:.1f}ms"
+    )
+    print()
+    print(f"{'Report':50s} {'Matched':>8s} {'Reference(ms)':>14s} {'Compiled(ms)':>13s} {'Speedup':>8s} {'Output':>10s}")
+    print("-" * 108)
+
+    totals = [0.0, 0.0]
+    for html_file, metrics in zip(html_files, corpus):
+        expected, reference_time = timed(lambda: reference.evaluate(metrics), args.repeat)
+        actual, compiled_time = timed(lambda: compiled.evaluate(metrics), args.repeat)
+        totals[0] += reference_time
+        totals[1] += compiled_time
+
+        print(
+            f"{str(html_file.relative_to(awrrpt_dir)):50s} "
+            f"{len(actual):>8d} "
+            f"{reference_time * 1000:>14.2f} "
+            f"{compiled_time * 1000:>13.2f} "
+            f"{reference_time / compiled_time:>7.1f}x "
+            f"{'identical' if actual == expected else 'DIFFERENT':>10s}"
+        )
+
+    print("-" * 108)
+    print(
+        f"{'Total':50s} {'':>8s} "
+        f"{totals[0] * 1000:>14.2f} "
+        f"{totals[1] * 1000:>13.2f} "
+        f"{totals[0] / totals[1]:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Shared pytest fixtures"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models import Base
+from app.models import database
+from app.config import settings
+from app.main import app
+
+
+@compiles(JSONB, 'sqlite')
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    # JSONB columns are plain JSON in the SQLite test database
+    return 'JSON'
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """
+    Session factory of an empty SQLite database with all tables
+
+    Installed as app.models.database.SessionLocal, so get_db and the
+    command line tools use it as well.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'awr.db'}")
+    Base.metadata.create_all(engine)
+
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, 'SessionLocal', factory)
+
+    yield factory
+
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    """Session of the test database"""
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    """API client of the test database with the response cache disabled"""
+    monkeypatch.setattr(settings, 'CACHE_TTL', 0)
+    return TestClient(app)
+
+
+@pytest.fixture
+def run_task(session_factory, monkeypatch):
+    """
+    Run a Celery task in this process against the test database
+
+    Returns a function taking the task and its arguments and returning
+    the task's result. The response cache is disabled.
+    """
+    from app.tasks import parse_tasks
+
+    monkeypatch.setattr(parse_tasks, 'SessionLocal', session_factory)
+    monkeypatch.setattr(settings, 'CACHE_TTL', 0)
+
+    def run(task, *args, **kwargs):
+        return task.apply(args=args, kwargs=kwargs).get()
+
+    return run
@@ -10,6 +10,10 @@ from app.models.database import Base
 from app.models.awr_report import AWRReport
 from app.models.performance_metric import PerformanceMetric
 from app.models.diagnostic_result import DiagnosticResult
+from app.models.metric_sample import MetricSample
+from app.models.comparison_result import ComparisonResult
+from app.models.cluster_snapshot import ClusterSnapshot
+from app.models.sql_stat import SqlStat
 from app.config import settings
 
 # this is the Alembic Config object
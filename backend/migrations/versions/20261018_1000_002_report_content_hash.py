@@ -0,0 +1,28 @@
+"""Report content hash and parser version
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('awr_reports', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('awr_reports', sa.Column('parser_version', sa.String(length=20), nullable=True))
+    op.create_index(op.f('ix_awr_reports_content_hash'), 'awr_reports', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_awr_reports_content_hash'), table_name='awr_reports')
+    op.drop_column('awr_reports', 'parser_version')
+    op.drop_column('awr_reports', 'content_hash')
@@ -0,0 +1,24 @@
+"""Rule set version of report diagnostics
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('awr_reports', sa.Column('rules_version', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('awr_reports', 'rules_version')
@@ -0,0 +1,32 @@
+"""Rule set version of each diagnostic result
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('diagnostic_results', sa.Column('rules_version', sa.String(length=16), nullable=True))
+    op.create_index(op.f('ix_diagnostic_results_rules_version'), 'diagnostic_results', ['rules_version'], unique=False)
+
+    # Existing results came from the rule set recorded on their report
+    op.execute(
+        "UPDATE diagnostic_results SET rules_version = awr_reports.rules_version "
+        "FROM awr_reports WHERE awr_reports.id = diagnostic_results.report_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_diagnostic_results_rules_version'), table_name='diagnostic_results')
+    op.drop_column('diagnostic_results', 'rules_version')
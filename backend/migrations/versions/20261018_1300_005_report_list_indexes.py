@@ -0,0 +1,36 @@
+"""Indexes for report list pagination and db_name search
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pagination order of the report list
+    op.create_index(
+        'ix_awr_reports_upload_time_id', 'awr_reports',
+        [sa.text('upload_time DESC'), sa.text('id DESC')], unique=False
+    )
+
+    # Substring (ILIKE '%...%') search on db_name
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_awr_reports_db_name_trgm', 'awr_reports', ['db_name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'db_name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_awr_reports_db_name_trgm', table_name='awr_reports')
+    op.drop_index('ix_awr_reports_upload_time_id', table_name='awr_reports')
@@ -0,0 +1,44 @@
+"""Metric samples time series table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partitioned by month of snapshot_begin; partitions are created by
+    # app.core.timeseries.ensure_partitions() as reports are stored
+    op.create_table(
+        'metric_samples',
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.Column('db_name', sa.String(length=100), nullable=True),
+        sa.Column('instance_name', sa.String(length=100), nullable=True),
+        sa.Column('snapshot_begin', sa.DateTime(), nullable=False),
+        sa.Column('metric_key', sa.String(length=200), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['report_id'], ['awr_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('snapshot_begin', 'report_id', 'metric_key'),
+        postgresql_partition_by='RANGE (snapshot_begin)',
+    )
+    op.create_index(
+        'ix_metric_samples_series', 'metric_samples', ['db_name', 'metric_key', 'snapshot_begin'],
+        unique=False, postgresql_include=['instance_name', 'value']
+    )
+    op.create_index('ix_metric_samples_report_id', 'metric_samples', ['report_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_metric_samples_report_id', table_name='metric_samples')
+    op.drop_index('ix_metric_samples_series', table_name='metric_samples')
+    op.drop_table('metric_samples')
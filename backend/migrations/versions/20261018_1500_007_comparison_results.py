@@ -0,0 +1,45 @@
+"""Comparison results table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'comparison_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('baseline_report_id', sa.Integer(), nullable=False),
+        sa.Column('target_report_id', sa.Integer(), nullable=False),
+        sa.Column('baseline_report_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('pair_key', sa.String(length=64), nullable=False),
+        sa.Column('data_version', sa.String(length=64), nullable=False),
+        sa.Column('comparison_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['baseline_report_id'], ['awr_reports.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['target_report_id'], ['awr_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('pair_key'),
+    )
+    op.create_index(op.f('ix_comparison_results_id'), 'comparison_results', ['id'], unique=False)
+    op.create_index(op.f('ix_comparison_results_baseline_report_id'), 'comparison_results', ['baseline_report_id'], unique=False)
+    op.create_index(op.f('ix_comparison_results_target_report_id'), 'comparison_results', ['target_report_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_comparison_results_target_report_id'), table_name='comparison_results')
+    op.drop_index(op.f('ix_comparison_results_baseline_report_id'), table_name='comparison_results')
+    op.drop_index(op.f('ix_comparison_results_id'), table_name='comparison_results')
+    op.drop_table('comparison_results')
@@ -0,0 +1,56 @@
+"""Report instance identity and cluster snapshots
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by parser version 3; older reports get them when re-parsed
+    op.add_column('awr_reports', sa.Column('dbid', sa.BigInteger(), nullable=True))
+    op.add_column('awr_reports', sa.Column('instance_number', sa.Integer(), nullable=True))
+    op.add_column('awr_reports', sa.Column('begin_snap_id', sa.Integer(), nullable=True))
+    op.add_column('awr_reports', sa.Column('end_snap_id', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'cluster_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dbid', sa.BigInteger(), nullable=False),
+        sa.Column('db_name', sa.String(length=100), nullable=True),
+        sa.Column('begin_snap_id', sa.Integer(), nullable=False),
+        sa.Column('end_snap_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_begin', sa.DateTime(), nullable=True),
+        sa.Column('snapshot_end', sa.DateTime(), nullable=True),
+        sa.Column('instances', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('instance_count', sa.Integer(), nullable=False),
+        sa.Column('aggregates', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dbid', 'begin_snap_id', 'end_snap_id', name='uq_cluster_snapshots_range'),
+    )
+    op.create_index(op.f('ix_cluster_snapshots_id'), 'cluster_snapshots', ['id'], unique=False)
+    op.create_index(op.f('ix_cluster_snapshots_db_name'), 'cluster_snapshots', ['db_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_cluster_snapshots_db_name'), table_name='cluster_snapshots')
+    op.drop_index(op.f('ix_cluster_snapshots_id'), table_name='cluster_snapshots')
+    op.drop_table('cluster_snapshots')
+
+    op.drop_column('awr_reports', 'end_snap_id')
+    op.drop_column('awr_reports', 'begin_snap_id')
+    op.drop_column('awr_reports', 'instance_number')
+    op.drop_column('awr_reports', 'dbid')
@@ -0,0 +1,66 @@
+"""Per-report SQL statistics indexed by sql_id
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# Statistics columns of sql_stats, all nullable floats
+STAT_COLUMNS = (
+    'executions',
+    'elapsed_time_s',
+    'elapsed_time_per_exec_s',
+    'cpu_time_s',
+    'cpu_per_exec_s',
+    'user_io_time_s',
+    'uio_per_exec_s',
+    'cluster_wait_time_s',
+    'buffer_gets',
+    'gets_per_exec',
+    'physical_reads',
+    'reads_per_exec',
+    'rows_processed',
+    'rows_per_exec',
+    'parse_calls',
+    'version_count',
+    'sharable_mem_b',
+)
+
+
+def upgrade() -> None:
+    # Filled by parser version 5; older reports get their rows when re-parsed
+    op.create_table(
+        'sql_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.Column('sql_id', sa.String(length=20), nullable=False),
+        sa.Column('db_name', sa.String(length=100), nullable=True),
+        sa.Column('instance_name', sa.String(length=100), nullable=True),
+        sa.Column('snapshot_begin', sa.DateTime(), nullable=True),
+        sa.Column('sql_module', sa.String(length=100), nullable=True),
+        sa.Column('sql_text', sa.Text(), nullable=True),
+        sa.Column('ranks', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('best_rank', sa.Integer(), nullable=False),
+        sa.Column('pct_total', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        *(sa.Column(column, sa.Float(), nullable=True) for column in STAT_COLUMNS),
+        sa.ForeignKeyConstraint(['report_id'], ['awr_reports.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('report_id', 'sql_id', name='uq_sql_stats_report_sql'),
+    )
+    op.create_index('ix_sql_stats_sql_id', 'sql_stats', ['sql_id', 'snapshot_begin'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sql_stats_sql_id', table_name='sql_stats')
+    op.drop_table('sql_stats')
@@ -0,0 +1,28 @@
+"""RAC flag of reports, no cluster snapshots for single-instance databases
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by parser version 6; older reports get it when re-parsed
+    op.add_column('awr_reports', sa.Column('rac', sa.Boolean(), nullable=True))
+    # Snapshots of one instance were mostly single-instance databases; RAC
+    # instances are merged again when their reports are re-parsed
+    op.execute("DELETE FROM cluster_snapshots WHERE instance_count = 1")
+
+
+def downgrade() -> None:
+    op.drop_column('awr_reports', 'rac')
@@ -0,0 +1,291 @@
+"""Test the Report API against a SQLite Database"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.cached_response import accepts_gzip, etag_matches
+from app.config import settings
+from app.core import response_cache
+from app.core.response_cache import ResponseCache, get_response_cache
+from app.core.ingest import METRIC_CATEGORIES, metric_records, report_metadata
+from app.core.metric_query import parse_projection
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.parser.base import PARSER_VERSION
+from app.core.parser.factory import AWRParserFactory
+from app.models import AWRReport, PerformanceMetric, ReportStatus
+
+AWRRPT_DIR = Path(__file__).parent.parent / "awrrpt"
+
+REPORT = "19c/awrrpt_1_17676_17677.html"
+
+
+@lru_cache(maxsize=None)
+def parsed_report(relative_path):
+    return AWRParserFactory.create_file_parser(str(AWRRPT_DIR / relative_path)).parse()
+
+
+def add_report(db, relative_path=REPORT, **values):
+    """Store a corpus report as parsed, with its metadata and metrics"""
+    parsed = parsed_report(relative_path)
+    report = AWRReport(**{
+        'filename': Path(relative_path).name,
+        'file_path': str(AWRRPT_DIR / relative_path),
+        'status': ReportStatus.PARSED,
+        'parser_version': PARSER_VERSION,
+        **report_metadata(parsed),
+        **values,
+    })
+    db.add(report)
+    db.flush()
+    db.add_all(PerformanceMetric(report_id=report.id, **record) for record in metric_records(parsed))
+    db.commit()
+    return report
+
+
+@pytest.fixture
+def unreachable_cache(monkeypatch):
+    """Response cache pointing at a Redis that refuses connections"""
+    monkeypatch.setattr(settings, 'CACHE_TTL', 60)
+    monkeypatch.setattr(settings, 'REDIS_URL', "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(response_cache, '_response_cache', None)
+    return get_response_cache()
+
+
+def test_cache_key_versions():
+    """A report's cache keys change with its data version"""
+    version = datetime(2026, 10, 18, 12, 0, 0, 1)
+    key = ResponseCache.key(7, version, "metrics:load_profile")
+
+    assert key == ResponseCache.key(7, version, "metrics:load_profile")
+    assert key != ResponseCache.key(7, version + timedelta(microseconds=1), "metrics:load_profile")
+    assert key != ResponseCache.key(8, version, "metrics:load_profile")
+    assert key != ResponseCache.key(7, version, "metrics:wait_events")
+
+
+def test_cache_disabled(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, 'CACHE_TTL', 0)
+    assert get_response_cache() is None
+    assert TestClient(app).get("/health/cache").json() == {"enabled": False, "ttl": 0, "endpoints": {}}
+
+
+def test_cache_unavailable(db, session_factory, unreachable_cache):
+    """Without Redis, responses are served from the database and the cache is bypassed"""
+    report = add_report(db)
+    client = TestClient(app)
+
+    response = client.get(f"/api/v1/reports/{report.id}/metrics/load_profile")
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "MISS"
+    assert response.json()["data"]["db_time_s"] == parsed_report(REPORT)['load_profile']['DB Time(s):']
+
+    # The failed round trip switches the cache off for a while
+    assert unreachable_cache.client is None
+    assert unreachable_cache.get(ResponseCache.key(report.id, report.updated_at, "x"), "metrics") is None
+    unreachable_cache.invalidate([report.id])
+
+    assert client.get(f"/api/v1/reports/{report.id}/diagnostics").status_code == 200
+    assert client.get("/health/cache").json()["endpoints"] == {}
+
+
+class _Headers:
+    """Request stand-in carrying only headers"""
+
+    def __init__(self, **headers):
+        self.headers = {name.replace('_', '-'): value for name, value in headers.items()}
+
+
+def test_accepts_gzip():
+    assert accepts_gzip(_Headers(accept_encoding="gzip, deflate, br"))
+    assert accepts_gzip(_Headers(accept_encoding="br;q=1.0, gzip;q=0.5"))
+    assert accepts_gzip(_Headers(accept_encoding="*"))
+    assert not accepts_gzip(_Headers(accept_encoding="gzip;q=0"))
+    assert not accepts_gzip(_Headers(accept_encoding="identity"))
+    assert not accepts_gzip(_Headers())
+
+
+def test_etag_matches():
+    etag = '"7-20261018120000000000-metrics-load_profile-gzip"'
+    assert etag_matches(_Headers(if_none_match=etag), etag)
+    # The identity and gzip representations revalidate each other
+    assert etag_matches(_Headers(if_none_match='"7-20261018120000000000-metrics-load_profile"'), etag)
+    assert etag_matches(_Headers(if_none_match=f'"other", W/{etag}'), etag)
+    assert etag_matches(_Headers(if_none_match="*"), etag)
+    assert not etag_matches(_Headers(if_none_match='"7-20261018120000000000-metrics-wait_events"'), etag)
+    assert not etag_matches(_Headers(), etag)
+
+
+def test_conditional_and_compressed_metrics(client, db):
+    """Metric responses carry an ETag, answer 304 to it and come gzip-encoded when accepted"""
+    report = add_report(db)
+    url = f"/api/v1/reports/{report.id}/metrics/wait_events"
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    etag = plain.headers["etag"]
+
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] != etag
+    assert compressed.json() == plain.json()
+
+    for candidate in (etag, compressed.headers["etag"]):
+        not_modified = client.get(url, headers={"If-None-Match": candidate})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+    # Parsing or analysis again changes the data version
+    report.updated_at = report.updated_at + timedelta(seconds=1)
+    db.commit()
+    changed = client.get(url, headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_unparsed_report_not_cached(client, db):
+    """Reports that are not parsed yet get no ETag"""
+    report = add_report(db, status=ReportStatus.PARSING)
+
+    response = client.get(f"/api/v1/reports/{report.id}/metrics/load_profile")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def test_gzip_report_list(client, db):
+    """Other JSON responses are compressed by the middleware above the minimum size"""
+    for _ in range(30):
+        add_report(db)
+
+    response = client.get("/api/v1/reports?size=30", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["items"]) == 30
+
+
+def test_parse_projection():
+    assert list(parse_projection(None, None)) == list(METRIC_CATEGORIES)
+    assert parse_projection(['wait_events', 'load_profile'], None) == {'load_profile': None, 'wait_events': None}
+    # Fields name their categories, repeated paths are kept once
+    assert parse_projection(None, ['top_sql.abcd1234', 'load_profile.db_time_s.per_second', 'top_sql.abcd1234']) == {
+        'load_profile': [('db_time_s', 'per_second')],
+        'top_sql': [('abcd1234',)],
+    }
+    assert parse_projection(['derived'], ['top_sql.abcd1234']) == {'top_sql': [('abcd1234',)], 'derived': None}
+
+    for categories, fields in ((['sessions'], None), (None, ['sessions.count']), (None, ['top_sql'])):
+        with pytest.raises(ValueError):
+            parse_projection(categories, fields)
+
+
+def test_bulk_metrics(client, db):
+    """Several categories of a report in one response"""
+    report = add_report(db)
+    expected = {record['metric_category']: record['metric_data'] for record in metric_records(parsed_report(REPORT))}
+
+    response = client.get(f"/api/v1/reports/{report.id}/metrics", params={"categories": "wait_events,load_profile"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "report_id": report.id,
+        "metrics": {"load_profile": expected["load_profile"], "wait_events": expected["wait_events"]},
+    }
+
+    everything = client.get(f"/api/v1/reports/{report.id}/metrics").json()["metrics"]
+    assert list(everything) == [category for category in METRIC_CATEGORIES if category in expected]
+
+    assert client.get(f"/api/v1/reports/{report.id}/metrics", params={"categories": "sessions"}).status_code == 400
+    assert client.get("/api/v1/reports/999/metrics").status_code == 404
+
+
+def test_projected_metrics(client, db):
+    """Fields project their categories to the selected paths, missing paths are left out"""
+    report = add_report(db)
+    expected = {record['metric_category']: record['metric_data'] for record in metric_records(parsed_report(REPORT))}
+    sql_id = next(iter(expected["top_sql"]))
+
+    fields = [
+        "load_profile.db_time_s.per_second",
+        "load_profile.redo_size_bytes",
+        f"top_sql.{sql_id}.elapsed_time_s",
+        "top_sql.unknown0.elapsed_time_s",
+        f"top_sql.{sql_id}.elapsed_time_s.per_exec",
+    ]
+    response = client.get(
+        f"/api/v1/reports/{report.id}/metrics",
+        params={"categories": "wait_events", "fields": ",".join(fields)},
+    )
+    assert response.status_code == 200
+    assert response.json()["metrics"] == {
+        "load_profile": {
+            "db_time_s": {"per_second": expected["load_profile"]["db_time_s"]["per_second"]},
+            "redo_size_bytes": expected["load_profile"]["redo_size_bytes"],
+        },
+        "wait_events": expected["wait_events"],
+        "top_sql": {sql_id: {"elapsed_time_s": expected["top_sql"][sql_id]["elapsed_time_s"]}},
+    }
+
+    # Fields alone select only their own categories, in any order
+    reordered = client.get(f"/api/v1/reports/{report.id}/metrics", params={"fields": ",".join(reversed(fields))})
+    assert reordered.json()["metrics"]["top_sql"] == response.json()["metrics"]["top_sql"]
+    assert "wait_events" not in reordered.json()["metrics"]
+
+
+def test_cursor_round_trip():
+    upload_time = datetime(2026, 10, 18, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(upload_time, 42)) == (upload_time, 42)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+    for cursor in ("", "not-a-cursor", encode_cursor(upload_time, 42)[:-3]):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_report_list_pages(client, db):
+    """Following next_cursor visits the same reports as the numbered pages, newest first"""
+    start = datetime(2026, 10, 1)
+    for n in range(23):
+        # Pairs of reports share an upload time, ties are broken by id
+        add_report(db, upload_time=start + timedelta(hours=n // 2), db_name="PROD_DB" if n % 3 else "TEST%DB")
+
+    expected = [report.id for report in db.query(AWRReport).order_by(AWRReport.upload_time.desc(), AWRReport.id.desc())]
+
+    by_page = []
+    for page in range(1, 4):
+        by_page += [item["id"] for item in client.get("/api/v1/reports", params={"page": page, "size": 10}).json()["items"]]
+    assert by_page == expected
+
+    by_cursor, cursor = [], None
+    while True:
+        params = {"size": 10, "count": "none", **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/reports", params=params).json()
+        assert body["total"] is None
+        by_cursor += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert by_cursor == expected
+
+    # Estimates need PostgreSQL, other databases count exactly
+    body = client.get("/api/v1/reports", params={"count": "estimated"}).json()
+    assert (body["total"], body["total_estimated"]) == (23, False)
+
+    assert client.get("/api/v1/reports", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_report_list_db_name_search(client, db):
+    """db_name is a case-insensitive substring search with LIKE wildcards escaped"""
+    add_report(db, db_name="PROD_DB")
+    add_report(db, db_name="PRODXDB")
+    add_report(db, db_name="TEST%DB")
+
+    def names(search):
+        body = client.get("/api/v1/reports", params={"db_name": search}).json()
+        return sorted(item["db_name"] for item in body["items"])
+
+    assert names("prod") == ["PRODXDB", "PROD_DB"]
+    assert names("d_d") == ["PROD_DB"]
+    assert names("%") == ["TEST%DB"]
@@ -0,0 +1,144 @@
+"""Test RAC Cluster Aggregates"""
+
+from app.core.cluster import aggregate_instances, instance_contribution, merge_report, remove_report
+from app.core.ingest import metric_records, report_metadata
+from app.models import AWRReport, ClusterSnapshot
+from test_api import add_report, parsed_report
+
+RAC_REPORT = "19c rac/awrrpt_1_18175_18176.html"
+SINGLE_INSTANCE_REPORT = "19c/awrrpt_1_17676_17677.html"
+
+
+def contribution(report_id, instance_name, db_time, transactions, event, statement):
+    return {
+        'report_id': report_id,
+        'instance_name': instance_name,
+        'host_name': f"{instance_name}-host",
+        'load_profile': {'db_time_s': db_time, 'transactions': transactions},
+        'wait_events': {'log_file_sync': {'name': "log file sync", **event}},
+        'top_sql': {'abcd1234': statement},
+    }
+
+
+def test_aggregate_instances():
+    """Rates and totals are summed, averages weighted and per-exec values recomputed"""
+    instances = {
+        '1': contribution(
+            1, "prod1", 30, 10,
+            {'waits': 100, 'time_waited': 50, 'avg_wait': 0.5, 'pct_db_time': 20},
+            {'executions': 10, 'elapsed_time_s': 20, 'buffer_gets': 1000, 'sql_text': "select 1"},
+        ),
+        '2': contribution(
+            2, "prod2", 10, 30,
+            {'waits': 300, 'time_waited': 30, 'avg_wait': 0.1, 'pct_db_time': 40},
+            {'executions': 30, 'elapsed_time_s': 20},
+        ),
+    }
+
+    aggregates = aggregate_instances(instances)
+
+    assert aggregates['load_profile'] == {
+        'db_time_s': {'per_second': 40, 'per_txn': 1.0},
+        'transactions': {'per_second': 40, 'per_txn': 1.0},
+    }
+    assert aggregates['wait_events']['log_file_sync'] == {
+        'name': "log file sync",
+        'waits': 400,
+        'time_waited': 80,
+        'avg_wait': 0.2,
+        # Weighted by DB time: (20 * 30 + 40 * 10) / 40
+        'pct_db_time': 25.0,
+        'instances': ['1', '2'],
+    }
+
+    statement = aggregates['top_sql']['abcd1234']
+    assert (statement['executions'], statement['elapsed_time_s'], statement['buffer_gets']) == (40, 40, 1000)
+    assert statement['elapsed_time_per_exec_s'] == 1.0
+    assert statement['gets_per_exec'] == 25.0
+    assert statement['sql_text'] == "select 1"
+
+    skew = aggregates['skew']
+    assert skew['db_time_share'] == {'1': 75.0, '2': 25.0}
+    assert skew['load_profile']['db_time_s'] == {'values': {'1': 30, '2': 10}, 'max_instance': '1', 'ratio': 1.5}
+    assert skew['wait_events']['log_file_sync']['max_instance'] == '1'
+
+    # A single instance has no skew
+    single = aggregate_instances({'1': instances['1']})
+    assert single['skew'] == {'load_profile': {}, 'wait_events': {}, 'db_time_share': {'1': 100.0}}
+
+
+def test_instance_contribution():
+    """The contribution of a report keeps per-second rates, wait statistics and additive SQL statistics"""
+    parsed = parsed_report(RAC_REPORT)
+    records = metric_records(parsed)
+    metrics = {record['metric_category']: record['metric_data'] for record in records}
+
+    result = instance_contribution(5, report_metadata(parsed), records)
+
+    assert (result['report_id'], result['instance_name']) == (5, "xydb1")
+    assert result['load_profile']['db_time_s'] == metrics['load_profile']['db_time_s']['per_second']
+    assert result['wait_events'].keys() == metrics['wait_events'].keys()
+    assert result['top_sql'].keys() == metrics['top_sql'].keys()
+    for statement in result['top_sql'].values():
+        assert 'rank' not in statement and 'elapsed_time_per_exec_s' not in statement
+
+
+def merge(db, report, instance_number, instance_name):
+    """Merge a stored corpus report as the given instance"""
+    parsed = parsed_report(RAC_REPORT)
+    metadata = {**report_metadata(parsed), 'instance_number': instance_number, 'instance_name': instance_name}
+    cluster = merge_report(db, report.id, metadata, metric_records(parsed))
+    db.commit()
+    return cluster
+
+
+def test_merge_and_remove(client, db, tmp_path):
+    """Instances are merged by snap range, re-uploads replace an instance and removal hands over to duplicates"""
+    first = add_report(db, RAC_REPORT)
+    second = add_report(db, RAC_REPORT, instance_number=2, instance_name="xydb2")
+    merge(db, first, 1, "xydb1")
+    cluster = merge(db, second, 2, "xydb2")
+
+    assert cluster.instance_count == 2
+    assert (cluster.dbid, cluster.begin_snap_id, cluster.end_snap_id) == (2028335103, 18175, 18176)
+    single_db_time = cluster.instances['1']['load_profile']['db_time_s']
+    assert cluster.aggregates['load_profile']['db_time_s']['per_second'] == round(2 * single_db_time, 6)
+
+    # A re-upload of instance 1 replaces its contribution
+    reupload = add_report(db, RAC_REPORT, file_path=str(tmp_path / "reupload.html"))
+    cluster = merge(db, reupload, 1, "xydb1")
+    assert cluster.instance_count == 2
+    assert cluster.instances['1']['report_id'] == reupload.id
+    assert db.query(ClusterSnapshot).count() == 1
+
+    # Deleting the re-upload keeps the instance, now backed by the original report
+    assert client.delete(f"/api/v1/reports/{reupload.id}").status_code == 204
+    db.expire_all()
+    cluster = db.query(ClusterSnapshot).one()
+    assert cluster.instance_count == 2
+    assert cluster.instances['1']['report_id'] == first.id
+
+    cluster = remove_report(db, second)
+    db.commit()
+    assert cluster.instance_count == 1
+    assert cluster.aggregates == aggregate_instances({'1': cluster.instances['1']})
+
+    # Reports that were not merged are left alone
+    assert remove_report(db, second) is None
+
+    assert remove_report(db, first) is None
+    db.commit()
+    assert db.query(ClusterSnapshot).count() == 0
+
+
+def test_single_instance_not_merged(db):
+    """Reports of single-instance databases get no cluster snapshot"""
+    parsed = parsed_report(SINGLE_INSTANCE_REPORT)
+    report = add_report(db, SINGLE_INSTANCE_REPORT)
+    assert report.rac is False
+
+    assert merge_report(db, report.id, report_metadata(parsed), metric_records(parsed)) is None
+    assert merge_report(db, report.id, {**report_metadata(parsed), 'rac': True, 'dbid': None}, []) is None
+    assert remove_report(db, report) is None
+    assert db.query(ClusterSnapshot).count() == 0
+    assert db.query(AWRReport).count() == 1
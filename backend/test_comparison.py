@@ -0,0 +1,129 @@
+"""Test Report Comparison"""
+
+from datetime import datetime, timedelta
+
+from app.core.comparison.comparator import baseline_window, compare_metrics, compare_values
+from app.models import ComparisonResult, ReportStatus
+from test_api import add_report
+
+BASELINE = "11g/awrrpt_1_36006_36007.html"
+TARGET = "11g/awrrpt_1_36008_36009.html"
+
+
+def test_compare_values():
+    assert compare_values(100.0, 150.0) == {
+        'baseline': 100.0, 'target': 150.0, 'diff_abs': 50.0, 'diff_pct': 50.0, 'trend': 'up',
+    }
+    assert compare_values(-100.0, -150.0)['diff_pct'] == -50.0
+    assert compare_values(100.0, 104.0)['trend'] == 'flat'
+    assert compare_values(100.0, 90.0)['trend'] == 'down'
+    assert compare_values(0.0, 5.0) == {'baseline': 0.0, 'target': 5.0, 'diff_abs': 5.0, 'diff_pct': None, 'trend': 'up'}
+    assert compare_values(None, 5.0)['trend'] == 'new'
+    assert compare_values(5.0, None)['trend'] == 'gone'
+
+
+def test_compare_metrics():
+    """Baselines are averaged per key; ranks are skipped and movers ordered by relative change"""
+    target = {
+        'load_profile': {'db_time_s': {'per_second': 30}, 'redo_size_bytes': {'per_second': 1000}},
+        'top_sql': {'abcd1234': {'elapsed_time_s': 5, 'rank': {'elapsed_time': 1}}},
+        'sessions': {'count': 100},
+    }
+    baselines = [
+        {
+            'load_profile': {
+                'db_time_s': {'per_second': 10}, 'redo_size_bytes': {'per_second': 990}, 'logons': {'per_second': 2},
+            },
+        },
+        {'load_profile': {'db_time_s': {'per_second': 20}, 'redo_size_bytes': {'per_second': 1010}}},
+    ]
+
+    result = compare_metrics(target, baselines)
+
+    load_profile = result['categories']['load_profile']
+    assert load_profile['db_time_s.per_second'] == {
+        'baseline': 15.0, 'target': 30.0, 'diff_abs': 15.0, 'diff_pct': 100.0, 'trend': 'up',
+        'baseline_min': 10.0, 'baseline_max': 20.0, 'baseline_count': 2,
+    }
+    assert load_profile['logons.per_second']['trend'] == 'gone'
+    assert load_profile['logons.per_second']['baseline_count'] == 1
+    assert result['categories']['top_sql'] == {'abcd1234.elapsed_time_s': compare_values(None, 5.0)}
+    assert 'sessions' not in result['categories']
+
+    # Flat, new and gone metrics are not movers
+    assert [mover['key'] for mover in result['movers']['load_profile']] == ['db_time_s.per_second']
+    assert result['movers']['top_sql'] == []
+
+    single = compare_metrics(target, baselines[:1])['categories']['load_profile']['db_time_s.per_second']
+    assert 'baseline_count' not in single
+
+
+def test_baseline_window(db):
+    """Parsed reports of the same instance before the target, newest first"""
+    start = datetime(2026, 10, 1)
+    target = add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=10))
+    earlier = [add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=hour)) for hour in range(5)]
+    add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=11))
+    add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=6), status=ReportStatus.FAILED)
+    add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=7), instance_name="other")
+
+    assert [report.id for report in baseline_window(db, target, 3)] == [report.id for report in earlier[:-4:-1]]
+    assert len(baseline_window(db, target, 10)) == 5
+    assert baseline_window(db, add_report(db, BASELINE, snapshot_begin=None), 3) == []
+
+
+def test_comparison_reuse(client, db):
+    """A comparison is stored once and recomputed when a compared report is parsed again"""
+    baseline = add_report(db, BASELINE)
+    target = add_report(db, TARGET)
+    request = {"target_id": target.id, "baseline_id": baseline.id}
+
+    created = client.post("/api/v1/comparisons", json=request)
+    assert created.status_code == 200
+    assert created.headers["x-cache"] == "MISS"
+    body = created.json()
+    assert body["baseline_ids"] == [baseline.id]
+    assert body["comparison"]["load_profile"]
+
+    # Analysis runs change updated_at but not the parsed data
+    target.updated_at = target.updated_at + timedelta(minutes=1)
+    db.commit()
+    reused = client.post("/api/v1/comparisons", json=request)
+    assert reused.headers["x-cache"] == "HIT"
+    assert reused.json() == body
+
+    target.parser_version = "0"
+    db.commit()
+    recomputed = client.post("/api/v1/comparisons", json=request)
+    assert recomputed.headers["x-cache"] == "MISS"
+    assert recomputed.json()["id"] == body["id"]
+    assert db.query(ComparisonResult).count() == 1
+
+    assert client.get(f"/api/v1/comparisons/{body['id']}").json()["comparison"] == body["comparison"]
+    assert client.get("/api/v1/comparisons/999").status_code == 404
+
+
+def test_comparison_baselines(client, db):
+    start = datetime(2026, 10, 1)
+    baselines = [add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=hour)) for hour in range(3)]
+    target = add_report(db, BASELINE, snapshot_begin=start + timedelta(hours=3))
+    unparsed = add_report(db, BASELINE, status=ReportStatus.PARSING)
+
+    window = client.post("/api/v1/comparisons", json={"target_id": target.id, "baseline_window": 2}).json()
+    assert window["baseline_ids"] == [baselines[2].id, baselines[1].id]
+    assert window["baseline_id"] == baselines[2].id
+
+    # Duplicate ids count once, the same set in another order is the same comparison
+    baseline_ids = [baselines[1].id, baselines[2].id, baselines[1].id]
+    several = client.post("/api/v1/comparisons", json={"target_id": target.id, "baseline_ids": baseline_ids})
+    assert several.headers["x-cache"] == "HIT"
+    assert several.json()["id"] == window["id"]
+
+    def status(request):
+        return client.post("/api/v1/comparisons", json=request).status_code
+
+    assert status({"target_id": target.id, "baseline_id": 999}) == 404
+    assert status({"target_id": target.id, "baseline_id": unparsed.id}) == 400
+    assert status({"target_id": target.id, "baseline_ids": [target.id]}) == 400
+    assert status({"target_id": baselines[0].id, "baseline_window": 2}) == 404
+    assert status({"target_id": target.id, "baseline_id": baselines[0].id, "baseline_window": 2}) == 422
@@ -0,0 +1,139 @@
+"""Test the Bulk Ingestion CLI"""
+
+import shutil
+import hashlib
+import tarfile
+from pathlib import Path
+
+from app.cli import ingest
+from app.config import settings
+from app.core.parser.base import PARSER_VERSION
+from app.models import AWRReport, PerformanceMetric, ReportStatus
+
+AWRRPT_DIR = Path(__file__).parent.parent / "awrrpt"
+
+REPORTS = [
+    AWRRPT_DIR / "11g" / "awrrpt_1_36006_36007.html",
+    AWRRPT_DIR / "11g" / "awrrpt_1_36008_36009.html",
+    AWRRPT_DIR / "19c" / "awrrpt_1_17676_17677.html",
+]
+
+
+def test_ingest_resume(db, tmp_path, monkeypatch):
+    """A second run only ingests the reports the first one did not record"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+    source_dir = tmp_path / "awrrpt"
+    source_dir.mkdir()
+    for report in REPORTS[:2]:
+        shutil.copy(report, source_dir)
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=1)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (2, 0, 0)
+
+    # New report, and a different compression than the stored copies
+    shutil.copy(REPORTS[2], source_dir)
+    monkeypatch.setattr(settings, 'UPLOAD_COMPRESSION', 'none')
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=10)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (1, 0, 2)
+
+    reports = {report.filename: report for report in db.query(AWRReport)}
+    assert sorted(reports) == sorted(report.name for report in REPORTS)
+
+    for source in REPORTS:
+        report = reports[source.name]
+        assert report.status == ReportStatus.PARSED
+        assert report.parser_version == PARSER_VERSION
+        assert report.content_hash == hashlib.sha256(source.read_bytes()).hexdigest()
+        assert report.file_size == source.stat().st_size
+        assert report.dbid and report.begin_snap_id and report.snapshot_begin
+        assert db.query(PerformanceMetric).filter_by(report_id=report.id).count() > 0
+
+    assert reports[REPORTS[0].name].file_path.endswith('.html.zst')
+    assert reports[REPORTS[2].name].file_path.endswith('.html')
+
+
+def test_ingest_tarball(db, tmp_path, monkeypatch):
+    """Reports inside a tarball are ingested once"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+    archive = tmp_path / "awrrpt.tar.gz"
+    with tarfile.open(archive, 'w:gz') as tar:
+        for report in REPORTS[:2]:
+            tar.add(report, arcname=f"reports/{report.name}")
+
+    assert ingest.ingest(str(archive), workers=1, batch_size=10)['ingested'] == 2
+    assert ingest.ingest(str(archive), workers=1, batch_size=10)['skipped'] == 2
+    assert db.query(AWRReport).count() == 2
+
+
+def test_ingest_dry_run(db, tmp_path, monkeypatch):
+    """A dry run parses without writing reports or rows"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+
+    stats = ingest.ingest(str(REPORTS[0].parent), workers=1, batch_size=10, dry_run=True)
+
+    assert stats['ingested'] == len(list(REPORTS[0].parent.glob("*.html")))
+    assert db.query(AWRReport).count() == 0
+    assert not (tmp_path / "uploads").exists()
+
+
+def test_ingest_retries_failed(db, tmp_path, monkeypatch):
+    """Reports that failed are parsed again by the next run, replacing their failed row"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+    source_dir = tmp_path / "awrrpt"
+    source_dir.mkdir()
+    shutil.copy(REPORTS[0], source_dir)
+    broken = source_dir / REPORTS[1].name
+    broken.write_text("")  # fails to parse
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=10)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (1, 1, 0)
+    failed = db.query(AWRReport).filter_by(status=ReportStatus.FAILED).one()
+    assert failed.error_message and failed.parser_version is None
+    failed_path = Path(failed.file_path)
+    assert failed_path.exists()
+
+    # Fixed at the source, and stored with another compression this time
+    shutil.copy(REPORTS[1], broken)
+    monkeypatch.setattr(settings, 'UPLOAD_COMPRESSION', 'none')
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=10)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (1, 0, 1)
+
+    db.expire_all()
+    reports = db.query(AWRReport).all()
+    assert len(reports) == 2
+    assert all(report.status == ReportStatus.PARSED for report in reports)
+    assert not failed_path.exists()
+
+
+def test_ingest_metadata_only(db, tmp_path, monkeypatch):
+    """A metadata-only run lists the reports without metrics; a full run parses them afterwards"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+    source_dir = tmp_path / "awrrpt"
+    source_dir.mkdir()
+    for report in REPORTS:
+        shutil.copy(report, source_dir)
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=2, metadata_only=True)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (3, 0, 0)
+    assert ingest.ingest(str(source_dir), workers=1, batch_size=2, metadata_only=True)['skipped'] == 3
+
+    listed = {}
+    for report in db.query(AWRReport):
+        assert report.status == ReportStatus.PENDING and report.parser_version is None
+        assert report.db_name and report.instance_name and report.snapshot_begin and report.begin_snap_id
+        listed[report.filename] = (report.db_name, report.snapshot_begin)
+    assert len(listed) == 3
+    assert db.query(PerformanceMetric).count() == 0
+
+    stats = ingest.ingest(str(source_dir), workers=1, batch_size=2)
+    assert (stats['ingested'], stats['failed'], stats['skipped']) == (3, 0, 0)
+
+    db.expire_all()
+    parsed = {report.filename: report for report in db.query(AWRReport)}
+    assert len(parsed) == 3
+    for filename, report in parsed.items():
+        assert report.status == ReportStatus.PARSED
+        assert (report.db_name, report.snapshot_begin) == listed[filename]
+        assert db.query(PerformanceMetric).filter_by(report_id=report.id).count() > 0
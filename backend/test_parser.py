@@ -3,6 +3,7 @@
 import os
 import sys
 import json
+from functools import lru_cache
 from pathlib import Path
 
 # Set UTF-8 encoding for Windows
@@ -15,6 +16,10 @@ if sys.platform == 'win32':
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.core.parser.factory import AWRParserFactory
+from app.core.parser.columns import Column, TableSchema, WaitEventRecord
+from app.core.normalizer import metric_key, normalize_metrics
+from app.core.parser.utils import parse_value, parse_values, parse_value_array
+from app.core.parser.version_detector import HEADER_SCAN_CHARS, detect_oracle_version
 
 
 def test_parser(html_file_path):
@@ -98,6 +103,251 @@ def test_parser(html_file_path):
     return True
 
 
+def test_selective_and_lazy_parse(monkeypatch):
+    """Selective and lazy parses equal the matching slice of a full parse and never parse other sections"""
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+    metadata_sections = ['instance_info', 'snapshot_info']
+
+    for html_file in sorted(awrrpt_dir.rglob("*.html")):
+        with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            html_content = f.read()
+
+        expected = AWRParserFactory.create_parser(html_content).parse()
+        expected_metadata = {section: expected[section] for section in metadata_sections}
+
+        # Parsing any other section fails the test
+        parser = AWRParserFactory.create_parser(html_content)
+        for section in set(parser.SECTIONS) - set(metadata_sections):
+            def untouched(self, section=section):
+                raise AssertionError(f"{section} parsed")
+            monkeypatch.setattr(type(parser), f"_parse_{section}", untouched)
+
+        assert parser.parse(sections=['snapshot_info', 'instance_info']) == expected_metadata
+        assert list(parser.data) == metadata_sections
+
+        parser = AWRParserFactory.create_parser(html_content)
+        result = parser.parse(sections=metadata_sections, lazy=True)
+        assert list(result) == metadata_sections
+        assert not parser.data
+
+        assert result['snapshot_info'] == expected['snapshot_info']
+        assert list(parser.data) == ['snapshot_info']
+        assert result.get('load_profile') is None
+        assert 'load_profile' not in result
+        assert result.to_dict() == expected_metadata
+
+        monkeypatch.undo()
+        print(f"✓ Selective and lazy parses match the full parse: {html_file.name}")
+
+    parser = AWRParserFactory.create_parser(html_content)
+    try:
+        parser.parse(sections=['instance_info', 'sessions'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown section accepted")
+    assert parser.parse(lazy=True).to_dict() == parser.parse() == expected
+
+
+def test_detect_version():
+    """Every report of the corpus gets the version of its directory from the header alone"""
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+    expected = {
+        '11g': "11.2.0",
+        '11g rac': "11.2.0",
+        '12c rac': "12.2.0",
+        '19c': "19.0.0",
+        '19c rac': "19.0.0",
+    }
+
+    directories = sorted(path.name for path in awrrpt_dir.iterdir() if path.is_dir())
+    assert directories == sorted(expected)
+
+    for html_file in sorted(awrrpt_dir.rglob("*.html")):
+        with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            html_content = f.read()
+
+        version = expected[html_file.parent.name]
+        assert detect_oracle_version(html_content) == version, html_file.name
+        assert detect_oracle_version(html_content[:HEADER_SCAN_CHARS]) == version, html_file.name
+        print(f"✓ Oracle {version} detected: {html_file.name}")
+
+
+def test_backends_match():
+    """The bs4 and lxml documents parse every report to the same result"""
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+
+    for html_file in sorted(awrrpt_dir.rglob("*.html")):
+        with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            html_content = f.read()
+
+        soup_result = AWRParserFactory.create_parser(html_content, backend="bs4").parse()
+        lxml_result = AWRParserFactory.create_parser(html_content, backend="lxml").parse()
+
+        assert soup_result == lxml_result, html_file.name
+        print(f"✓ bs4 and lxml results match: {html_file.name}")
+
+
+def test_streaming_parse(monkeypatch):
+    """The streaming document parses to the same result as lxml when tables are cut between rows"""
+    from app.core.parser import document
+
+    # Small fragments cut every larger table between rows, small chunks split tags
+    monkeypatch.setattr(document, "STREAM_FRAGMENT_SIZE", 2048)
+    monkeypatch.setattr(document, "STREAM_CHUNK_SIZE", 4096)
+
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+
+    for html_file in sorted(awrrpt_dir.rglob("*.html")):
+        streamed = AWRParserFactory.create_streaming_parser(str(html_file)).parse()
+        expected = AWRParserFactory.create_file_parser(str(html_file), backend="lxml").parse()
+
+        assert streamed == expected, html_file.name
+        print(f"✓ Streaming parse matches lxml: {html_file.name}")
+
+
+def test_normalized_metrics():
+    """Normalized metrics are keyed dictionaries all the way down"""
+    assert metric_key("Physical read (blocks):") == "physical_read_blocks"
+    assert metric_key("SQL*Net message from client") == "sql_net_message_from_client"
+    assert metric_key("%Total") == "pct_total"
+
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+    html_file = sorted(awrrpt_dir.rglob("*.html"))[0]
+
+    with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+        parsed = AWRParserFactory.create_parser(f.read()).parse()
+    metrics = normalize_metrics(parsed)
+
+    def assert_no_lists(value, path):
+        assert not isinstance(value, list), f"list at {path}"
+        if isinstance(value, dict):
+            for key, item in value.items():
+                assert_no_lists(item, f"{path}.{key}")
+
+    for section in ('load_profile', 'wait_events', 'top_sql', 'derived'):
+        assert_no_lists(metrics[section], section)
+
+    assert metrics['load_profile']['physical_read_blocks'] == parsed['load_profile']['Physical read (blocks):']
+
+    for ordering, sql_list in parsed['top_sql'].items():
+        for rank, row in enumerate(sql_list, 1):
+            assert metrics['top_sql'][row.sql_id]['rank'][ordering] <= rank
+
+    for sql_id, text in parsed['sql_text'].items():
+        if sql_id in metrics['top_sql']:
+            assert metrics['top_sql'][sql_id]['sql_text'] == text
+
+    events = parsed['wait_events']['events']
+    assert events and all(event.pct_db_time is not None for event in events)
+    assert metrics['wait_events'][metric_key(events[0].name)]['pct_db_time'] == events[0].pct_db_time
+
+    assert 'hard_parse_ratio' in metrics['derived']
+    print(f"✓ Normalized metrics: {html_file.name}")
+
+
+def test_table_schema():
+    """Columns are found under any of their headers, in any order, and converted by kind"""
+    schema = TableSchema('wait events', WaitEventRecord, (
+        Column('name', ('Event',), 'text'),
+        Column('waits', ('Waits',)),
+        Column('avg_wait', ('Wait Avg(ms)', 'Avg Wait'), 'ms'),
+        Column('pct_db_time', ('% DB time', '%DB time')),
+        Column('wait_class', ('Wait Class',), 'text'),
+    ), required=('name', 'pct_db_time'))
+
+    # 19c layout: renamed headers and an extra column the schema does not read
+    column_map = schema.resolve(['Event', 'Waits', 'Total Wait Time (sec)', 'Avg Wait', '% DB time', 'Wait Class'])
+    assert column_map.width == 6
+    events = column_map.records([
+        ['DB CPU', '', '1,234', '', '45.6', ''],
+        ['log file sync', '1,000', '12', '502.71ms', '2.5', 'Commit'],
+        ['Note: sub-header'],
+        ['', '5', '1', '1ms', '0.1', 'Other'],
+    ])
+
+    assert events == [
+        WaitEventRecord('DB CPU', 0, None, 0, 45.6, ''),
+        WaitEventRecord('log file sync', 1000, None, 502.71, 2.5, 'Commit'),
+    ]
+    assert events[1].to_dict() == {
+        'name': 'log file sync', 'waits': 1000, 'avg_wait': 502.71, 'pct_db_time': 2.5, 'wait_class': 'Commit',
+    }
+    assert events[1].get('time_waited', 0) == 0
+
+    # 11g layout: other header texts, the first of duplicate headers wins
+    column_map = schema.resolve(['%DB time', 'Event', 'Wait Avg(ms)', 'Event'])
+    assert column_map.records([['10', 'db file sequential read', '5', 'x']]) == [
+        WaitEventRecord('db file sequential read', None, None, 5, 10, None),
+    ]
+
+    assert schema.resolve(['Event', 'Waits', 'Wait Class']) is None
+    assert schema.resolve(['Event', '% DB time']).records([]) == []
+
+
+def reference_parse_value(text):
+    """parse_value() before the regex fast path, kept as the reference"""
+    if not text or not isinstance(text, str):
+        return 0
+    text = text.strip().replace(',', '')
+    if '%' in text:
+        try:
+            return float(text.replace('%', ''))
+        except ValueError:
+            return 0
+    for suffix, mult in {'K': 1e3, 'M': 1e6, 'G': 1e9, 'T': 1e12}.items():
+        if text.upper().endswith(suffix):
+            try:
+                return float(text[:-1]) * mult
+            except ValueError:
+                return 0
+    if ':' in text:
+        try:
+            parts = text.split(':')
+            if len(parts) == 3:
+                return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
+            elif len(parts) == 2:
+                return int(parts[0]) * 60 + float(parts[1])
+        except ValueError:
+            return 0
+    try:
+        return int(text) if '.' not in text else float(text)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=1)
+def corpus_cells():
+    """Text of every table cell of every report in awrrpt/"""
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+    cells = []
+    for html_file in sorted(awrrpt_dir.rglob("*.html")):
+        document = AWRParserFactory.create_file_parser(str(html_file)).document
+        for table in document.tables:
+            for row in document.table_rows(table):
+                cells.extend(row)
+    return tuple(cells)
+
+
+def test_parse_value_matches_reference():
+    """The fast path returns the same type and value as the reference for every cell"""
+    edge_cases = [
+        '', None, ' 1,234.56 ', '12.34M', '1.5k', '99.99%', '+.5%', '00:12:34.56', '12:34',
+        '1:2:3:4', '1:2.5:3', '1e5', '1.5e3', 'inf', 'nan%', '-0', '5.', '.5', '1 234', 'ITEM',
+        '12:30M', '%12', '1_000', '9' * 5000,
+    ]
+    cells = list(corpus_cells()) + edge_cases
+
+    for text in cells:
+        expected, actual = reference_parse_value(text), parse_value(text)
+        assert type(actual) is type(expected), f"{text!r}: {actual!r} != {expected!r}"
+        assert actual == expected or (actual != actual and expected != expected), f"{text!r}: {actual!r} != {expected!r}"
+
+    assert parse_values(['1', '1', '2.5%', 'x']) == [1, 1, 2.5, 0]
+    assert parse_value_array(['1', '2.5%', '1K']).tolist() == [1.0, 2.5, 1000.0]
+    print(f"✓ parse_value matches the reference on {len(cells)} cells")
+
+
 def main():
     """Test all AWR reports in the awrrpt directory"""
     # Get awrrpt directory
@@ -3,12 +3,73 @@
 
 import sys
 import os
+import shutil
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.core.analyzer.rule_engine import RuleEngine
+from app.core.analyzer.rule_registry import RuleRegistry
+from app.core.analyzer.rule_compiler import compile_rules
+from app.core.parser.factory import AWRParserFactory
+from app.core.normalizer import normalize_metrics
+from app.core.analyzer.fleet import rediagnose_fleet
+from app.core.parser.base import PARSER_VERSION
+from app.config import settings
+from app.models import AWRReport, DiagnosticResult, PerformanceMetric, ReportStatus
+from benchmark_rules import ReferenceRuleEngine, generate_rules
+
+# Rules the reference evaluates to False on every report, and odd values
+EDGE_CASE_RULES = [
+    {'id': 'EQ_STRING', 'name': 'eq', 'category': 'test', 'severity': 'low',
+     'conditions': [{'metric': 'edge.text', 'operator': '==', 'threshold': 'ON'}]},
+    {'id': 'EQ_LIST', 'name': 'eq list', 'category': 'test', 'severity': 'low',
+     'conditions': [{'metric': 'edge.items', 'operator': '==', 'threshold': [1, 2]}]},
+    {'id': 'GT_NUMERIC_TEXT', 'name': 'gt text', 'category': 'test', 'severity': 'high',
+     'conditions': [{'metric': 'edge.numeric_text', 'operator': '>', 'threshold': '10'}]},
+    {'id': 'GT_BOOL', 'name': 'gt bool', 'category': 'test', 'severity': 'medium',
+     'conditions': [{'metric': 'edge.flag', 'operator': '>=', 'threshold': 1}]},
+    {'id': 'LT_NOT_A_NUMBER', 'name': 'lt nan', 'category': 'test', 'severity': 'critical',
+     'conditions': [{'metric': 'edge.text', 'operator': '<', 'threshold': 5}]},
+    {'id': 'THROUGH_SCALAR', 'name': 'scalar parent', 'category': 'test', 'severity': 'low',
+     'conditions': [{'metric': 'edge.text.length', 'operator': '>', 'threshold': 0}]},
+    {'id': 'IN_RANGE', 'name': 'in range', 'category': 'test', 'severity': 'high',
+     'conditions': [{'metric': 'edge.numeric_text', 'operator': 'in_range', 'threshold': [10, 20]},
+                    {'metric': 'edge.flag', 'operator': '==', 'threshold': True}]},
+    {'id': 'UNKNOWN_OPERATOR', 'name': 'unknown', 'category': 'test', 'severity': 'low',
+     'conditions': [{'metric': 'edge.flag', 'operator': '!=', 'threshold': 0}]},
+    {'id': 'TEXT_THRESHOLD', 'name': 'text threshold', 'category': 'test', 'severity': 'low',
+     'conditions': [{'metric': 'edge.numeric_text', 'operator': '>', 'threshold': 'high'}]},
+    {'id': 'NO_CONDITIONS', 'name': 'always', 'category': 'test', 'severity': 'low', 'conditions': []},
+]
+
+EDGE_CASE_METRICS = [
+    {},
+    {'edge': {'text': 'ON', 'items': [1, 2], 'numeric_text': '12.5', 'flag': True}},
+    {'edge': {'text': 'OFF', 'items': [2, 1], 'numeric_text': 'n/a', 'flag': False}},
+    {'edge': {'text': None, 'items': None, 'numeric_text': None, 'flag': None}},
+    {'edge': 'not a dict'},
+]
+
+
+@lru_cache(maxsize=1)
+def corpus_metrics():
+    """Normalized metrics of every report in awrrpt/"""
+    awrrpt_dir = Path(__file__).parent.parent / "awrrpt"
+    return tuple(
+        normalize_metrics(AWRParserFactory.create_file_parser(str(html_file)).parse())
+        for html_file in sorted(awrrpt_dir.rglob("*.html"))
+    )
+
+
+def comparison_rules():
+    """Bundled, synthetic and edge case rules"""
+    rules_dir = Path(__file__).parent / "app" / "rules"
+    return RuleEngine(str(rules_dir)).rules + generate_rules(corpus_metrics(), 400) + EDGE_CASE_RULES
+
 
 def test_rule_loading():
     """Test rule loading from YAML files"""
@@ -82,7 +143,7 @@ def test_rule_evaluation():
             }
         },
         'load_profile': {
-            'Physical read (blocks)': {
+            'physical_read_blocks': {
                 'per_second': 12000  # Should trigger HIGH_PHYSICAL_READS
             }
         }
@@ -137,6 +198,123 @@ def test_severity_distribution():
     print()
 
 
+def test_rule_reload():
+    """Test that the rule registry reloads changed rule files"""
+    print()
+    print("=" * 60)
+    print("规则热加载")
+    print("=" * 60)
+    print()
+
+    rules_dir = Path(__file__).parent / "app" / "rules"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rule_file in rules_dir.glob("*.yaml"):
+            shutil.copy(rule_file, temp_dir)
+
+        registry = RuleRegistry(temp_dir, check_interval=0)
+        engine = registry.get()
+        assert registry.get() is engine
+        print(f"初始版本: {engine.version} ({len(engine.rules)} 条规则)")
+
+        extra_rule = Path(temp_dir) / "zz_extra.yaml"
+        extra_rule.write_text(
+            "rules:\n"
+            "  - id: EXTRA_RULE\n"
+            "    name: Extra rule\n"
+            "    category: test\n"
+            "    severity: low\n"
+            "    conditions: []\n",
+            encoding="utf-8",
+        )
+        reloaded = registry.get()
+        assert reloaded is not engine
+        assert reloaded.version != engine.version
+        assert len(reloaded.rules) == len(engine.rules) + 1
+        print(f"新增规则后: {reloaded.version} ({len(reloaded.rules)} 条规则)")
+
+        # A broken file keeps the current rule set
+        extra_rule.write_text("rules: [unclosed", encoding="utf-8")
+        assert registry.get() is reloaded
+        print("规则文件损坏时保留当前版本")
+
+        extra_rule.unlink()
+        assert registry.get().version == engine.version
+        print(f"删除规则后: {registry.get().version}")
+
+    print()
+
+
+def test_compiled_rules_match_reference():
+    """The compiled rule set returns the same results as interpreting the rule dictionaries"""
+    rules = comparison_rules()
+    reference = ReferenceRuleEngine(rules)
+    compiled = compile_rules(rules)
+
+    matched = 0
+    for metrics in corpus_metrics() + tuple(EDGE_CASE_METRICS):
+        expected = reference.evaluate(metrics)
+        assert compiled.evaluate(metrics) == expected
+        matched += len(expected)
+
+    assert matched
+    print(f"✓ {len(rules)} compiled rules match the reference ({matched} results)")
+
+
+def test_evaluate_many():
+    """Batch evaluation returns what evaluate() returns for each report"""
+    compiled = compile_rules(comparison_rules())
+    # Repeated reports, with edge cases in between so columns mix types
+    fleet = []
+    for metrics in corpus_metrics() * 3:
+        fleet.append(metrics)
+        fleet.append(EDGE_CASE_METRICS[len(fleet) % len(EDGE_CASE_METRICS)])
+
+    assert compiled.evaluate_many(fleet) == [compiled.evaluate(metrics) for metrics in fleet]
+    assert compiled.evaluate_many(list(EDGE_CASE_METRICS)) == [compiled.evaluate(m) for m in EDGE_CASE_METRICS]
+    assert compiled.evaluate_many([]) == []
+    print(f"✓ evaluate_many matches evaluate on {len(fleet)} reports")
+
+
+def test_rediagnose_fleet(db, monkeypatch):
+    """Re-diagnosis replaces the results of current reports and skips diagnosed ones"""
+    monkeypatch.setattr(settings, 'CACHE_TTL', 0)
+    rules_dir = Path(__file__).parent / "app" / "rules"
+    engine = RuleEngine(str(rules_dir))
+    corpus = corpus_metrics()
+
+    reports = [
+        AWRReport(filename=f"r{n}.html", file_path=f"r{n}.html", status=ReportStatus.PARSED, parser_version=PARSER_VERSION)
+        for n in range(len(corpus))
+    ]
+    # Metrics of an older parser are not evaluated
+    outdated = AWRReport(filename="old.html", file_path="old.html", status=ReportStatus.PARSED, parser_version="1")
+    db.add_all(reports + [outdated])
+    db.flush()
+    for report, metrics in zip(reports + [outdated], corpus + corpus[:1]):
+        db.add_all(
+            PerformanceMetric(report_id=report.id, metric_category=category, metric_data=data)
+            for category, data in metrics.items()
+            if category in engine.compiled.root_keys
+        )
+    db.commit()
+
+    stats = rediagnose_fleet(db, engine.compiled, batch_size=5)
+
+    expected = [engine.evaluate(metrics) for metrics in corpus]
+    assert stats == {'reports': len(reports), 'diagnostics': sum(len(results) for results in expected)}
+    assert stats['diagnostics']
+    for report, results in zip(reports, expected):
+        stored = db.query(DiagnosticResult).filter_by(report_id=report.id).all()
+        assert sorted(result.rule_id for result in stored) == sorted(result['rule_id'] for result in results)
+        db.refresh(report)
+        assert report.rules_version == engine.version
+    assert db.query(DiagnosticResult).filter_by(report_id=outdated.id).count() == 0
+
+    assert rediagnose_fleet(db, engine.compiled)['reports'] == 0
+    assert rediagnose_fleet(db, engine.compiled, force=True) == stats
+    assert db.query(DiagnosticResult).count() == stats['diagnostics']
+
+
 if __name__ == "__main__":
     try:
         # Windows encoding fix
@@ -149,6 +327,9 @@ if __name__ == "__main__":
         test_rule_loading()
         test_rule_evaluation()
         test_severity_distribution()
+        test_rule_reload()
+        test_compiled_rules_match_reference()
+        test_evaluate_many()
 
         print("=" * 60)
         print("✓ 所有测试完成")
@@ -0,0 +1,122 @@
+"""Test Per-report SQL Statistics and the SQL History API"""
+
+from datetime import datetime, timedelta
+
+from app.core.ingest import metric_records
+from app.core.sql_stats import copy_sql_stats, insert_sql_stats, sql_stat_rows, store_sql_stats
+from app.models import AWRReport, SqlStat
+from test_api import REPORT, add_report, parsed_report
+
+METADATA = {'db_name': "PROD", 'instance_name': "prod1", 'snapshot_begin': datetime(2026, 10, 18, 12)}
+
+
+def test_sql_stat_rows():
+    """Statements get one row each, with per-exec values computed from totals where missing"""
+    records = [
+        {'metric_category': 'load_profile', 'metric_data': {}},
+        {'metric_category': 'top_sql', 'metric_data': {
+            'abcd1234': {
+                'rank': {'by_cpu': 3, 'by_gets': 1},
+                'executions': 4,
+                'elapsed_time_s': 10,
+                'cpu_time_s': 8,
+                'cpu_per_exec_s': 2.5,
+                'buffer_gets': 1000,
+                'pct_total': {'by_cpu': 12.5},
+                'sql_text': "select 1 from dual",
+                'sql_module': "",
+            },
+            'idle0000': {'rank': {'by_executions': 7}, 'executions': 0, 'elapsed_time_s': 1},
+            'unranked': {'executions': 1},
+        }},
+    ]
+
+    rows = {row['sql_id']: row for row in sql_stat_rows(7, METADATA, records)}
+
+    assert sorted(rows) == ['abcd1234', 'idle0000']
+    row = rows['abcd1234']
+    assert (row['report_id'], row['db_name'], row['snapshot_begin']) == (7, "PROD", METADATA['snapshot_begin'])
+    assert (row['best_rank'], row['ranks'], row['pct_total']) == (1, {'by_cpu': 3, 'by_gets': 1}, {'by_cpu': 12.5})
+    assert (row['sql_text'], row['sql_module']) == ("select 1 from dual", None)
+    assert row['elapsed_time_per_exec_s'] == 2.5
+    assert row['gets_per_exec'] == 250
+    # Reported per-exec values are kept
+    assert row['cpu_per_exec_s'] == 2.5
+    assert row['physical_reads'] is None and row['reads_per_exec'] is None
+
+    assert rows['idle0000']['elapsed_time_per_exec_s'] is None
+    assert rows['idle0000']['pct_total'] == {}
+
+    assert sql_stat_rows(7, METADATA, []) == []
+
+
+def report_statements(db, report_id):
+    return sorted(
+        (statement.sql_id, statement.best_rank, statement.elapsed_time_s)
+        for statement in db.query(SqlStat).filter(SqlStat.report_id == report_id)
+    )
+
+
+def test_store_and_copy_sql_stats(db):
+    report = add_report(db)
+    duplicate = add_report(db)
+    records = metric_records(parsed_report(REPORT))
+    statements = next(record['metric_data'] for record in records if record['metric_category'] == 'top_sql')
+
+    count = store_sql_stats(db, report.id, METADATA, records)
+    assert count == len(statements) > 0
+    assert store_sql_stats(db, report.id, METADATA, records) == count
+    db.commit()
+
+    stored = report_statements(db, report.id)
+    assert len(stored) == count
+
+    copy_sql_stats(db, report.id, duplicate.id)
+    copy_sql_stats(db, report.id, duplicate.id)
+    db.commit()
+    assert report_statements(db, duplicate.id) == stored
+
+
+def test_sql_history(client, db):
+    """Reports of a statement, newest snapshot first, filtered by rank, database, instance and time"""
+    start = datetime(2026, 10, 1)
+    reports = [AWRReport(filename=f"{n}.html", file_path=f"{n}.html") for n in range(6)]
+    db.add_all(reports)
+    db.flush()
+
+    def row(report, hours, ranks, instance_name="prod1", db_name="PROD", sql_id="abcd1234"):
+        return {
+            'report_id': report.id, 'sql_id': sql_id, 'db_name': db_name, 'instance_name': instance_name,
+            'snapshot_begin': start + timedelta(hours=hours), 'sql_text': "select 1 from dual" if hours else None,
+            'ranks': ranks, 'best_rank': min(ranks.values()), 'elapsed_time_s': float(hours),
+        }
+
+    insert_sql_stats(db, [
+        row(reports[0], 0, {'by_elapsed': 1}),
+        row(reports[1], 1, {'by_elapsed': 12, 'by_cpu': 4}),
+        row(reports[2], 2, {'by_gets': 20}),
+        row(reports[3], 3, {'by_elapsed': 5}, instance_name="prod2"),
+        row(reports[4], 4, {'by_elapsed': 2}, db_name="TEST"),
+        row(reports[5], 5, {'by_elapsed': 1}, sql_id="other000"),
+    ])
+    db.commit()
+
+    def report_ids(**params):
+        body = client.get("/api/v1/sql/abcd1234/reports", params=params).json()
+        return [item["report_id"] for item in body["items"]]
+
+    body = client.get("/api/v1/sql/abcd1234/reports").json()
+    assert (body["sql_id"], body["total"], body["sql_text"]) == ("abcd1234", 5, "select 1 from dual")
+    assert [item["report_id"] for item in body["items"]] == [reports[n].id for n in (4, 3, 2, 1, 0)]
+    assert body["items"][0]["ranks"] == {'by_elapsed': 2}
+
+    assert report_ids(top=5) == [reports[n].id for n in (4, 3, 1, 0)]
+    assert report_ids(top=5, ordering="by_elapsed") == [reports[n].id for n in (4, 3, 0)]
+    assert report_ids(ordering="by_cpu") == [reports[1].id]
+    assert report_ids(db_name="PROD", instance="prod1") == [reports[n].id for n in (2, 1, 0)]
+    time_range = {"from": (start + timedelta(hours=1)).isoformat(), "to": (start + timedelta(hours=3)).isoformat()}
+    assert report_ids(**time_range) == [reports[n].id for n in (2, 1)]
+    assert report_ids(size=2, page=2) == [reports[n].id for n in (2, 1)]
+
+    assert client.get("/api/v1/sql/abcd1234/reports", params={"ordering": "by_anything"}).status_code == 422
+    assert client.get("/api/v1/sql/unknown0/reports").json()["total"] == 0
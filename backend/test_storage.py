@@ -0,0 +1,138 @@
+"""Test Report File Storage"""
+
+import io
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.cli.compress_storage import compress_reports
+from app.core.parser.factory import AWRParserFactory
+from app.core.storage import (
+    ReportWriter, compression_of, hash_report, open_report, report_size, storage_suffix, with_compression
+)
+from app.models import AWRReport
+
+AWRRPT_DIR = Path(__file__).parent.parent / "awrrpt"
+
+
+def report_bytes(size=3 * 1024 * 1024 + 17):
+    """Report-like content spanning several copy chunks"""
+    line = b"<tr><td>db file sequential read</td><td>1,234.56</td></tr>\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "zstd"])
+def test_writer_round_trip(tmp_path, compression):
+    """Written chunks read back unchanged, with the size and hash of the original bytes"""
+    content = report_bytes()
+    file_path = str(tmp_path / f"report.html{storage_suffix(compression)}")
+
+    with ReportWriter(file_path, compression) as writer:
+        writer.copy_from(io.BytesIO(content))
+
+    assert writer.size == len(content)
+    assert writer.content_hash == hashlib.sha256(content).hexdigest()
+
+    with open_report(file_path) as f:
+        assert f.read() == content
+
+
+def test_writer_chunked_hash(tmp_path):
+    """The content hash does not depend on how the report is split into chunks"""
+    content = report_bytes(100_000)
+
+    with ReportWriter(str(tmp_path / "whole.html")) as whole:
+        whole.write(content)
+    with ReportWriter(str(tmp_path / "chunked.html")) as chunked:
+        for start in range(0, len(content), 4096):
+            chunked.write(content[start:start + 4096])
+
+    assert chunked.content_hash == whole.content_hash
+    assert chunked.size == whole.size == len(content)
+
+
+def test_writer_discards_on_error(tmp_path):
+    """A report that fails while being written is deleted"""
+    file_path = tmp_path / "report.html.gz"
+
+    with pytest.raises(RuntimeError):
+        with ReportWriter(str(file_path), 'gzip') as writer:
+            writer.write(b"<html>")
+            raise RuntimeError("upload aborted")
+
+    assert not file_path.exists()
+
+
+def test_unknown_compression(tmp_path):
+    """Unknown compressions are rejected before anything is written"""
+    with pytest.raises(ValueError):
+        storage_suffix('lz4')
+    with pytest.raises(ValueError):
+        ReportWriter(str(tmp_path / "report.html"), 'lz4')
+
+
+def test_compression_paths():
+    """The compression of a stored report is encoded in its file name"""
+    assert compression_of("uploads/a.html") == 'none'
+    assert compression_of("uploads/a.html.gz") == 'gzip'
+    assert compression_of("uploads/a.html.zst") == 'zstd'
+
+    assert with_compression("uploads/a.html", 'zstd') == "uploads/a.html.zst"
+    assert with_compression("uploads/a.html.zst", 'gzip') == "uploads/a.html.gz"
+    assert with_compression("uploads/a.html.gz", 'none') == "uploads/a.html"
+
+
+def test_compressed_report_parse(tmp_path):
+    """A zstd-compressed report hashes and parses like the original"""
+    source = AWRRPT_DIR / "19c" / "awrrpt_1_17676_17677.html"
+    stored = str(tmp_path / "report.html.zst")
+    with open(source, 'rb') as src, ReportWriter(stored, 'zstd') as writer:
+        writer.copy_from(src)
+
+    assert report_size(str(source)) == source.stat().st_size
+    assert report_size(stored) is None
+    assert hash_report(stored) == hash_report(str(source)) == hashlib.sha256(source.read_bytes()).hexdigest()
+
+    expected = AWRParserFactory.create_file_parser(str(source)).parse()
+    assert AWRParserFactory.create_file_parser(stored).parse() == expected
+    assert AWRParserFactory.create_streaming_parser(stored).parse() == expected
+
+
+def test_compress_reports(db, tmp_path):
+    """Stored reports are converted in place and the originals removed after commit"""
+    content = report_bytes(200_000)
+    plain = tmp_path / "plain.html"
+    plain.write_bytes(content)
+    tampered = tmp_path / "tampered.html"
+    tampered.write_bytes(content)
+    already = tmp_path / "already.html.zst"
+    with ReportWriter(str(already), 'zstd') as writer:
+        writer.write(content)
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    db.add_all([
+        AWRReport(filename="plain.html", file_path=str(plain), content_hash=content_hash),
+        AWRReport(filename="tampered.html", file_path=str(tampered), content_hash="0" * 64),
+        AWRReport(filename="already.html", file_path=str(already), content_hash=content_hash),
+        AWRReport(filename="missing.html", file_path=str(tmp_path / "missing.html"), content_hash=content_hash),
+    ])
+    db.commit()
+
+    stats = compress_reports(db, 'zstd', batch_size=2)
+
+    assert (stats['converted'], stats['unchanged'], stats['missing'], stats['mismatched']) == (1, 1, 1, 1)
+    assert stats['bytes_after'] < stats['bytes_before']
+
+    reports = {report.filename: report for report in db.query(AWRReport)}
+    assert reports['plain.html'].file_path == str(plain) + '.zst'
+    assert reports['plain.html'].file_size == len(content)
+    assert not plain.exists()
+    assert hash_report(reports['plain.html'].file_path) == content_hash
+
+    # A hash mismatch keeps the original
+    assert reports['tampered.html'].file_path == str(tampered)
+    assert tampered.exists() and not Path(str(tampered) + '.zst').exists()
+
+    # Run again after an interruption: nothing left to do
+    assert compress_reports(db, 'zstd', batch_size=10)['converted'] == 0
@@ -0,0 +1,113 @@
+"""Test the Parse and Analysis Tasks"""
+
+from pathlib import Path
+
+from app.config import settings
+from app.core.analyzer.rule_registry import get_rule_registry
+from app.models import AWRReport, DiagnosticResult, MetricSample, PerformanceMetric, ReportStatus, SqlStat
+from app.tasks.analysis_tasks import analyze_awr_report_task, parse_and_analyze
+from app.tasks.celery_app import celery_app
+from app.tasks.parse_tasks import parse_awr_report_task
+from test_api import add_report
+
+AWRRPT_DIR = Path(__file__).parent.parent / "awrrpt"
+
+REPORT = AWRRPT_DIR / "19c" / "awrrpt_1_17676_17677.html"
+
+
+def diagnostics(db, report_id):
+    return db.query(DiagnosticResult).filter_by(report_id=report_id).count()
+
+
+def test_analysis_runs_once_per_rule_set(db, run_task):
+    """A second run with the same rule set version is skipped unless forced, a forced run replaces the results"""
+    report = add_report(db)
+    rules_version = get_rule_registry().get().version
+
+    result = run_task(analyze_awr_report_task, report.id)
+    assert result["status"] == "success"
+    assert result["rules_version"] == rules_version
+    count = diagnostics(db, report.id)
+    assert count == result["diagnostics"] > 0
+
+    db.expire_all()
+    assert db.get(AWRReport, report.id).rules_version == rules_version
+
+    skipped = run_task(analyze_awr_report_task, report.id)
+    assert (skipped["status"], skipped["rules_version"]) == ("skipped", rules_version)
+
+    assert run_task(analyze_awr_report_task, report.id, force=True)["status"] == "success"
+    assert diagnostics(db, report.id) == count
+
+
+def test_analysis_skips_unusable_reports(db, run_task):
+    """Reports that are not parsed, or parsed by another parser version, are not analyzed"""
+    pending = add_report(db, status=ReportStatus.PENDING, parser_version=None)
+    stale = add_report(db, parser_version="0")
+
+    for report in (pending, stale):
+        result = run_task(analyze_awr_report_task, report.id, force=True)
+        assert result["status"] == "skipped"
+        assert diagnostics(db, report.id) == 0
+
+    assert run_task(analyze_awr_report_task, 999)["status"] == "error"
+
+
+def test_analysis_without_rules(db, run_task, tmp_path, monkeypatch):
+    """An empty rule set stores no diagnostics and does not mark the report analyzed"""
+    monkeypatch.setattr(settings, 'RULES_DIR', str(tmp_path))
+    report = add_report(db)
+
+    assert run_task(analyze_awr_report_task, report.id)["status"] == "error"
+
+    db.expire_all()
+    assert diagnostics(db, report.id) == 0
+    assert db.get(AWRReport, report.id).rules_version is None
+
+
+def stored_rows(db, report_id):
+    return tuple(
+        db.query(model).filter_by(report_id=report_id).count()
+        for model in (PerformanceMetric, MetricSample, SqlStat)
+    )
+
+
+def test_reparse_replaces_metrics(db, run_task):
+    """Parsing a report again leaves one set of metrics, samples and SQL statistics"""
+    report = AWRReport(filename=REPORT.name, file_path=str(REPORT), status=ReportStatus.PENDING)
+    db.add(report)
+    db.commit()
+
+    assert run_task(parse_awr_report_task, report.id)["status"] == "success"
+    rows = stored_rows(db, report.id)
+    assert all(rows)
+
+    assert run_task(parse_awr_report_task, report.id)["status"] == "success"
+    assert stored_rows(db, report.id) == rows
+
+    metrics = db.query(PerformanceMetric).filter_by(report_id=report.id)
+    categories = [metric.metric_category for metric in metrics]
+    assert len(categories) == len(set(categories))
+
+
+def test_parse_and_analyze(db, run_task, tmp_path, monkeypatch):
+    """The chain analyzes a report after parsing it, and skips the analysis if the parse failed"""
+    monkeypatch.setattr(celery_app.conf, 'task_always_eager', True)
+    broken = tmp_path / "broken.html"
+    broken.write_text("")
+
+    reports = [
+        AWRReport(filename=REPORT.name, file_path=str(REPORT), status=ReportStatus.PENDING),
+        AWRReport(filename=broken.name, file_path=str(broken), status=ReportStatus.PENDING),
+    ]
+    db.add_all(reports)
+    db.commit()
+
+    assert parse_and_analyze(reports[0].id).get()["status"] == "success"
+    assert parse_and_analyze(reports[1].id).get()["status"] == "skipped"
+
+    db.expire_all()
+    parsed, failed = (db.get(AWRReport, report.id) for report in reports)
+    assert parsed.status == ReportStatus.PARSED and parsed.rules_version
+    assert diagnostics(db, parsed.id) > 0
+    assert failed.status == ReportStatus.FAILED and failed.rules_version is None
@@ -0,0 +1,99 @@
+"""Test the Metric Sample Time Series"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.cli.backfill_samples import backfill
+from app.core.ingest import metric_records
+from app.core.timeseries import copy_samples, numeric_leaves, sample_rows, sample_values, store_samples
+from app.models import MetricSample
+from test_api import REPORT, add_report, parsed_report
+
+
+def test_numeric_leaves():
+    """Nested numbers become dotted keys, booleans and text are skipped"""
+    data = {
+        'db_time_s': {'per_second': 1.5, 'per_transaction': 3},
+        'flag': True,
+        'name': "redo",
+        'empty': {},
+    }
+    assert list(numeric_leaves(data, 'load_profile')) == [
+        ('load_profile.db_time_s.per_second', 1.5),
+        ('load_profile.db_time_s.per_transaction', 3.0),
+    ]
+
+
+def test_sample_rows():
+    """Only the time series categories are sampled, and only reports with a snapshot time"""
+    records = [
+        {'metric_category': 'load_profile', 'metric_data': {'redo_size_bytes': {'per_second': 10}}},
+        {'metric_category': 'top_sql', 'metric_data': {'abcd1234': {'elapsed_time_s': 5}}},
+        {'metric_category': 'derived', 'metric_data': {'hard_parse_ratio': 0.25}},
+    ]
+    assert sample_values(records) == [
+        ('load_profile.redo_size_bytes.per_second', 10.0),
+        ('derived.hard_parse_ratio', 0.25),
+    ]
+
+    snapshot_begin = datetime(2026, 10, 18, 12)
+    metadata = {'db_name': "PROD", 'instance_name': "prod1", 'snapshot_begin': snapshot_begin}
+    assert sample_rows(7, metadata, records)[0] == {
+        'report_id': 7,
+        'db_name': "PROD",
+        'instance_name': "prod1",
+        'snapshot_begin': snapshot_begin,
+        'metric_key': 'load_profile.redo_size_bytes.per_second',
+        'value': 10.0,
+    }
+    assert sample_rows(7, {**metadata, 'snapshot_begin': None}, records) == []
+
+
+def report_samples(db, report_id):
+    rows = db.execute(
+        select(MetricSample.metric_key, MetricSample.value, MetricSample.db_name, MetricSample.snapshot_begin)
+        .where(MetricSample.report_id == report_id)
+        .order_by(MetricSample.metric_key)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def test_store_and_copy_samples(db):
+    """Storing again replaces the samples; copies carry the same series under the new report"""
+    report = add_report(db)
+    duplicate = add_report(db)
+    records = metric_records(parsed_report(REPORT))
+    metadata = {
+        'db_name': report.db_name,
+        'instance_name': report.instance_name,
+        'snapshot_begin': report.snapshot_begin,
+    }
+
+    count = store_samples(db, report.id, metadata, records)
+    assert count == len(sample_values(records)) > 0
+    assert store_samples(db, report.id, metadata, records) == count
+    db.commit()
+
+    stored = report_samples(db, report.id)
+    assert len(stored) == count
+    assert all(row[2] == report.db_name and row[3] == report.snapshot_begin for row in stored)
+
+    copy_samples(db, report.id, duplicate.id)
+    copy_samples(db, report.id, duplicate.id)
+    db.commit()
+    assert report_samples(db, duplicate.id) == stored
+
+
+def test_backfill_samples(db):
+    """Parsed reports without samples get them once; reports without a snapshot time are skipped"""
+    first = add_report(db)
+    second = add_report(db)
+    add_report(db, snapshot_begin=None)
+    metadata = {'db_name': first.db_name, 'instance_name': first.instance_name, 'snapshot_begin': first.snapshot_begin}
+    count = store_samples(db, first.id, metadata, metric_records(parsed_report(REPORT)))
+    db.commit()
+
+    assert backfill(db, batch_size=1) == {'reports': 1, 'samples': count}
+    assert report_samples(db, second.id) == report_samples(db, first.id)
+    assert backfill(db, batch_size=1) == {'reports': 0, 'samples': 0}
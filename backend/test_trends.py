@@ -0,0 +1,115 @@
+"""Test Metric Trend Downsampling"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.core.comparison.trend_analyzer import downsample, lttb, minmax, summarize
+from app.models import AWRReport, MetricSample
+
+START = datetime(2026, 1, 1)
+
+
+def spiky_series(count=1000):
+    """Hourly sine wave with one spike and one dip"""
+    times = [START + timedelta(hours=n) for n in range(count)]
+    values = 100 + 10 * np.sin(np.arange(count) / 24)
+    values[count // 3] = 500
+    values[count * 4 // 5] = -50
+    return times, values
+
+
+def test_lttb():
+    """The first and last points, the extremes and exactly threshold points are kept, in order"""
+    x = np.arange(1000, dtype=float)
+    _, y = spiky_series()
+
+    kept = lttb(x, y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert {333, 800} <= set(kept.tolist())
+
+    # Short series and degenerate thresholds keep everything
+    assert lttb(x[:10], y[:10], 10).tolist() == list(range(10))
+    assert lttb(x[:10], y[:10], 2).tolist() == list(range(10))
+
+
+def test_minmax():
+    """Every bucket keeps its minimum and maximum"""
+    _, y = spiky_series()
+
+    kept = minmax(y, 40)
+    assert len(kept) <= 40
+    assert np.all(np.diff(kept) > 0)
+    for bucket in np.array_split(np.arange(len(y)), 20):
+        assert bucket[np.argmin(y[bucket])] in kept
+        assert bucket[np.argmax(y[bucket])] in kept
+
+    assert minmax(y[:5], 10).tolist() == list(range(5))
+
+
+def test_downsample():
+    times, values = spiky_series()
+    assert len(downsample(times, values, 100)) == 100
+    assert downsample(times, values, 100, 'minmax').tolist() == minmax(values, 100).tolist()
+
+
+def test_summarize():
+    times = [START + timedelta(days=n) for n in range(11)]
+
+    rising = summarize(times, np.arange(11, dtype=float) * 2 + 100)
+    assert rising['trend'] == 'up'
+    assert abs(rising['slope_per_day'] - 2) < 1e-9
+    assert (rising['count'], rising['min'], rising['max'], rising['first'], rising['last']) == (11, 100, 120, 100, 120)
+
+    # Changes below FLAT_TREND_THRESHOLD of the mean are flat
+    assert summarize(times, np.linspace(100, 104, 11))['trend'] == 'flat'
+    assert summarize(times, np.linspace(100, 50, 11))['trend'] == 'down'
+    assert summarize(times[:1], np.array([5.0]))['trend'] == 'flat'
+    assert summarize([], np.array([])) == {'count': 0}
+
+
+def test_trend_api(client, db):
+    """Samples of the same snapshot time are aggregated, then downsampled"""
+    # One report per instance, as uploaded
+    reports = {
+        instance: AWRReport(filename=f"{instance}.html", file_path=f"{instance}.html")
+        for instance in ("prod1", "prod2")
+    }
+    db.add_all(reports.values())
+    db.flush()
+
+    times, values = spiky_series(200)
+    db.add_all(
+        MetricSample(
+            report_id=reports[instance].id, db_name="PROD", instance_name=instance, snapshot_begin=moment,
+            metric_key="load_profile.db_time_s.per_second", value=value + offset,
+        )
+        for moment, value in zip(times, values)
+        for instance, offset in (("prod1", 0), ("prod2", 10))
+    )
+    db.commit()
+
+    url = "/api/v1/databases/PROD/trends"
+    metric = "load_profile.db_time_s.per_second"
+
+    body = client.get(url, params={"metric": metric, "points": 20, "aggregate": "sum"}).json()
+    assert body["total_points"] == 200
+    assert len(body["values"]) == 20
+    assert body["values"][0] == values[0] * 2 + 10
+    assert datetime.fromisoformat(body["timestamps"][-1]) == times[-1]
+    assert body["summary"]["max"] == 1010
+
+    body = client.get(url, params={
+        "metric": metric, "instance": "prod2", "method": "minmax",
+        "from": times[50].isoformat(), "to": times[150].isoformat(),
+    }).json()
+    assert body["total_points"] == 100
+    assert body["values"] == (values[50:150] + 10).tolist()
+
+    assert client.get(url, params={"metric": metric, "method": "average"}).status_code == 422
+    assert client.get(url, params={"metric": "load_profile.unknown"}).json()["summary"] == {
+        "count": 0, "min": None, "max": None, "avg": None, "first": None, "last": None,
+        "slope_per_day": None, "trend": None,
+    }
@@ -0,0 +1,143 @@
+"""Test Report Upload and Reuse of Parse Results"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.api.v1 import reports
+from app.config import settings
+from app.core.parser.base import PARSER_VERSION
+from app.models import AWRReport, ClusterSnapshot, MetricSample, PerformanceMetric, ReportStatus, SqlStat
+from app.tasks import analysis_tasks
+from app.tasks.parse_tasks import parse_awr_report_task
+
+AWRRPT_DIR = Path(__file__).parent.parent / "awrrpt"
+
+RAC_REPORT = AWRRPT_DIR / "19c rac" / "awrrpt_1_18175_18176.html"
+
+
+@pytest.fixture
+def queued(monkeypatch, tmp_path):
+    """Uploads stored under tmp_path; the tasks they would queue are recorded instead"""
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path / "uploads"))
+
+    calls = {'parse': [], 'analyze': []}
+    monkeypatch.setattr(analysis_tasks, 'parse_and_analyze', calls['parse'].append)
+    monkeypatch.setattr(analysis_tasks.analyze_awr_report_task, 'delay', calls['analyze'].append)
+    return calls
+
+
+def upload(client, content, filename=RAC_REPORT.name):
+    response = client.post("/api/v1/reports/upload", files={"file": (filename, content, "text/html")})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def copied_rows(db, report_id):
+    """Metrics, samples and SQL statistics of a report, without the report id"""
+    metrics = sorted(
+        (metric.metric_category, str(metric.metric_data))
+        for metric in db.query(PerformanceMetric).filter_by(report_id=report_id)
+    )
+    samples = sorted(
+        (sample.metric_key, sample.value, sample.snapshot_begin)
+        for sample in db.query(MetricSample).filter_by(report_id=report_id)
+    )
+    statements = sorted(
+        (statement.sql_id, statement.best_rank, statement.elapsed_time_s)
+        for statement in db.query(SqlStat).filter_by(report_id=report_id)
+    )
+    return metrics, samples, statements
+
+
+def test_upload(client, db, queued):
+    """The upload is stored with its size and content hash and queued for parsing"""
+    content = RAC_REPORT.read_bytes()
+    body = upload(client, content)
+
+    assert (body["filename"], body["status"]) == (RAC_REPORT.name, "pending")
+    assert queued['parse'] == [body["id"]]
+
+    report = db.get(AWRReport, body["id"])
+    assert report.file_size == len(content)
+    assert report.content_hash == hashlib.sha256(content).hexdigest()
+    assert Path(report.file_path).parent == Path(settings.UPLOAD_DIR)
+    assert Path(report.file_path).exists()
+
+
+def test_upload_too_large(client, db, queued, monkeypatch):
+    """An upload over the size limit is rejected without leaving a file or a report behind"""
+    # Several chunks are written before the limit is reached
+    monkeypatch.setattr(reports, 'UPLOAD_CHUNK_SIZE', 16 * 1024)
+    monkeypatch.setattr(settings, 'MAX_UPLOAD_SIZE', 64 * 1024)
+
+    response = client.post(
+        "/api/v1/reports/upload",
+        files={"file": (RAC_REPORT.name, RAC_REPORT.read_bytes(), "text/html")},
+    )
+    assert response.status_code == 413
+    assert str(settings.MAX_UPLOAD_SIZE) in response.json()["detail"]
+
+    assert list(Path(settings.UPLOAD_DIR).iterdir()) == []
+    assert db.query(AWRReport).count() == 0
+    assert queued['parse'] == []
+
+
+def test_upload_reuses_parse(client, db, queued, run_task):
+    """The same bytes uploaded again get the stored parse instead of a parse task"""
+    content = RAC_REPORT.read_bytes()
+
+    first = upload(client, content)
+    assert first["status"] == "pending"
+    assert queued['parse'] == [first["id"]]
+    assert run_task(parse_awr_report_task, first["id"])["status"] == "success"
+
+    second = upload(client, content)
+    assert second["status"] == "parsed"
+    assert second["db_name"] == "XYDB"
+    assert queued['parse'] == [first["id"]]
+    assert queued['analyze'] == [second["id"]]
+
+    source, reused = db.get(AWRReport, first["id"]), db.get(AWRReport, second["id"])
+    assert reused.content_hash == source.content_hash == hashlib.sha256(content).hexdigest()
+    assert reused.parser_version == PARSER_VERSION
+    assert (reused.dbid, reused.snapshot_begin) == (source.dbid, source.snapshot_begin)
+    assert reused.file_path != source.file_path
+
+    metrics, samples, statements = copied_rows(db, source.id)
+    assert metrics and samples and statements
+    assert copied_rows(db, reused.id) == (metrics, samples, statements)
+
+    # The cluster snapshot keeps the source as its instance
+    cluster = db.query(ClusterSnapshot).one()
+    assert cluster.instance_count == 1
+    assert cluster.instances['1']['report_id'] == source.id
+
+    # ... until the source is deleted
+    assert client.delete(f"/api/v1/reports/{source.id}").status_code == 204
+    db.expire_all()
+    assert db.query(ClusterSnapshot).one().instances['1']['report_id'] == reused.id
+
+
+def test_upload_not_reused(client, db, queued, run_task):
+    """Parse results of another parser version or of a failed parse are not reused"""
+    content = RAC_REPORT.read_bytes()
+    source_id = upload(client, content)["id"]
+    run_task(parse_awr_report_task, source_id)
+
+    source = db.get(AWRReport, source_id)
+    source.parser_version = "0"
+    db.commit()
+    stale = upload(client, content)
+    assert stale["status"] == "pending"
+
+    source.parser_version = PARSER_VERSION
+    source.status = ReportStatus.FAILED
+    db.commit()
+    failed = upload(client, content)
+    assert failed["status"] == "pending"
+
+    assert queued['parse'] == [source_id, stale["id"], failed["id"]]
+    assert queued['analyze'] == []
+    assert db.query(PerformanceMetric).filter(PerformanceMetric.report_id.in_([stale["id"], failed["id"]])).count() == 0
@@ -3,7 +3,12 @@ import type {
   AWRReport,
   ListResponse,
   UploadResponse,
-  PerformanceMetric,
+  ReportMetrics,
+  MetricTrend,
+  Comparison,
+  ClusterSnapshot,
+  ClusterSnapshotDetail,
+  SqlHistory,
   DiagnosticSummary,
 } from '../types';
 
@@ -67,10 +72,13 @@ export const reportApi = {
     return api.delete(`/reports/${id}`);
   },
 
-  // Get metrics
-  getMetrics: (id: number, category?: string) => {
-    return api.get<any, PerformanceMetric[]>(`/reports/${id}/metrics`, {
-      params: { category },
+  // Get metric categories (default: all), optionally only the given fields
+  getMetrics: (id: number, categories?: string[], fields?: string[]) => {
+    return api.get<any, ReportMetrics>(`/reports/${id}/metrics`, {
+      params: {
+        categories: categories?.join(','),
+        fields: fields?.join(','),
+      },
     });
   },
 
@@ -85,4 +93,73 @@ export const reportApi = {
   },
 };
 
+// Trend API
+export const trendApi = {
+  // Get the downsampled history of a metric of a database
+  get: (dbName: string, params: {
+    metric: string;
+    from?: string;
+    to?: string;
+    instance?: string;
+    points?: number;
+    method?: 'lttb' | 'minmax';
+    aggregate?: 'avg' | 'sum' | 'min' | 'max';
+  }) => {
+    return api.get<any, MetricTrend>(`/databases/${encodeURIComponent(dbName)}/trends`, { params });
+  },
+};
+
+// Comparison API
+export const comparisonApi = {
+  // Compare a report with one report, several reports or the preceding window of reports
+  create: (body: {
+    target_id: number;
+    baseline_id?: number;
+    baseline_ids?: number[];
+    baseline_window?: number;
+  }) => {
+    return api.post<any, Comparison>('/comparisons', body);
+  },
+
+  // Get a stored comparison
+  get: (id: number) => {
+    return api.get<any, Comparison>(`/comparisons/${id}`);
+  },
+};
+
+// RAC Cluster API
+export const clusterApi = {
+  // List cluster snapshots, newest snapshot range first
+  list: (params?: {
+    page?: number;
+    size?: number;
+    db_name?: string;
+    dbid?: number;
+    min_instances?: number;
+  }) => {
+    return api.get<any, ListResponse<ClusterSnapshot>>('/clusters', { params });
+  },
+
+  // Get the cluster-wide metrics and per-instance skew of a snapshot range
+  get: (id: number) => {
+    return api.get<any, ClusterSnapshotDetail>(`/clusters/${id}`);
+  },
+};
+
+export const sqlApi = {
+  // Reports a statement appears in, newest snapshot first
+  history: (sqlId: string, params?: {
+    top?: number;
+    ordering?: string;
+    db_name?: string;
+    instance?: string;
+    from?: string;
+    to?: string;
+    page?: number;
+    size?: number;
+  }) => {
+    return api.get<any, SqlHistory>(`/sql/${sqlId}/reports`, { params });
+  },
+};
+
 export default api;
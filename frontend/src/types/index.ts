@@ -8,15 +8,89 @@ export interface AWRReport {
   parse_time?: string;
   error_message?: string;
   db_name?: string;
+  dbid?: number;
   db_version?: string;
   instance_name?: string;
+  instance_number?: number;
   host_name?: string;
+  rac?: boolean | null;
   begin_snap_id?: number;
   end_snap_id?: number;
   begin_time?: string;
   end_time?: string;
 }
 
+// Cluster-wide metrics of one snapshot range of a RAC database
+export interface ClusterSnapshot {
+  id: number;
+  dbid: number;
+  db_name?: string | null;
+  begin_snap_id: number;
+  end_snap_id: number;
+  snapshot_begin?: string | null;
+  snapshot_end?: string | null;
+  instance_count: number;
+  // Keyed by instance number
+  instances: Record<string, { report_id: number; instance_name?: string | null; host_name?: string | null }>;
+  updated_at?: string | null;
+}
+
+// Spread of one metric over the instances (ratio = max / mean)
+export interface InstanceSkew {
+  values: Record<string, number>;
+  max_instance: string;
+  ratio: number | null;
+}
+
+export interface ClusterSnapshotDetail extends ClusterSnapshot {
+  load_profile: Record<string, { per_second: number; per_txn: number | null }>;
+  wait_events: Record<string, any>;
+  top_sql: Record<string, any>;
+  skew: {
+    load_profile: Record<string, InstanceSkew>;
+    wait_events: Record<string, InstanceSkew>;
+    db_time_share: Record<string, number>;
+  };
+}
+
+// Statistics of a statement in one report, merged from all "SQL ordered by" lists
+export interface SqlStat {
+  report_id: number;
+  db_name?: string | null;
+  instance_name?: string | null;
+  snapshot_begin?: string | null;
+  sql_module?: string | null;
+  best_rank: number;
+  ranks: Record<string, number>;
+  pct_total?: Record<string, number> | null;
+  executions?: number | null;
+  elapsed_time_s?: number | null;
+  elapsed_time_per_exec_s?: number | null;
+  cpu_time_s?: number | null;
+  cpu_per_exec_s?: number | null;
+  user_io_time_s?: number | null;
+  uio_per_exec_s?: number | null;
+  cluster_wait_time_s?: number | null;
+  buffer_gets?: number | null;
+  gets_per_exec?: number | null;
+  physical_reads?: number | null;
+  reads_per_exec?: number | null;
+  rows_processed?: number | null;
+  rows_per_exec?: number | null;
+  parse_calls?: number | null;
+  version_count?: number | null;
+  sharable_mem_b?: number | null;
+}
+
+export interface SqlHistory {
+  sql_id: string;
+  sql_text?: string | null;
+  total: number;
+  page: number;
+  size: number;
+  items: SqlStat[];
+}
+
 // Performance Metric Types
 export interface PerformanceMetric {
   id: number;
@@ -27,6 +101,56 @@ export interface PerformanceMetric {
   data: any;
 }
 
+// Downsampled history of a metric of a database
+export interface MetricTrend {
+  db_name: string;
+  instance_name?: string | null;
+  metric: string;
+  aggregate: string;
+  method: string;
+  total_points: number;
+  timestamps: string[];
+  values: number[];
+  summary: {
+    count: number;
+    min?: number;
+    max?: number;
+    avg?: number;
+    first?: number;
+    last?: number;
+    slope_per_day?: number;
+    trend?: 'up' | 'down' | 'flat';
+  };
+}
+
+// Delta of one metric between a baseline and a target report
+export interface MetricDelta {
+  baseline: number | null;
+  target: number | null;
+  diff_abs: number | null;
+  diff_pct: number | null;
+  trend: 'up' | 'down' | 'flat' | 'new' | 'gone';
+  baseline_min?: number;
+  baseline_max?: number;
+  baseline_count?: number;
+}
+
+export interface Comparison {
+  id: number;
+  baseline_id: number;
+  baseline_ids: number[];
+  target_id: number;
+  created_at: string;
+  comparison: Record<string, Record<string, MetricDelta>>;
+  movers: Record<string, (MetricDelta & { key: string })[]>;
+}
+
+// Metric categories of a report, keyed by category
+export interface ReportMetrics {
+  report_id: number;
+  metrics: Record<string, any>;
+}
+
 // Diagnostic Result Types
 export interface DiagnosticResult {
   id: number;
@@ -42,9 +166,11 @@ export interface DiagnosticResult {
 // API Response Types
 export interface ListResponse<T> {
   items: T[];
-  total: number;
+  total: number | null;
+  total_estimated?: boolean;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface UploadResponse {